@@ -0,0 +1,67 @@
+CREATE TABLE IF NOT EXISTS schema_metrics.weather_metrics_hourly (
+   bucket_start TIMESTAMP WITH TIME ZONE PRIMARY KEY,
+   temperature_c_min DOUBLE PRECISION,
+   temperature_c_max DOUBLE PRECISION,
+   temperature_c_sum DOUBLE PRECISION,
+   temperature_c_count BIGINT,
+   temperature_c_mean DOUBLE PRECISION,
+   humidity_percent_min DOUBLE PRECISION,
+   humidity_percent_max DOUBLE PRECISION,
+   humidity_percent_sum DOUBLE PRECISION,
+   humidity_percent_count BIGINT,
+   humidity_percent_mean DOUBLE PRECISION,
+   wind_speed_kmh_min DOUBLE PRECISION,
+   wind_speed_kmh_max DOUBLE PRECISION,
+   wind_speed_kmh_sum DOUBLE PRECISION,
+   wind_speed_kmh_count BIGINT,
+   wind_speed_kmh_mean DOUBLE PRECISION,
+   visibility_km_min DOUBLE PRECISION,
+   visibility_km_max DOUBLE PRECISION,
+   visibility_km_sum DOUBLE PRECISION,
+   visibility_km_count BIGINT,
+   visibility_km_mean DOUBLE PRECISION,
+   pressure_mbar_min DOUBLE PRECISION,
+   pressure_mbar_max DOUBLE PRECISION,
+   pressure_mbar_sum DOUBLE PRECISION,
+   pressure_mbar_count BIGINT,
+   pressure_mbar_mean DOUBLE PRECISION,
+   wind_power_kw_min DOUBLE PRECISION,
+   wind_power_kw_max DOUBLE PRECISION,
+   wind_power_kw_sum DOUBLE PRECISION,
+   wind_power_kw_count BIGINT,
+   wind_power_kw_mean DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS schema_metrics.weather_metrics_daily (
+   bucket_start TIMESTAMP WITH TIME ZONE PRIMARY KEY,
+   temperature_c_min DOUBLE PRECISION,
+   temperature_c_max DOUBLE PRECISION,
+   temperature_c_sum DOUBLE PRECISION,
+   temperature_c_count BIGINT,
+   temperature_c_mean DOUBLE PRECISION,
+   humidity_percent_min DOUBLE PRECISION,
+   humidity_percent_max DOUBLE PRECISION,
+   humidity_percent_sum DOUBLE PRECISION,
+   humidity_percent_count BIGINT,
+   humidity_percent_mean DOUBLE PRECISION,
+   wind_speed_kmh_min DOUBLE PRECISION,
+   wind_speed_kmh_max DOUBLE PRECISION,
+   wind_speed_kmh_sum DOUBLE PRECISION,
+   wind_speed_kmh_count BIGINT,
+   wind_speed_kmh_mean DOUBLE PRECISION,
+   visibility_km_min DOUBLE PRECISION,
+   visibility_km_max DOUBLE PRECISION,
+   visibility_km_sum DOUBLE PRECISION,
+   visibility_km_count BIGINT,
+   visibility_km_mean DOUBLE PRECISION,
+   pressure_mbar_min DOUBLE PRECISION,
+   pressure_mbar_max DOUBLE PRECISION,
+   pressure_mbar_sum DOUBLE PRECISION,
+   pressure_mbar_count BIGINT,
+   pressure_mbar_mean DOUBLE PRECISION,
+   wind_power_kw_min DOUBLE PRECISION,
+   wind_power_kw_max DOUBLE PRECISION,
+   wind_power_kw_sum DOUBLE PRECISION,
+   wind_power_kw_count BIGINT,
+   wind_power_kw_mean DOUBLE PRECISION
+);
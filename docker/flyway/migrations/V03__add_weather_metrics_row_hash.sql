@@ -0,0 +1,6 @@
+DELETE FROM schema_metrics.weather_metrics AS duplicate_metrics
+USING schema_metrics.weather_metrics AS kept_metrics
+WHERE duplicate_metrics.timestamp = kept_metrics.timestamp AND duplicate_metrics.ctid < kept_metrics.ctid;
+
+ALTER TABLE schema_metrics.weather_metrics ADD COLUMN IF NOT EXISTS row_hash BIGINT;
+ALTER TABLE schema_metrics.weather_metrics ADD PRIMARY KEY (timestamp);
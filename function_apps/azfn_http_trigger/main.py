@@ -8,16 +8,22 @@ from py_project.logger import logger
 
 
 async def main(req: func.HttpRequest, starter: str) -> func.HttpResponse:
+    ingestion_mode = req.params.get(functions_config.PAYLOAD_INGESTION_MODE_KEY, functions_config.FULL_INGESTION_MODE)
+    if ingestion_mode not in functions_config.INGESTION_MODES:
+        return func.HttpResponse(
+            f"Unknown ingestion mode {ingestion_mode}, use {functions_config.INGESTION_MODES}", status_code=400
+        )
+
     client = df.DurableOrchestrationClient(starter)
     request_id = str(uuid1())
     instance_id = await client.start_new(
         orchestration_function_name=functions_config.AZFN_ORCHESTRATE_INGESTION,
         client_input={
-            functions_config.PAYLOAD_INGESTION_MODE_KEY: functions_config.FULL_INGESTION_MODE,
+            functions_config.PAYLOAD_INGESTION_MODE_KEY: ingestion_mode,
             functions_config.PAYLOAD_REQUEST_ID_KEY: request_id,
         },
         instance_id=None,
     )
-    logger.info(f"Started orchestration with ID = {instance_id}")
+    logger.info(f"Started orchestration with ID = {instance_id} in {ingestion_mode} mode")
 
     return client.create_check_status_response(req, instance_id)
@@ -16,6 +16,16 @@ orchestrator_function = FunctionsOrchestratorBuilder(
         functions_config.AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM,
         functions_config.AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE,
     ],
+    fan_out_batch_sizes={
+        functions_config.AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM: (
+            functions_config.NORMALIZE_FAN_OUT_BATCH_SIZE
+        ),
+    },
+    state_flush_policy=functions_config.ORCHESTRATOR_STATE_FLUSH_POLICY,
+    batch_task_logger=functions_config.AZFN_ORCHESTRATOR_STATE_BATCH_ACTIVITY,
+    fused_tasks=(
+        functions_config.FUSED_TASKS if functions_config.PIPELINE_MODE == functions_config.PIPELINE_MODE_FUSED else None
+    ),
 ).build()
 
 main = durable_func.Orchestrator.create(orchestrator_function)
@@ -1,22 +1,27 @@
 from py_project.domain.adapters.orchestrator_state_service import OrchestratorState
 from py_project.infrastructure.functions_orchestrator_state_service import (
-    FunctionsOrchestratorStateService,
+    FunctionsOrchestratorJsonLinesStateService,
 )
 from py_project.logger import logger
+from py_project.profiler import profile_invocation
 from py_project.config import filesystem_config
 from py_project.infrastructure.local_filesystem import LocalFileSystem
 
 
+@profile_invocation
 def main(payload: OrchestratorState) -> OrchestratorState:
     logger.info(payload)
     base_log_config = filesystem_config.ORCHESTRATOR_LOG_MAPPING[payload.base]
 
     file_system = LocalFileSystem()
 
-    orchestrator_state_service = FunctionsOrchestratorStateService(file_system=file_system)
+    orchestrator_state_service = FunctionsOrchestratorJsonLinesStateService(
+        file_system=file_system, compress=filesystem_config.ORCHESTRATOR_LOG_COMPRESSED
+    )
 
-    log_filename = f"{base_log_config[filesystem_config.ORCHESTRATOR_LOG_FILENAME_KEY]}".replace(
-        filesystem_config.DATE_PATTERN, orchestrator_state_service.get_current_utc_date()
+    log_filename = orchestrator_state_service.get_log_filename(
+        log_filename_pattern=base_log_config[filesystem_config.ORCHESTRATOR_LOG_JSON_LINES_FILENAME_KEY],
+        date_pattern=filesystem_config.DATE_PATTERN,
     )
 
     log_folder_path = f"{base_log_config[filesystem_config.ORCHESTRATOR_LOG_FOLDER_KEY]}"
@@ -0,0 +1,41 @@
+from typing import List
+
+from py_project.domain.adapters.orchestrator_state_service import OrchestratorState
+from py_project.infrastructure.functions_orchestrator_state_service import (
+    FunctionsOrchestratorJsonLinesStateService,
+)
+from py_project.logger import logger
+from py_project.profiler import profile_invocation
+from py_project.config import filesystem_config
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+
+
+@profile_invocation
+def main(payload: List[OrchestratorState]) -> int:
+    logger.info(f"Saving {len(payload)} orchestrator states")
+    if len(payload) == 0:
+        return 0
+    base_log_config = filesystem_config.ORCHESTRATOR_LOG_MAPPING[payload[0].base]
+
+    file_system = LocalFileSystem()
+
+    orchestrator_state_service = FunctionsOrchestratorJsonLinesStateService(
+        file_system=file_system, compress=filesystem_config.ORCHESTRATOR_LOG_COMPRESSED
+    )
+
+    log_filename = orchestrator_state_service.get_log_filename(
+        log_filename_pattern=base_log_config[filesystem_config.ORCHESTRATOR_LOG_JSON_LINES_FILENAME_KEY],
+        date_pattern=filesystem_config.DATE_PATTERN,
+    )
+
+    log_folder_path = f"{base_log_config[filesystem_config.ORCHESTRATOR_LOG_FOLDER_KEY]}"
+    file_system.mkdir(log_folder_path)
+    log_file_path = f"{log_folder_path}/{log_filename}"
+
+    orchestrator_state_service.save_states(payloads=payload, log_file_path=log_file_path)
+
+    return len(payload)
+
+
+if __name__ == "__main__":
+    main([OrchestratorState(execution_time=0, mode="", status="", base="WEATHER", job_id="")])
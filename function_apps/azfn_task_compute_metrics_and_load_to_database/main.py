@@ -1,12 +1,15 @@
 from py_project.config import functions_config, Env
 from py_project.domain.adapters.orchestrator_state_service import ProcessingItem
 from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.stage_metrics import StageMetrics
 from py_project.infrastructure.postgres_database import PostgresDatabase
 from py_project.infrastructure.local_filesystem import LocalFileSystem
 from py_project.domain.usecases.weather_compute_metrics import compute_weather_metrics
 from py_project.logger import logger
+from py_project.profiler import profile_invocation
 
 
+@profile_invocation
 def main(payload: dict) -> ProcessingItem:
     logger.info(f"Started {functions_config.AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE}")
 
@@ -18,14 +21,18 @@ def main(payload: dict) -> ProcessingItem:
 
     file_handler = FileHandler(source_filesystem)
     database = PostgresDatabase(env.engine)
+    stage_metrics = StageMetrics()
     inputs, outputs = compute_weather_metrics(
         apps_file_handler=file_handler,
         input_file_paths=file_paths,
         database=database,
+        ingestion_mode=payload.get(functions_config.PAYLOAD_INGESTION_MODE_KEY, functions_config.FULL_INGESTION_MODE),
+        stage_metrics=stage_metrics,
     )
 
     processing_item.add_inputs(inputs)
     processing_item.add_outputs(outputs)
+    processing_item.add_metrics(stage_metrics.to_dict())
     processing_item.processing_done()
     processing_item.posts = {}
 
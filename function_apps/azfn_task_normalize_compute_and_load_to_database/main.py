@@ -0,0 +1,62 @@
+from typing import List
+
+from py_project.config import functions_config, Env
+from py_project.domain.adapters.orchestrator_state_service import ProcessingItem
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.stage_metrics import StageMetrics
+from py_project.domain.usecases.weather_normalize_and_compute_metrics import normalize_and_compute_weather_metrics
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+from py_project.infrastructure.postgres_database import PostgresDatabase
+from py_project.logger import logger
+from py_project.profiler import profile_invocation
+
+
+@profile_invocation
+def main(payload: dict) -> List[ProcessingItem]:
+    logger.info(f"Started {functions_config.AZFN_TASK_NORMALIZE_COMPUTE_AND_LOAD_TO_DATABASE}")
+
+    # Processing items are the ones the chained tasks would have returned, so that lineage is kept
+    normalize_processing_item = ProcessingItem(
+        step_name=functions_config.AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM
+    )
+    compute_processing_item = ProcessingItem(step_name=functions_config.AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE)
+
+    env = Env()
+    source_filesystem = LocalFileSystem()
+
+    file_handler = FileHandler(source_filesystem)
+    database = PostgresDatabase(env.engine)
+    normalize_stage_metrics = StageMetrics()
+    compute_stage_metrics = StageMetrics()
+    (
+        (normalize_inputs, normalize_outputs),
+        (compute_inputs, compute_outputs),
+        duplicate_rows,
+    ) = normalize_and_compute_weather_metrics(
+        source_file_handler=file_handler,
+        input_file_paths=payload.get(functions_config.POST_INPUT_FILE_PATHS_KEY),
+        database=database,
+        ingestion_mode=payload.get(functions_config.PAYLOAD_INGESTION_MODE_KEY, functions_config.FULL_INGESTION_MODE),
+        file_batches=payload.get(functions_config.PAYLOAD_INPUT_FILE_BATCHES_KEY),
+        normalize_stage_metrics=normalize_stage_metrics,
+        compute_stage_metrics=compute_stage_metrics,
+    )
+
+    normalize_processing_item.add_inputs(normalize_inputs)
+    normalize_processing_item.add_outputs(normalize_outputs)
+    normalize_processing_item.add_metrics({functions_config.PROCESSING_METRIC_DUPLICATE_ROWS: duplicate_rows})
+    normalize_processing_item.add_metrics(normalize_stage_metrics.to_dict())
+    normalize_processing_item.processing_done()
+    normalize_processing_item.posts = {
+        functions_config.AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE: {
+            functions_config.POST_INPUT_FILE_PATHS_KEY: normalize_outputs
+        },
+    }
+
+    compute_processing_item.add_inputs(compute_inputs)
+    compute_processing_item.add_outputs(compute_outputs)
+    compute_processing_item.add_metrics(compute_stage_metrics.to_dict())
+    compute_processing_item.processing_done()
+    compute_processing_item.posts = {}
+
+    return [normalize_processing_item, compute_processing_item]
@@ -1,11 +1,14 @@
 from py_project.config import functions_config
 from py_project.domain.adapters.orchestrator_state_service import ProcessingItem
 from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.stage_metrics import StageMetrics
 from py_project.domain.usecases.weather_normalize_metrics import ingest_normalized_inclino_metrics_to_database
 from py_project.infrastructure.local_filesystem import LocalFileSystem
 from py_project.logger import logger
+from py_project.profiler import profile_invocation
 
 
+@profile_invocation
 def main(payload: dict) -> ProcessingItem:
     logger.info(f"Started {functions_config.AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM}")
 
@@ -14,14 +17,20 @@ def main(payload: dict) -> ProcessingItem:
     source_filesystem = LocalFileSystem()
 
     file_handler = FileHandler(source_filesystem)
+    stage_metrics = StageMetrics()
     file_paths = payload.get(functions_config.POST_INPUT_FILE_PATHS_KEY)
-    inputs, outputs = ingest_normalized_inclino_metrics_to_database(
+    inputs, outputs, duplicate_rows = ingest_normalized_inclino_metrics_to_database(
         source_file_handler=file_handler,
         input_file_paths=file_paths,
+        batch_index=payload.get(functions_config.PAYLOAD_BATCH_INDEX_KEY),
+        file_ranks=payload.get(functions_config.PAYLOAD_INPUT_FILE_RANKS_KEY),
+        stage_metrics=stage_metrics,
     )
 
     processing_item.add_inputs(inputs)
     processing_item.add_outputs(outputs)
+    processing_item.add_metrics({functions_config.PROCESSING_METRIC_DUPLICATE_ROWS: duplicate_rows})
+    processing_item.add_metrics(stage_metrics.to_dict())
     processing_item.processing_done()
     processing_item.posts = {
         functions_config.AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE: {
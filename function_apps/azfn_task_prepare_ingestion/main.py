@@ -2,11 +2,21 @@ from py_project.config import functions_config
 from py_project.config import filesystem_config
 from py_project.domain.adapters.orchestrator_state_service import ProcessingItem
 from py_project.domain.entities.file_handler import FileHandler
-from py_project.domain.usecases.prepare_ingestion import get_file_paths_in_folder
+from py_project.domain.entities.file_manifest import FileManifest
+from py_project.domain.usecases.prepare_ingestion import (
+    get_checkpoint_file_details,
+    get_file_details_to_ingest,
+    pack_file_batches,
+)
+from py_project.infrastructure.functions_orchestrator_state_service import (
+    FunctionsOrchestratorJsonLinesStateService,
+)
 from py_project.logger import logger
+from py_project.profiler import profile_invocation
 from py_project.infrastructure.local_filesystem import LocalFileSystem
 
 
+@profile_invocation
 def main(payload: dict) -> ProcessingItem:
     logger.info(f"Started {functions_config.AZFN_TASK_PREPARE_INGESTION}")
     processing_item = ProcessingItem(step_name=functions_config.AZFN_TASK_PREPARE_INGESTION)
@@ -15,8 +25,44 @@ def main(payload: dict) -> ProcessingItem:
 
     file_handler = FileHandler(source_filesystem)
 
-    file_paths = get_file_paths_in_folder(
-        file_handler=file_handler, folder_path=filesystem_config.APPS_SILVER_RAW_FOLDER
+    ingestion_mode = payload.get(functions_config.PAYLOAD_INGESTION_MODE_KEY, functions_config.FULL_INGESTION_MODE)
+    checkpoint_file_details = None
+    if ingestion_mode == functions_config.INCREMENTAL_INGESTION_MODE:
+        base_log_config = filesystem_config.ORCHESTRATOR_LOG_MAPPING[payload[functions_config.PAYLOAD_BASE_NAME_KEY]]
+        orchestrator_state_service = FunctionsOrchestratorJsonLinesStateService(file_system=source_filesystem)
+        last_completed_state = orchestrator_state_service.get_last_state_given_status(
+            log_folder_path=base_log_config[filesystem_config.ORCHESTRATOR_LOG_FOLDER_KEY],
+            status=f"{functions_config.AZFN_ORCHESTRATE_INGESTION} {functions_config.TASK_STATUS_COMPLETED}",
+            base=payload[functions_config.PAYLOAD_BASE_NAME_KEY],
+        )
+        checkpoint_file_details = get_checkpoint_file_details(
+            last_completed_state=last_completed_state,
+            orchestrator_function_name=functions_config.AZFN_ORCHESTRATE_INGESTION,
+        )
+
+    source_filesystem.mkdir(filesystem_config.APPS_SILVER_MANIFEST_FOLDER)
+    file_manifest = FileManifest(
+        file_handler=file_handler,
+        manifest_file_path=(
+            f"{filesystem_config.APPS_SILVER_MANIFEST_FOLDER}/{filesystem_config.APPS_SILVER_RAW_MANIFEST_FILENAME}"
+        ),
+        max_workers=filesystem_config.FILE_HASH_MAX_WORKERS,
+    ).load()
+
+    file_details_to_ingest, file_details_to_checkpoint = get_file_details_to_ingest(
+        file_handler=file_handler,
+        folder_path=filesystem_config.APPS_SILVER_RAW_FOLDER,
+        ingestion_mode=ingestion_mode,
+        checkpoint_file_details=checkpoint_file_details,
+        file_manifest=file_manifest,
+    )
+    file_paths = [file_details.path for file_details in file_details_to_ingest]
+    logger.info(f"{len(file_paths)} out of {len(file_details_to_checkpoint)} files to ingest in {ingestion_mode} mode")
+    file_batches = pack_file_batches(
+        file_details=file_details_to_ingest,
+        max_batch_bytes=functions_config.NORMALIZE_BATCH_MAX_BYTES,
+        max_batch_rows=functions_config.NORMALIZE_BATCH_MAX_ROWS,
+        bytes_per_row=functions_config.RAW_FILE_ESTIMATED_BYTES_PER_ROW,
     )
 
     processing_item = ProcessingItem(step_name=functions_config.AZFN_TASK_PREPARE_INGESTION)
@@ -24,10 +70,16 @@ def main(payload: dict) -> ProcessingItem:
     processing_item.processing_done()
     processing_item.posts = {
         functions_config.AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM: {
-            functions_config.POST_INPUT_FILE_PATHS_KEY: file_paths
+            functions_config.POST_INPUT_FILE_PATHS_KEY: file_paths,
+            functions_config.POST_INPUT_FILE_BATCHES_KEY: file_batches,
         },
         functions_config.AZFN_ORCHESTRATE_INGESTION: {
-            functions_config.POST_SOURCE_PROCESSED_FILE_PATHS_KEY: file_paths
+            functions_config.POST_SOURCE_PROCESSED_FILE_PATHS_KEY: [
+                file_details.path for file_details in file_details_to_checkpoint
+            ],
+            functions_config.POST_SOURCE_PROCESSED_FILE_DETAILS_KEY: [
+                file_details.to_dict() for file_details in file_details_to_checkpoint
+            ],
         },
     }
 
@@ -0,0 +1,47 @@
+import argparse
+import logging
+from typing import List, Optional
+
+from py_project.config import filesystem_config
+from py_project.infrastructure.functions_orchestrator_state_service import (
+    FunctionsOrchestratorJsonLinesStateService,
+)
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+from py_project.logger import logger
+
+
+def rebuild_checkpoint_catalog(base_names: List[str]) -> List[str]:
+    file_system = LocalFileSystem()
+    orchestrator_state_service = FunctionsOrchestratorJsonLinesStateService(file_system=file_system)
+    rebuilt_log_folder_paths = []
+    for base_name in base_names:
+        log_folder_path = filesystem_config.ORCHESTRATOR_LOG_MAPPING[base_name][
+            filesystem_config.ORCHESTRATOR_LOG_FOLDER_KEY
+        ]
+        if not file_system.isdir(log_folder_path):
+            logger.warning(f"No orchestrator logs found for base {base_name} in {log_folder_path}")
+            continue
+        with orchestrator_state_service.lock_metadata(log_folder_path):
+            orchestrator_state_service.rebuild_catalog(log_folder_path)
+        logger.info(f"Checkpoint catalog of base {base_name} rebuilt from logs in {log_folder_path}")
+        rebuilt_log_folder_paths.append(log_folder_path)
+    return rebuilt_log_folder_paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild orchestrator checkpoint catalogs from the state logs")
+    parser.add_argument(
+        "--base",
+        dest="base_names",
+        action="append",
+        choices=list(filesystem_config.ORCHESTRATOR_LOG_MAPPING.keys()),
+        help="Base to rebuild, all bases if not given",
+    )
+    args = parser.parse_args(argv)
+    rebuild_checkpoint_catalog(args.base_names or list(filesystem_config.ORCHESTRATOR_LOG_MAPPING.keys()))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
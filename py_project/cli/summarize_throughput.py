@@ -0,0 +1,94 @@
+import argparse
+import logging
+from typing import List, Optional
+
+import pandas as pd
+
+from py_project.config import filesystem_config, functions_config
+from py_project.domain.entities.stage_metrics import get_stage_duration_metric_name
+from py_project.infrastructure.functions_orchestrator_state_service import (
+    FunctionsOrchestratorJsonLinesStateService,
+)
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+from py_project.logger import logger
+
+THROUGHPUT_COLUMN_NAME = "rows_per_second"
+THROUGHPUT_TREND_COLUMN_NAME = "rows_per_second_change"
+THROUGHPUT_COUNTER_METRICS = [
+    functions_config.PROCESSING_METRIC_ROWS_IN,
+    functions_config.PROCESSING_METRIC_ROWS_OUT,
+    functions_config.PROCESSING_METRIC_REJECTED_ROWS,
+    functions_config.PROCESSING_METRIC_DUPLICATE_ROWS,
+    functions_config.PROCESSING_METRIC_BYTES_READ,
+    functions_config.PROCESSING_METRIC_BYTES_WRITTEN,
+    functions_config.PROCESSING_METRIC_PEAK_RSS_BYTES,
+]
+
+
+def summarize_throughput(base_names: List[str]) -> pd.DataFrame:
+    file_system = LocalFileSystem()
+    orchestrator_state_service = FunctionsOrchestratorJsonLinesStateService(file_system=file_system)
+    stage_columns = [get_stage_duration_metric_name(stage) for stage in functions_config.PROCESSING_STAGES]
+    rows = []
+    for base_name in base_names:
+        log_folder_path = filesystem_config.ORCHESTRATOR_LOG_MAPPING[base_name][
+            filesystem_config.ORCHESTRATOR_LOG_FOLDER_KEY
+        ]
+        if not file_system.isdir(log_folder_path):
+            logger.warning(f"No orchestrator logs found for base {base_name} in {log_folder_path}")
+            continue
+        for state_dict, processing_item in orchestrator_state_service.iter_completed_processing_items(log_folder_path):
+            if processing_item.end_time is None:
+                continue
+            rows.append(
+                {
+                    "base": base_name,
+                    "jobId": state_dict.get("jobId"),
+                    "executionTime": state_dict.get("executionTime"),
+                    "step": processing_item.step_name,
+                    "seconds": processing_item.end_time - processing_item.start_time,
+                    **{
+                        metric_name: processing_item.metrics.get(metric_name)
+                        for metric_name in THROUGHPUT_COUNTER_METRICS + stage_columns
+                    },
+                }
+            )
+    summary_df = pd.DataFrame(
+        rows, columns=["base", "jobId", "executionTime", "step", "seconds"] + THROUGHPUT_COUNTER_METRICS + stage_columns
+    )
+    # Rows are counted on the way out, or on the way in for tasks which do not write rows
+    processed_rows = summary_df[functions_config.PROCESSING_METRIC_ROWS_OUT].fillna(
+        summary_df[functions_config.PROCESSING_METRIC_ROWS_IN]
+    )
+    summary_df[THROUGHPUT_COLUMN_NAME] = processed_rows / summary_df["seconds"].where(summary_df["seconds"] > 0)
+    summary_df = summary_df.sort_values(["base", "step", "executionTime"], kind="stable").reset_index(drop=True)
+    # The trend compares every run of a step with the previous one, so that regressions show up across deployments
+    summary_df[THROUGHPUT_TREND_COLUMN_NAME] = summary_df.groupby(["base", "step"])[THROUGHPUT_COLUMN_NAME].pct_change(
+        fill_method=None
+    )
+    return summary_df.dropna(axis="columns", how="all")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Summarize the throughput of the tasks from the orchestrator state logs"
+    )
+    parser.add_argument(
+        "--base",
+        dest="base_names",
+        action="append",
+        choices=list(filesystem_config.ORCHESTRATOR_LOG_MAPPING.keys()),
+        help="Base to summarize, all bases if not given",
+    )
+    parser.add_argument("--step", dest="step_names", action="append", help="Step to summarize, all steps if not given")
+    args = parser.parse_args(argv)
+    summary_df = summarize_throughput(args.base_names or list(filesystem_config.ORCHESTRATOR_LOG_MAPPING.keys()))
+    if args.step_names and not summary_df.empty:
+        summary_df = summary_df[summary_df["step"].isin(args.step_names)]
+    print(summary_df.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -11,6 +11,14 @@ WRITE_MODE_REPLACE = "replace"
 #             Weather Tables              #
 # --------------------------------------- #
 WEATHER_METRICS_TABLE_NAME = "weather_metrics"
+WEATHER_METRICS_HOURLY_TABLE_NAME = "weather_metrics_hourly"
+WEATHER_METRICS_DAILY_TABLE_NAME = "weather_metrics_daily"
+
+# Rollup tables, with the pandas frequency their buckets are floored to
+WEATHER_ROLLUP_TABLE_FREQUENCIES = {
+    WEATHER_METRICS_HOURLY_TABLE_NAME: "h",
+    WEATHER_METRICS_DAILY_TABLE_NAME: "D",
+}
 
 WEATHER_STATION_ID_COLUMN_NAME = "station_id"
 WEATHER_TIMESTAMP_COLUMN_NAME = "timestamp"
@@ -6,11 +6,13 @@ DATETIME_PATTERN = "YYYYMMDD-HHmmss"
 WEATHER_BASE_NAME = "WEATHER"
 
 ORCHESTRATOR_LOG_FILENAME_KEY = "ORCHESTRATOR_LOG_FILENAME"
+ORCHESTRATOR_LOG_JSON_LINES_FILENAME_KEY = "ORCHESTRATOR_LOG_JSON_LINES_FILENAME"
 ORCHESTRATOR_LOG_FOLDER_KEY = "ORCHESTRATOR_LOG_FOLDER"
 
 WEATHER_ORCHESTRATOR_LOG_MAPPING = {
     WEATHER_BASE_NAME: {
         ORCHESTRATOR_LOG_FILENAME_KEY: f"LOG_ORCHESTRATOR_{WEATHER_BASE_NAME}_{DATE_PATTERN}.json",
+        ORCHESTRATOR_LOG_JSON_LINES_FILENAME_KEY: f"LOG_ORCHESTRATOR_{WEATHER_BASE_NAME}_{DATE_PATTERN}.jsonl",
         ORCHESTRATOR_LOG_FOLDER_KEY: f"{LOGS_FOLDER}/ORCHESTRATORS/{WEATHER_BASE_NAME}",
     }
 }
@@ -20,6 +22,19 @@ APPS_SILVER_RAW_FOLDER: str = f"{APPS_SILVER_FOLDER}/raw"
 APPS_SILVER_NORMALIZED_FOLDER: str = f"{APPS_SILVER_FOLDER}/normalized"
 APPS_SILVER_COMPUTED_FOLDER: str = f"{APPS_SILVER_FOLDER}/computed"
 
-APPS_SILVER_NORMALIZED_FILENAME = "normalized_history.parquet"
+APPS_SILVER_MANIFEST_FOLDER: str = f"{APPS_SILVER_FOLDER}/manifests"
+
+FILE_TYPE_EXTENSIONS = {"CSV": "csv", "PARQUET": "parquet", "FEATHER": "arrow"}
+
+# Normalized files are only handed off to the compute activity, Parquet being kept for durable outputs
+APPS_SILVER_NORMALIZED_FILE_TYPE = "FEATHER"
+APPS_SILVER_NORMALIZED_FILENAME = f"normalized_history.{FILE_TYPE_EXTENSIONS[APPS_SILVER_NORMALIZED_FILE_TYPE]}"
+APPS_SILVER_RAW_MANIFEST_FILENAME = "raw_manifest.json"
+
+FILE_HASH_MAX_WORKERS = 8
 
 ORCHESTRATOR_LOG_MAPPING = {**WEATHER_ORCHESTRATOR_LOG_MAPPING}
+
+ORCHESTRATOR_LOG_COMPRESSED: bool = False
+
+PROFILES_FOLDER: str = f"{LOGS_FOLDER}/PROFILES"
@@ -1,23 +1,105 @@
 FULL_INGESTION_MODE = "FULL"
 INCREMENTAL_INGESTION_MODE = "INC"
+INGESTION_MODES = [FULL_INGESTION_MODE, INCREMENTAL_INGESTION_MODE]
 
 ORCHESTRATOR_FUNCTION_NAME_KEY = "ORCHESTRATOR_FUNCTION_NAME_KEY"
 
 
 AZFN_ORCHESTRATE_INGESTION = "azfn_orchestrate_ingestion"
 AZFN_ORCHESTRATOR_STATE_ACTIVITY = "azfn_orchestrator_state_activity"
+AZFN_ORCHESTRATOR_STATE_BATCH_ACTIVITY = "azfn_orchestrator_state_batch_activity"
 AZFN_TASK_PREPARE_INGESTION = "azfn_task_prepare_ingestion"
 AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM = "azfn_task_normalize_metrics_and_load_to_filesystem"
 AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE = "azfn_task_compute_metrics_and_load_to_database"
+AZFN_TASK_NORMALIZE_COMPUTE_AND_LOAD_TO_DATABASE = "azfn_task_normalize_compute_and_load_to_database"
+
+PIPELINE_MODE_CHAINED = "CHAINED"
+PIPELINE_MODE_FUSED = "FUSED"
+
+PIPELINE_MODE = PIPELINE_MODE_CHAINED
+
+FUSED_TASKS = {
+    AZFN_TASK_NORMALIZE_COMPUTE_AND_LOAD_TO_DATABASE: [
+        AZFN_TASK_NORMALIZE_METRICS_AND_LOAD_TO_FILESYSTEM,
+        AZFN_TASK_COMPUTE_METRICS_AND_LOAD_TO_DATABASE,
+    ],
+}
 
 
 TASK_STATUS_COMPLETED = "COMPLETED"
 TASK_STATUS_RUNNING = "RUNNING"
+TASK_STATUS_FAILED = "FAILED"
+
+STATE_FLUSH_POLICY_IMMEDIATE = "IMMEDIATE"
+STATE_FLUSH_POLICY_PER_TASK = "PER_TASK"
+STATE_FLUSH_POLICY_EVERY_N_TRANSITIONS = "EVERY_N_TRANSITIONS"
+STATE_FLUSH_POLICY_ON_COMPLETION = "ON_COMPLETION"
+
+ORCHESTRATOR_STATE_FLUSH_POLICY = STATE_FLUSH_POLICY_PER_TASK
 
 POST_INPUT_FILE_PATHS_KEY = "file_paths"
+POST_INPUT_FILE_BATCHES_KEY = "file_batches"
 POST_SOURCE_PROCESSED_FILE_PATHS_KEY = "checkpoint_mark_files"
+POST_SOURCE_PROCESSED_FILE_DETAILS_KEY = "checkpoint_mark_file_details"
+POST_CRITICAL_PATH_KEY = "critical_path"
+POST_TASK_WAIT_TIMES_KEY = "task_wait_times"
 
 PAYLOAD_INGESTION_MODE_KEY = "ingestion_mode"
 PAYLOAD_INPUT_FILE_PATHS_KEY = "file_paths"
+PAYLOAD_INPUT_FILE_BATCHES_KEY = "file_batches"
+PAYLOAD_INPUT_FILE_RANKS_KEY = "file_ranks"
 PAYLOAD_REQUEST_ID_KEY = "request_id"
 PAYLOAD_BASE_NAME_KEY = "base"
+PAYLOAD_BATCH_INDEX_KEY = "batch_index"
+
+NORMALIZE_FAN_OUT_BATCH_SIZE = 50
+NORMALIZE_BATCH_MAX_BYTES = 256 * 1024 * 1024
+NORMALIZE_BATCH_MAX_ROWS = 2_000_000
+RAW_FILE_ESTIMATED_BYTES_PER_ROW = 128
+
+STREAMING_CHUNK_ROWS = 50_000
+STREAMING_MAX_QUEUED_CHUNKS = 2
+
+DEDUPLICATION_POLICY_FIRST_SEEN = "FIRST_SEEN"
+DEDUPLICATION_POLICY_LAST_FILE_WINS = "LAST_FILE_WINS"
+DEDUPLICATION_POLICY = DEDUPLICATION_POLICY_LAST_FILE_WINS
+
+PROCESSING_METRIC_DUPLICATE_ROWS = "duplicate_rows"
+PROCESSING_METRIC_ROWS_IN = "rows_in"
+PROCESSING_METRIC_ROWS_OUT = "rows_out"
+PROCESSING_METRIC_REJECTED_ROWS = "rejected_rows"
+PROCESSING_METRIC_BYTES_READ = "bytes_read"
+PROCESSING_METRIC_BYTES_WRITTEN = "bytes_written"
+PROCESSING_METRIC_PEAK_RSS_BYTES = "peak_rss_bytes"
+PROCESSING_METRIC_SECONDS_SUFFIX = "_seconds"
+
+PROCESSING_STAGE_READ = "read"
+PROCESSING_STAGE_VALIDATE = "validate"
+PROCESSING_STAGE_TRANSFORM = "transform"
+PROCESSING_STAGE_WRITE = "write"
+PROCESSING_STAGE_LOAD = "load"
+PROCESSING_STAGES = [
+    PROCESSING_STAGE_READ,
+    PROCESSING_STAGE_VALIDATE,
+    PROCESSING_STAGE_TRANSFORM,
+    PROCESSING_STAGE_WRITE,
+    PROCESSING_STAGE_LOAD,
+]
+
+# Fraction of the worker memory, the container limit when there is one, that a task may use
+MEMORY_MAX_USAGE_FRACTION = 0.7
+# Peak memory of a stage relative to the in-memory size of its input, for the copies made while transforming it
+MEMORY_STAGE_PEAK_FACTOR = 3
+MEMORY_ESTIMATE_SAMPLE_BYTES = 64 * 1024
+
+# Profiling is enabled per worker with a comma separated list of modes, e.g. PROFILING=cprofile,sampling
+PROFILING_ENV_VARIABLE = "PROFILING"
+# Comma separated parts of the function names to profile, all profiled functions if not set
+PROFILING_TARGETS_ENV_VARIABLE = "PROFILING_TARGETS"
+PROFILING_MODE_CPROFILE = "cprofile"
+PROFILING_MODE_TRACEMALLOC = "tracemalloc"
+PROFILING_MODE_SAMPLING = "sampling"
+PROFILING_MODES = [PROFILING_MODE_CPROFILE, PROFILING_MODE_TRACEMALLOC, PROFILING_MODE_SAMPLING]
+PROFILING_SAMPLING_INTERVAL_SECONDS = 0.01
+PROFILING_TRACEMALLOC_FRAMES = 10
+PROFILING_REPORT_TOP_N = 50
@@ -0,0 +1,13 @@
+# Power curves give the turbine output (kW) at standard air density for wind speeds (m/s) at hub height
+TURBINE_POWER_CURVES = {
+    "GENERIC_2MW": {
+        "wind_speeds_ms": [3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0],
+        "powers_kw": [0.0, 66.0, 171.0, 352.0, 623.0, 982.0, 1382.0, 1736.0, 1937.0, 2000.0],
+        "cut_in_speed_ms": 3.0,
+        "rated_speed_ms": 12.0,
+        "cut_out_speed_ms": 25.0,
+        "rated_power_kw": 2000.0,
+    },
+}
+
+WIND_TURBINE_MODEL = "GENERIC_2MW"
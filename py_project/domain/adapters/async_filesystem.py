@@ -0,0 +1,41 @@
+import abc
+import asyncio
+import io
+from typing import List
+
+import pandas as pd
+
+
+class AsyncFileSystem(abc.ABC):
+    @abc.abstractmethod
+    async def ls(self, folder: str) -> List[str]:
+        pass
+
+    @abc.abstractmethod
+    async def exists(self, file_path: str) -> bool:
+        pass
+
+    @abc.abstractmethod
+    async def read_bytes(self, file_path: str) -> bytes:
+        pass
+
+    @abc.abstractmethod
+    async def write_bytes(self, file_path: str, data: bytes):
+        pass
+
+    # Parsing and serialization run in a thread, so that the event loop keeps other requests in flight
+    async def read_csv(self, file_path: str, skiprows: int = 0, **kwargs) -> pd.DataFrame:
+        data = await self.read_bytes(file_path)
+        return await asyncio.to_thread(pd.read_csv, io.BytesIO(data), skiprows=skiprows, **kwargs)
+
+    async def read_parquet(self, file_path: str, **kwargs) -> pd.DataFrame:
+        data = await self.read_bytes(file_path)
+        return await asyncio.to_thread(pd.read_parquet, io.BytesIO(data), **kwargs)
+
+    async def read_feather(self, file_path: str, **kwargs) -> pd.DataFrame:
+        data = await self.read_bytes(file_path)
+        return await asyncio.to_thread(pd.read_feather, io.BytesIO(data), **kwargs)
+
+    async def write_parquet(self, input_df: pd.DataFrame, file_path: str, **kwargs):
+        data = await asyncio.to_thread(input_df.to_parquet, None, **kwargs)
+        return await self.write_bytes(file_path, data)
@@ -1,7 +1,18 @@
 import abc
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Set, Tuple
 
 import pandas as pd
 
+from py_project.config.database_config import WRITE_MODE_APPEND, WRITE_MODE_TRUNCATE_THEN_APPEND
+
+
+@dataclass
+class TableWrite:
+    table_name: str
+    input_df: pd.DataFrame
+    write_mode: str
+
 
 class Database(abc.ABC):
     @abc.abstractclassmethod
@@ -12,6 +23,42 @@ class Database(abc.ABC):
     def write_dataframe(self, input_df: pd.DataFrame, table_name: str, schema: str, write_mode: str, **kwargs):
         pass
 
+    def write_dataframes(self, input_dfs: Iterable[pd.DataFrame], table_name: str, schema: str, write_mode: str) -> int:
+        # The write mode applies to the first dataframe, the following ones being appended
+        written_rows = 0
+        for input_df in input_dfs:
+            self.write_dataframe(input_df=input_df, table_name=table_name, schema=schema, write_mode=write_mode)
+            write_mode = WRITE_MODE_APPEND
+            written_rows += len(input_df)
+        return written_rows
+
+    def write_table_dataframes(self, table_writes: Iterable[TableWrite], schema: str) -> int:
+        # Writes are applied in order, a table being truncated by its first write only.
+        # Databases supporting transactions commit them all at once, so that a failing write leaves every table as is
+        written_rows = 0
+        written_table_names: Set[str] = set()
+        for table_write in table_writes:
+            if table_write.input_df.empty:
+                continue
+            write_mode = table_write.write_mode
+            if write_mode == WRITE_MODE_TRUNCATE_THEN_APPEND and table_write.table_name in written_table_names:
+                write_mode = WRITE_MODE_APPEND
+            self.write_dataframe(
+                input_df=table_write.input_df, table_name=table_write.table_name, schema=schema, write_mode=write_mode
+            )
+            written_table_names.add(table_write.table_name)
+            written_rows += len(table_write.input_df)
+        return written_rows
+
     @abc.abstractmethod
-    def read_dataframe(self, table, **kwargs):
+    def read_dataframe(
+        self,
+        schema_name: str,
+        table_name: str,
+        query: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        range_filter: Optional[Tuple[str, Any, Any]] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        # Without a query, the given columns are read, within the inclusive (column, min, max) range when given
         pass
@@ -1,9 +1,40 @@
 import abc
-from typing import List
+import datetime
+import fnmatch
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
 
 import pandas as pd
 
 
+@dataclass
+class FileDetails:
+    path: str
+    size: int
+    last_modified: float
+    etag: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "size": self.size,
+            "lastModified": self.last_modified,
+            "etag": self.etag,
+            "contentHash": self.content_hash,
+        }
+
+    @staticmethod
+    def from_dict(file_details_dict: dict) -> "FileDetails":
+        return FileDetails(
+            path=file_details_dict.get("path"),
+            size=file_details_dict.get("size"),
+            last_modified=file_details_dict.get("lastModified"),
+            etag=file_details_dict.get("etag"),
+            content_hash=file_details_dict.get("contentHash"),
+        )
+
+
 class FileSystem(abc.ABC):
     @abc.abstractmethod
     def exists(self, file_path: str) -> bool:
@@ -13,10 +44,45 @@ class FileSystem(abc.ABC):
     def ls(self, folder: str) -> List[str]:
         pass
 
+    @abc.abstractmethod
+    def iter_file_details(self, folder: str, recursive: bool = False, prefix: str = "") -> Iterator[FileDetails]:
+        pass
+
+    def ls_details(self, folder: str) -> List[FileDetails]:
+        return list(self.iter_file_details(folder))
+
+    def iter_files(
+        self,
+        folder: str,
+        pattern: Optional[str] = None,
+        recursive: bool = False,
+        prefix: str = "",
+        modified_after: Optional[datetime.datetime] = None,
+        modified_before: Optional[datetime.datetime] = None,
+    ) -> Iterator[FileDetails]:
+        # Patterns and prefixes apply to paths relative to the listed folder
+        for file_details in self.iter_file_details(folder, recursive=recursive, prefix=prefix):
+            relative_path = file_details.path[len(folder) :].lstrip("/")
+            if pattern is not None and not fnmatch.fnmatchcase(relative_path, pattern):
+                continue
+            if modified_after is not None and (
+                file_details.last_modified is None or file_details.last_modified < modified_after.timestamp()
+            ):
+                continue
+            if modified_before is not None and (
+                file_details.last_modified is None or file_details.last_modified >= modified_before.timestamp()
+            ):
+                continue
+            yield file_details
+
     @abc.abstractmethod
     def mkdir(self, folder_name):
         pass
 
+    @abc.abstractmethod
+    def mv(self, source_path: str, dest_path: str):
+        pass
+
     @abc.abstractmethod
     def read_csv(self, file_path: str, skiprows: int, **kwargs) -> pd.DataFrame:
         pass
@@ -29,6 +95,14 @@ class FileSystem(abc.ABC):
     def read_parquet(self, file_path: str, **kwargs):
         pass
 
+    def write_feather(self, input_df: pd.DataFrame, file_path: str, **kwargs):
+        with self.open(file_path, "wb") as f:
+            return input_df.to_feather(f, **kwargs)
+
+    def read_feather(self, file_path: str, **kwargs) -> pd.DataFrame:
+        with self.open(file_path, "rb") as f:
+            return pd.read_feather(f, **kwargs)
+
     @abc.abstractmethod
     def open(file_path: str, mode: str):
         pass
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from time import time
 from typing import Any, List, Optional, Union
 
+PEAK_METRIC_PREFIX = "peak_"
+
 
 @dataclass
 class ProcessingItem:
@@ -17,11 +19,13 @@ class ProcessingItem:
         inputs: Optional[List[str]] = None,
         outputs: Optional[List[str]] = None,
         posts: Optional[dict] = None,
+        metrics: Optional[dict] = None,
     ):
         self._step_name = step_name
         self._inputs = inputs if inputs is not None else []
         self._outputs = outputs if outputs is not None else []
         self._posts = posts if posts is not None else {}
+        self._metrics = metrics if metrics is not None else {}
         self._start_time = start_time if start_time is not None else time()
         self._end_time = end_time
 
@@ -36,6 +40,7 @@ class ProcessingItem:
             "inputs": self.inputs,
             "outputs": self.outputs,
             "posts": self.posts,
+            "metrics": self.metrics,
         }
         return processing_item
 
@@ -59,6 +64,14 @@ class ProcessingItem:
     def posts(self, new_posts: dict):
         self._posts = new_posts
 
+    @property
+    def metrics(self) -> dict:
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, new_metrics: dict):
+        self._metrics = new_metrics
+
     @staticmethod
     def filter_posts_in_processing_items(processing_items: List["ProcessingItem"], step_name: str) -> List[dict]:
         filtered_posts: List[dict] = []
@@ -85,6 +98,14 @@ class ProcessingItem:
     def add_outputs(self, outputs: List[str]):
         self._outputs = self._outputs + outputs
 
+    def add_metrics(self, metrics: dict):
+        # Metrics are counters, so that items of fanned out or retried tasks add up, except peaks which are maxed
+        for metric_name, metric_value in metrics.items():
+            if metric_name.startswith(PEAK_METRIC_PREFIX):
+                self._metrics[metric_name] = max(self._metrics.get(metric_name, metric_value), metric_value)
+            else:
+                self._metrics[metric_name] = self._metrics.get(metric_name, 0) + metric_value
+
     def processing_done(self):
         if self.end_time is not None:
             logging.warning("End_time overwritten: Beware, this is not a normal behavior.")
@@ -96,7 +117,10 @@ class ProcessingItem:
 
     @staticmethod
     def from_json(json_str: str) -> "ProcessingItem":
-        json_obj = json.loads(json_str)
+        return ProcessingItem.from_dict(json.loads(json_str))
+
+    @staticmethod
+    def from_dict(json_obj: dict) -> "ProcessingItem":
         return ProcessingItem(
             step_name=json_obj.get("stepName"),
             start_time=json_obj.get("startTime"),
@@ -104,6 +128,7 @@ class ProcessingItem:
             inputs=json_obj.get("inputs"),
             outputs=json_obj.get("outputs"),
             posts=json_obj.get("posts"),
+            metrics=json_obj.get("metrics"),
         )
 
     @staticmethod
@@ -118,6 +143,35 @@ class ProcessingItem:
                 file_paths += posts.get(post_name)
         return file_paths
 
+    @staticmethod
+    def merge_posts(posts_list: typing.List[dict]) -> dict:
+        merged_posts: dict = {}
+        for posts in posts_list:
+            for recipient, recipient_posts in posts.items():
+                merged_recipient_posts: dict = merged_posts.setdefault(recipient, {})
+                for post_name, post_value in recipient_posts.items():
+                    previous_value = merged_recipient_posts.get(post_name)
+                    if isinstance(previous_value, list) and isinstance(post_value, list):
+                        merged_recipient_posts[post_name] = previous_value + post_value
+                    else:
+                        merged_recipient_posts[post_name] = post_value
+        return merged_posts
+
+    @staticmethod
+    def merge(step_name: str, processing_items: typing.List["ProcessingItem"]) -> "ProcessingItem":
+        end_times = [item.end_time for item in processing_items if item.end_time is not None]
+        merged_item = ProcessingItem(
+            step_name=step_name,
+            start_time=min([item.start_time for item in processing_items], default=None),
+            end_time=max(end_times, default=None),
+        )
+        for processing_item in processing_items:
+            merged_item.add_inputs(processing_item.inputs)
+            merged_item.add_outputs(processing_item.outputs)
+            merged_item.add_metrics(processing_item.metrics)
+        merged_item.posts = ProcessingItem.merge_posts([item.posts for item in processing_items])
+        return merged_item
+
 
 @dataclass
 class OrchestratorState:
@@ -201,7 +255,10 @@ class OrchestratorState:
 
     @staticmethod
     def from_json(json_str: str):
-        state_dict = json.loads(json_str)
+        return OrchestratorState.from_dict(json.loads(json_str))
+
+    @staticmethod
+    def from_dict(state_dict: dict) -> "OrchestratorState":
         state_obj = OrchestratorState(
             execution_time=state_dict.get("executionTime"),
             base=state_dict.get("base"),
@@ -209,12 +266,7 @@ class OrchestratorState:
             status=state_dict.get("status"),
             job_id=state_dict.get("jobId"),
         )
-        state_obj.state_processing_items = list(
-            map(
-                lambda stateProcessingItem: ProcessingItem.from_json(json.dumps(stateProcessingItem)),
-                state_dict.get("stateProcessingItems"),
-            )
-        )
+        state_obj.state_processing_items = list(map(ProcessingItem.from_dict, state_dict.get("stateProcessingItems")))
         state_obj.posts = state_dict.get("posts")
         return state_obj
 
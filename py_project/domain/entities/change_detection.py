@@ -0,0 +1,31 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+ROW_HASH_COLUMN_NAME = "row_hash"
+
+
+def compute_row_hashes(input_df: pd.DataFrame, hashed_columns: List[str]) -> pd.Series:
+    # Hashes are cast to signed 64 bits integers, so that they fit a BIGINT column
+    row_hashes = pd.util.hash_pandas_object(input_df[hashed_columns], index=False).to_numpy().view(np.int64)
+    return pd.Series(row_hashes, index=input_df.index, name=ROW_HASH_COLUMN_NAME)
+
+
+def add_row_hashes(input_df: pd.DataFrame, hashed_columns: List[str]) -> pd.DataFrame:
+    output_df = input_df.copy()
+    output_df[ROW_HASH_COLUMN_NAME] = compute_row_hashes(input_df, hashed_columns)
+    return output_df
+
+
+def split_new_and_changed_rows(
+    input_df: pd.DataFrame, stored_row_hashes_df: pd.DataFrame, key_columns: List[str]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # Rows whose key is stored with the same hash are unchanged and dropped
+    stored_row_hashes_df = stored_row_hashes_df[key_columns + [ROW_HASH_COLUMN_NAME]].drop_duplicates(key_columns)
+    matched_df = input_df[key_columns].merge(
+        stored_row_hashes_df, how="left", on=key_columns, suffixes=("", "_stored"), indicator=True
+    )
+    is_new = (matched_df["_merge"] == "left_only").to_numpy()
+    is_changed = ~is_new & (matched_df[ROW_HASH_COLUMN_NAME].to_numpy() != input_df[ROW_HASH_COLUMN_NAME].to_numpy())
+    return input_df[is_new], input_df[is_changed]
@@ -0,0 +1,124 @@
+from typing import List, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from py_project.config import functions_config
+
+
+T = TypeVar("T")
+
+# Position of the raw file a row comes from in the files of an ingestion, so that batches resolve overlaps alike
+SOURCE_FILE_RANK_COLUMN_NAME = "source_file_rank"
+
+
+class UnknownDeduplicationPolicyError(Exception):
+    pass
+
+
+def get_unknown_policy_error(policy: str) -> UnknownDeduplicationPolicyError:
+    return UnknownDeduplicationPolicyError(
+        f"Unknown deduplication policy {policy}, use {functions_config.DEDUPLICATION_POLICY_FIRST_SEEN}"
+        f" or {functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS}"
+    )
+
+
+def order_files_for_deduplication(files: List[T], policy: str) -> List[T]:
+    # Rows are kept on first sight, so that the last file wins by visiting files backwards
+    if policy == functions_config.DEDUPLICATION_POLICY_FIRST_SEEN:
+        return list(files)
+    if policy == functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS:
+        return list(reversed(files))
+    raise get_unknown_policy_error(policy)
+
+
+def add_source_file_rank(input_df: pd.DataFrame, file_rank: int) -> pd.DataFrame:
+    return input_df.assign(**{SOURCE_FILE_RANK_COLUMN_NAME: np.int64(file_rank)})
+
+
+def hash_key_columns(input_df: pd.DataFrame, key_columns: List[str]) -> np.ndarray:
+    return pd.util.hash_pandas_object(input_df[key_columns], index=False).to_numpy()
+
+
+def search_sorted_hashes(sorted_hashes: np.ndarray, key_hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Positions the key hashes would be inserted at to keep hashes sorted, and whether they are there already
+    insert_positions = np.searchsorted(sorted_hashes, key_hashes)
+    is_found = np.zeros(len(key_hashes), dtype=bool)
+    in_bounds = insert_positions < len(sorted_hashes)
+    is_found[in_bounds] = sorted_hashes[insert_positions[in_bounds]] == key_hashes[in_bounds]
+    return insert_positions, is_found
+
+
+class KeyDeduplicator:
+    def __init__(self, key_columns: List[str]):
+        self.key_columns = key_columns
+        self.duplicate_rows = 0
+        # Seen keys are kept as a sorted array of 64 bits hashes rather than a set of Python objects
+        self._seen_hashes = np.empty(0, dtype=np.uint64)
+
+    @property
+    def seen_keys(self) -> int:
+        return len(self._seen_hashes)
+
+    def is_seen(self, input_df: pd.DataFrame) -> np.ndarray:
+        _, is_seen = search_sorted_hashes(self._seen_hashes, hash_key_columns(input_df, self.key_columns))
+        return is_seen
+
+    def drop_seen(self, input_df: pd.DataFrame) -> pd.DataFrame:
+        if input_df.empty:
+            return input_df
+        unique_hashes, first_indexes = np.unique(hash_key_columns(input_df, self.key_columns), return_index=True)
+        insert_positions, is_seen = search_sorted_hashes(self._seen_hashes, unique_hashes)
+
+        self._seen_hashes = np.insert(self._seen_hashes, insert_positions[~is_seen], unique_hashes[~is_seen])
+        kept_indexes = np.sort(first_indexes[~is_seen])
+        self.duplicate_rows += len(input_df) - len(kept_indexes)
+        return input_df.iloc[kept_indexes]
+
+
+class RankedKeyDeduplicator:
+    def __init__(self, key_columns: List[str], policy: str = functions_config.DEDUPLICATION_POLICY):
+        self.key_columns = key_columns
+        self.policy = policy
+        self.outranked_rows = 0
+        # Keys are kept as a sorted array of 64 bits hashes, along with the rank of the file their row comes from
+        self._seen_hashes = np.empty(0, dtype=np.uint64)
+        self._seen_ranks = np.empty(0, dtype=np.int64)
+
+    @property
+    def seen_keys(self) -> int:
+        return len(self._seen_hashes)
+
+    def get_winning_ranks(self, input_df: pd.DataFrame) -> np.ndarray:
+        # Rows of a same file share their rank, rows without any rank sharing a rank of 0
+        if SOURCE_FILE_RANK_COLUMN_NAME not in input_df.columns:
+            return np.zeros(len(input_df), dtype=np.int64)
+        file_ranks = input_df[SOURCE_FILE_RANK_COLUMN_NAME].to_numpy(dtype=np.int64)
+        if self.policy == functions_config.DEDUPLICATION_POLICY_FIRST_SEEN:
+            return -file_ranks
+        if self.policy == functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS:
+            return file_ranks
+        raise get_unknown_policy_error(self.policy)
+
+    def drop_outranked(self, input_df: pd.DataFrame) -> pd.DataFrame:
+        # Keeps the row of a key whose file wins under the policy among the rows seen so far, the last row on ties
+        if input_df.empty:
+            return input_df
+        winning_ranks = self.get_winning_ranks(input_df)
+        row_order = np.lexsort((-np.arange(len(input_df)), -winning_ranks))
+        unique_hashes, first_positions = np.unique(
+            hash_key_columns(input_df, self.key_columns)[row_order], return_index=True
+        )
+        best_indexes = row_order[first_positions]
+        best_ranks = winning_ranks[best_indexes]
+
+        insert_positions, is_seen = search_sorted_hashes(self._seen_hashes, unique_hashes)
+        is_kept = ~is_seen
+        is_kept[is_seen] = best_ranks[is_seen] >= self._seen_ranks[insert_positions[is_seen]]
+
+        self._seen_ranks[insert_positions[is_seen & is_kept]] = best_ranks[is_seen & is_kept]
+        self._seen_hashes = np.insert(self._seen_hashes, insert_positions[~is_seen], unique_hashes[~is_seen])
+        self._seen_ranks = np.insert(self._seen_ranks, insert_positions[~is_seen], best_ranks[~is_seen])
+        kept_indexes = np.sort(best_indexes[is_kept])
+        self.outranked_rows += len(input_df) - len(kept_indexes)
+        return input_df.iloc[kept_indexes]
@@ -1,17 +1,43 @@
+import asyncio
+import datetime
+import hashlib
+import io
+import json
 import typing
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 
-from py_project.domain.adapters.filesystem import FileSystem
+from py_project.domain.adapters.async_filesystem import AsyncFileSystem
+from py_project.domain.adapters.filesystem import FileDetails, FileSystem
+
+
+HASH_ALGORITHM = "sha256"
+HASH_CHUNK_SIZE = 1024 * 1024
+ASYNC_MAX_CONCURRENCY = 32
+WRITE_FILES_MAX_WORKERS = 4
+# Intermediate files are left uncompressed, so that they can be memory-mapped without being decoded
+FEATHER_COMPRESSION = "uncompressed"
 
 
 class UnimplementReadOperationError(Exception):
     pass
 
 
+class MissingAsyncFileSystemError(Exception):
+    pass
+
+
 class FileHandler:
-    def __init__(self, filesystem: FileSystem):
+    def __init__(self, filesystem: FileSystem, async_filesystem: typing.Optional[AsyncFileSystem] = None):
         self.filesystem = filesystem
+        self.async_filesystem = async_filesystem
+
+    def get_async_filesystem(self) -> AsyncFileSystem:
+        if self.async_filesystem is None:
+            raise MissingAsyncFileSystemError("Async operations require the file handler to have an async filesystem")
+        return self.async_filesystem
 
     def ls(self, folder_path: str):
         return self.filesystem.ls(folder_path)
@@ -21,31 +47,196 @@ class FileHandler:
             return self.filesystem.read_csv(file_path, skiprows=0, **kwargs)
         elif file_type == "PARQUET":
             return self.filesystem.read_parquet(file_path, **kwargs)
+        elif file_type == "FEATHER":
+            return self.filesystem.read_feather(file_path, **kwargs)
         else:
-            raise UnimplementReadOperationError(f"Read operation for {file_type} not implemented, use CSV or PARQUET")
+            raise UnimplementReadOperationError(
+                f"Read operation for {file_type} not implemented, use CSV, PARQUET or FEATHER"
+            )
 
     def read_files(self, file_paths: typing.List[str], file_type: str = "CSV", **kwargs) -> pd.DataFrame:
         list_df = []
         if len(file_paths) > 0:
             for file_path in file_paths:
                 item_df = self.read_file(file_path=file_path, file_type=file_type, **kwargs)
-                list_df.append(item_df.copy(deep=True))
-            output_df = pd.concat(list_df).reset_index(drop=True)
+                # Feather columns are kept over the mapped pages, a single file being returned without any copy
+                list_df.append(item_df if file_type == "FEATHER" else item_df.copy(deep=True))
+            if file_type == "FEATHER" and len(list_df) == 1:
+                return list_df[0]
+            output_df = pd.concat(list_df, ignore_index=True)
             return output_df
         return pd.DataFrame()
 
+    def iter_csv_chunks(self, file_paths: typing.List[str], chunk_rows: int, **kwargs) -> typing.Iterator[pd.DataFrame]:
+        # Files are opened one at a time and parsed chunk by chunk, so that only one chunk is held in memory
+        for file_path in file_paths:
+            with self.filesystem.open(file_path, "rb") as f:
+                with pd.read_csv(f, skiprows=0, chunksize=chunk_rows, **kwargs) as chunks:
+                    yield from chunks
+
+    def get_file_size(self, file_path: str) -> int:
+        with self.filesystem.open(file_path, "rb") as f:
+            return f.seek(0, io.SEEK_END)
+
+    def estimate_csv_memory_bytes(self, file_path: str, sample_bytes: int, **kwargs) -> int:
+        # The in-memory size of the first rows is extrapolated to the whole file, before reading it
+        with self.filesystem.open(file_path, "rb") as f:
+            sample = f.read(sample_bytes)
+            file_size = f.seek(0, io.SEEK_END)
+        if len(sample) < file_size:
+            sample = sample[: sample.rfind(b"\n") + 1]
+        header_size = sample.find(b"\n") + 1
+        sample_df = pd.read_csv(io.BytesIO(sample), **kwargs) if header_size > 0 else pd.DataFrame()
+        if sample_df.empty:
+            return file_size
+        memory_bytes_per_row = sample_df.memory_usage(index=False, deep=True).sum() / len(sample_df)
+        file_bytes_per_row = (len(sample) - header_size) / len(sample_df)
+        return int(memory_bytes_per_row * (file_size - header_size) / file_bytes_per_row)
+
+    def estimate_file_memory_bytes(self, file_path: str, file_type: str, sample_bytes: int, **kwargs) -> int:
+        if file_type == "CSV":
+            return self.estimate_csv_memory_bytes(file_path, sample_bytes=sample_bytes, **kwargs)
+        # Other files are columnar, intermediate ones being uncompressed
+        return self.get_file_size(file_path)
+
+    def iter_files(
+        self,
+        folder_path: str,
+        pattern: typing.Optional[str] = None,
+        recursive: bool = False,
+        prefix: str = "",
+        modified_after: typing.Optional[datetime.datetime] = None,
+        modified_before: typing.Optional[datetime.datetime] = None,
+    ) -> typing.Iterator[FileDetails]:
+        return self.filesystem.iter_files(
+            folder_path,
+            pattern=pattern,
+            recursive=recursive,
+            prefix=prefix,
+            modified_after=modified_after,
+            modified_before=modified_before,
+        )
+
+    def get_latest_file_path(
+        self, folder_path: str, pattern: typing.Optional[str] = None, prefix: str = ""
+    ) -> typing.Optional[str]:
+        # Streams the listing, so that only the current latest file is kept in memory
+        file_paths = (details.path for details in self.iter_files(folder_path, pattern=pattern, prefix=prefix))
+        return max(file_paths, default=None)
+
+    async def read_file_async(self, file_path: str, file_type: str = "CSV", **kwargs) -> pd.DataFrame:
+        if file_type == "CSV":
+            return await self.get_async_filesystem().read_csv(file_path, skiprows=0, **kwargs)
+        elif file_type == "PARQUET":
+            return await self.get_async_filesystem().read_parquet(file_path, **kwargs)
+        elif file_type == "FEATHER":
+            return await self.get_async_filesystem().read_feather(file_path, **kwargs)
+        else:
+            raise UnimplementReadOperationError(
+                f"Read operation for {file_type} not implemented, use CSV, PARQUET or FEATHER"
+            )
+
+    async def read_files_async(
+        self,
+        file_paths: typing.List[str],
+        file_type: str = "CSV",
+        max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+        **kwargs,
+    ) -> pd.DataFrame:
+        # Up to max_concurrency files are requested at once, dataframes being concatenated in file_paths order
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def read_file(file_path: str) -> pd.DataFrame:
+            async with semaphore:
+                return await self.read_file_async(file_path=file_path, file_type=file_type, **kwargs)
+
+        if len(file_paths) > 0:
+            list_df = await asyncio.gather(*[read_file(file_path) for file_path in file_paths])
+            return pd.concat(list_df).reset_index(drop=True)
+        return pd.DataFrame()
+
+    async def write_files_async(
+        self,
+        input_dfs: typing.Dict[str, pd.DataFrame],
+        file_type: str = "PARQUET",
+        max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+        **kwargs,
+    ) -> typing.List[str]:
+        if file_type != "PARQUET":
+            raise UnimplementReadOperationError(f"Write operation for {file_type} not implemented, use PARQUET")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def write_file(file_path: str, input_df: pd.DataFrame) -> str:
+            async with semaphore:
+                await self.get_async_filesystem().write_parquet(input_df=input_df, file_path=file_path, **kwargs)
+                return file_path
+
+        return list(await asyncio.gather(*[write_file(path, input_df) for path, input_df in input_dfs.items()]))
+
     def get_file_paths_in_folder(self, folder_path: str, only_latest_file: bool) -> typing.List[str]:
-        filenames = self.ls(folder_path)
         if only_latest_file:
-            filenames = [max(filenames)]
+            latest_file_path = self.get_latest_file_path(folder_path)
+            return [latest_file_path] if latest_file_path is not None else []
+        filenames = self.ls(folder_path)
         file_paths = [f"{folder_path}/{filename}" for filename in filenames]
         return file_paths
 
+    def get_file_details_in_folder(self, folder_path: str) -> typing.List[FileDetails]:
+        return self.filesystem.ls_details(folder_path)
+
+    def compute_file_hash(self, file_path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+        # Stream the file, so that large files are hashed without being loaded in memory
+        file_hash = hashlib.new(HASH_ALGORITHM)
+        with self.filesystem.open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                file_hash.update(chunk)
+        return f"{HASH_ALGORITHM}:{file_hash.hexdigest()}"
+
+    def read_json_file(self, file_path: str) -> typing.Optional[typing.Any]:
+        if not self.filesystem.exists(file_path):
+            return None
+        with self.filesystem.open(file_path, "r") as f:
+            return json.load(f)
+
+    def write_json_file(self, json_obj: typing.Any, file_path: str):
+        with self.filesystem.open(file_path, "w") as f:
+            json.dump(json_obj, f)
+
+    def write_json_file_atomically(self, json_obj: typing.Any, file_path: str):
+        # Write then rename, so that an interrupted write never leaves a truncated file behind
+        tmp_file_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        self.write_json_file(json_obj, tmp_file_path)
+        self.filesystem.mv(tmp_file_path, file_path)
+
     def write_file(self, input_df: pd.DataFrame, file_path: str, file_type: str = "PARQUET", **kwargs):
         if file_type == "PARQUET":
             return self.filesystem.write_parquet(input_df=input_df, file_path=file_path, **kwargs)
+        elif file_type == "FEATHER":
+            kwargs.setdefault("compression", FEATHER_COMPRESSION)
+            return self.filesystem.write_feather(input_df=input_df, file_path=file_path, **kwargs)
         else:
-            raise UnimplementReadOperationError(f"Write operation for {file_type} not implemented, use PARQUET")
+            raise UnimplementReadOperationError(
+                f"Write operation for {file_type} not implemented, use PARQUET or FEATHER"
+            )
+
+    def write_files(
+        self,
+        input_dfs: typing.Dict[str, pd.DataFrame],
+        file_type: str = "PARQUET",
+        max_workers: int = WRITE_FILES_MAX_WORKERS,
+        **kwargs,
+    ) -> typing.List[str]:
+        # Files are written in parallel, so that publishing many files is not bound by a single stream
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                file_path: executor.submit(
+                    self.write_file, input_df, file_path=file_path, file_type=file_type, **kwargs
+                )
+                for file_path, input_df in input_dfs.items()
+            }
+            for future in futures.values():
+                future.result()
+        return list(futures.keys())
 
     def write_file_in_folder(
         self, input_df: pd.DataFrame, dest_folder: str, filename: str, file_type: str = "PARQUET"
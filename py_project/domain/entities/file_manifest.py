@@ -0,0 +1,64 @@
+import dataclasses
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from py_project.config import filesystem_config
+from py_project.domain.adapters.filesystem import FileDetails
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.logger import logger
+
+
+class FileManifest:
+    def __init__(
+        self,
+        file_handler: FileHandler,
+        manifest_file_path: str,
+        max_workers: int = filesystem_config.FILE_HASH_MAX_WORKERS,
+    ):
+        self.file_handler = file_handler
+        self.manifest_file_path = manifest_file_path
+        self.max_workers = max_workers
+        self.file_details_by_path: typing.Dict[str, FileDetails] = {}
+
+    def load(self) -> "FileManifest":
+        manifest_dict = self.file_handler.read_json_file(self.manifest_file_path) or {}
+        self.file_details_by_path = {path: FileDetails.from_dict(details) for path, details in manifest_dict.items()}
+        return self
+
+    def save(self):
+        self.file_handler.write_json_file_atomically(
+            {path: details.to_dict() for path, details in self.file_details_by_path.items()}, self.manifest_file_path
+        )
+
+    @staticmethod
+    def has_same_metadata(file_details: FileDetails, manifest_file_details: FileDetails) -> bool:
+        if file_details.etag is not None and manifest_file_details.etag is not None:
+            return file_details.etag == manifest_file_details.etag
+        return (file_details.size, file_details.last_modified) == (
+            manifest_file_details.size,
+            manifest_file_details.last_modified,
+        )
+
+    def get_cached_content_hash(self, file_details: FileDetails) -> typing.Optional[str]:
+        manifest_file_details = self.file_details_by_path.get(file_details.path)
+        if manifest_file_details is None or not self.has_same_metadata(file_details, manifest_file_details):
+            return None
+        return manifest_file_details.content_hash
+
+    def update(self, file_details: typing.List[FileDetails]) -> typing.List[FileDetails]:
+        # Only files that are new or whose metadata changed since the last update are hashed, in parallel
+        hashed_file_details = [
+            dataclasses.replace(details, content_hash=self.get_cached_content_hash(details)) for details in file_details
+        ]
+        file_details_to_hash = [details for details in hashed_file_details if details.content_hash is None]
+        logger.info(f"Hashing {len(file_details_to_hash)} out of {len(file_details)} files")
+        if file_details_to_hash:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                content_hashes = executor.map(
+                    self.file_handler.compute_file_hash, [details.path for details in file_details_to_hash]
+                )
+                for details, content_hash in zip(file_details_to_hash, content_hashes):
+                    details.content_hash = content_hash
+
+        self.file_details_by_path = {details.path: details for details in hashed_file_details}
+        return hashed_file_details
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+
+
+class UnknownMetricError(Exception):
+    pass
+
+
+class CyclicMetricDependencyError(Exception):
+    pass
+
+
+@dataclass
+class MetricKernel:
+    output: str
+    inputs: List[str]
+    fn: Callable[..., np.ndarray]
+    dtype: Any = field(default=pa.typing.Float64)
+
+
+class MetricRegistry:
+    def __init__(self):
+        self.kernels: Dict[str, MetricKernel] = {}
+
+    def register(self, output: str, inputs: List[str], dtype: Any = pa.typing.Float64) -> Callable:
+        # Kernels receive one array per input column, in the inputs order, and return the output array
+        def decorator(fn: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+            self.kernels[output] = MetricKernel(output=output, inputs=inputs, fn=fn, dtype=dtype)
+            return fn
+
+        return decorator
+
+    def get_kernel(self, output: str) -> MetricKernel:
+        if output not in self.kernels:
+            raise UnknownMetricError(f"No kernel registered for metric {output}, use {list(self.kernels)}")
+        return self.kernels[output]
+
+    def resolve(self, outputs: List[str], available_columns: Iterable[str]) -> List[MetricKernel]:
+        # Kernels are sorted so that each one comes after the kernels computing its inputs,
+        # inputs already available being read rather than computed
+        available_columns = set(available_columns)
+        sorted_kernels: List[MetricKernel] = []
+        resolving_outputs: List[str] = []
+
+        def visit(output: str):
+            if output in resolving_outputs:
+                raise CyclicMetricDependencyError(f"Metric {output} depends on itself through {resolving_outputs}")
+            if any(kernel.output == output for kernel in sorted_kernels):
+                return
+            kernel = self.get_kernel(output)
+            resolving_outputs.append(output)
+            for input_column in kernel.inputs:
+                if input_column not in available_columns:
+                    visit(input_column)
+            resolving_outputs.pop()
+            sorted_kernels.append(kernel)
+
+        for output in outputs:
+            visit(output)
+        return sorted_kernels
+
+    def evaluate(self, input_df: pd.DataFrame, outputs: Optional[List[str]] = None) -> pd.DataFrame:
+        # Intermediate arrays are computed once and shared by kernels, only the requested outputs being added
+        outputs = outputs if outputs is not None else list(self.kernels)
+        arrays: Dict[str, np.ndarray] = {}
+
+        def get_array(column: str) -> np.ndarray:
+            if column not in arrays:
+                arrays[column] = input_df[column].to_numpy()
+            return arrays[column]
+
+        for kernel in self.resolve(outputs, available_columns=input_df.columns):
+            arrays[kernel.output] = kernel.fn(*[get_array(input_column) for input_column in kernel.inputs])
+        for output in outputs:
+            input_df[output] = arrays[output]
+        return input_df
+
+    def get_schema_outputs(self, schema: type) -> List[str]:
+        return [column for column in schema.to_schema().columns if column in self.kernels]
+
+    def build_schema(self, base_schema: type, outputs: List[str], schema_name: str) -> type:
+        annotations = {output: pa.typing.Series[self.get_kernel(output).dtype] for output in outputs}
+        fields = {output: pa.Field(alias=output, coerce=True) for output in outputs}
+        return type(
+            schema_name,
+            (base_schema,),
+            {"__annotations__": annotations, "__module__": base_schema.__module__, **fields},
+        )
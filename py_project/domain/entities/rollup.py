@@ -0,0 +1,46 @@
+from typing import List
+
+import pandas as pd
+
+ROLLUP_BUCKET_COLUMN_NAME = "bucket_start"
+
+# Partial aggregates kept in rollup tables, means being derived from sums and counts so that partials can be merged
+ROLLUP_PARTIAL_AGGREGATES = ["min", "max", "sum", "count"]
+ROLLUP_MERGE_AGGREGATES = {"min": "min", "max": "max", "sum": "sum", "count": "sum"}
+
+
+def get_rollup_columns(metric_columns: List[str]) -> List[str]:
+    return [
+        f"{metric_column}_{aggregate}"
+        for metric_column in metric_columns
+        for aggregate in ROLLUP_PARTIAL_AGGREGATES + ["mean"]
+    ]
+
+
+def add_rollup_means(rollup_df: pd.DataFrame, metric_columns: List[str]) -> pd.DataFrame:
+    for metric_column in metric_columns:
+        counts = rollup_df[f"{metric_column}_count"]
+        rollup_df[f"{metric_column}_mean"] = rollup_df[f"{metric_column}_sum"] / counts.where(counts > 0)
+    return rollup_df[[ROLLUP_BUCKET_COLUMN_NAME] + get_rollup_columns(metric_columns)]
+
+
+def compute_rollup_partials(
+    metrics_df: pd.DataFrame, timestamp_column: str, metric_columns: List[str], frequency: str
+) -> pd.DataFrame:
+    buckets = metrics_df[timestamp_column].dt.floor(frequency).rename(ROLLUP_BUCKET_COLUMN_NAME)
+    rollup_df = metrics_df[metric_columns].groupby(buckets).agg(ROLLUP_PARTIAL_AGGREGATES)
+    rollup_df.columns = ["_".join(column_name) for column_name in rollup_df.columns]
+    return add_rollup_means(rollup_df.reset_index(), metric_columns)
+
+
+def merge_rollup_partials(rollup_dfs: List[pd.DataFrame], metric_columns: List[str]) -> pd.DataFrame:
+    rollup_dfs = [rollup_df for rollup_df in rollup_dfs if not rollup_df.empty]
+    if not rollup_dfs:
+        return pd.DataFrame(columns=[ROLLUP_BUCKET_COLUMN_NAME] + get_rollup_columns(metric_columns))
+    merge_aggregates = {
+        f"{metric_column}_{aggregate}": merge_aggregate
+        for metric_column in metric_columns
+        for aggregate, merge_aggregate in ROLLUP_MERGE_AGGREGATES.items()
+    }
+    rollup_df = pd.concat(rollup_dfs).groupby(ROLLUP_BUCKET_COLUMN_NAME).agg(merge_aggregates)
+    return add_rollup_means(rollup_df.reset_index(), metric_columns)
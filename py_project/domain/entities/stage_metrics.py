@@ -0,0 +1,40 @@
+import contextlib
+import threading
+import time
+import typing
+
+from py_project.config import functions_config
+from py_project.memory_governor import get_peak_rss_bytes
+
+
+def get_stage_duration_metric_name(stage: str) -> str:
+    return f"{stage}{functions_config.PROCESSING_METRIC_SECONDS_SUFFIX}"
+
+
+class StageMetrics:
+    """Collects the counters and sub-stage durations of a task, stages possibly running on several threads"""
+
+    def __init__(self):
+        self._metrics: typing.Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, metric_name: str, value: float):
+        with self._lock:
+            self._metrics[metric_name] = self._metrics.get(metric_name, 0) + value
+
+    def observe_peak(self, metric_name: str, value: float):
+        with self._lock:
+            self._metrics[metric_name] = max(self._metrics.get(metric_name, value), value)
+
+    @contextlib.contextmanager
+    def measure(self, stage: str) -> typing.Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(get_stage_duration_metric_name(stage), time.perf_counter() - start_time)
+            self.observe_peak(functions_config.PROCESSING_METRIC_PEAK_RSS_BYTES, get_peak_rss_bytes())
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return dict(self._metrics)
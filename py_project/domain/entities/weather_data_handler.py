@@ -1,9 +1,12 @@
-from typing import Callable
+from typing import Callable, Optional
 
+import numpy as np
 import pandas as pd
 import pandera as pa
 
+from py_project.domain.entities import wind_power
 from py_project.domain.entities._validator import validate_input, validate_output
+from py_project.domain.entities.metric_registry import MetricRegistry
 
 WEATHER_RAW_TIMESTAMP_COLUMN_NAME = "Formatted Date"
 WEATHER_RAW_TEMPERATURE_COLUMN_NAME = "Temperature (C)"
@@ -21,6 +24,7 @@ WEATHER_WIND_BEARING_COLUMN_NAME = "wind_bearing_deg"
 WEATHER_VISIBILITY_COLUMN_NAME = "visibility_km"
 WEATHER_PRESSURE_COLUMN_NAME = "pressure_mbar"
 
+WEATHER_AIR_DENSITY = "air_density_kg_m3"
 WEATHER_WIND_POWER = "wind_power_kw"
 
 WEATHER_RAW_COLUMNS = [
@@ -76,8 +80,37 @@ class NormalizedWeatherMetricsSchema(pa.SchemaModel):
     pressure: pa.typing.Series[pa.typing.Float64] = pa.Field(alias=WEATHER_PRESSURE_COLUMN_NAME, coerce=True)
 
 
-class ComputedWeatherMetricsSchema(NormalizedWeatherMetricsSchema):
-    wind_power_kw: pa.typing.Series[pa.typing.Float64] = pa.Field(alias=WEATHER_WIND_POWER, coerce=True)
+WEATHER_METRIC_REGISTRY = MetricRegistry()
+
+
+@WEATHER_METRIC_REGISTRY.register(
+    output=WEATHER_AIR_DENSITY, inputs=[WEATHER_TEMPERATURE_COLUMN_NAME, WEATHER_PRESSURE_COLUMN_NAME]
+)
+def compute_air_density(temperature_c: np.ndarray, pressure_mbar: np.ndarray) -> np.ndarray:
+    return wind_power.compute_air_density(temperature_c, pressure_mbar)
+
+
+@WEATHER_METRIC_REGISTRY.register(
+    output=WEATHER_WIND_POWER, inputs=[WEATHER_WIND_SPEED_COLUMN_NAME, WEATHER_AIR_DENSITY]
+)
+def compute_wind_power(wind_speed_kmh: np.ndarray, air_density: np.ndarray) -> np.ndarray:
+    return wind_power.compute_wind_power_kw_from_air_density(
+        wind_speed_kmh, air_density, wind_power.get_turbine_power_curve()
+    )
+
+
+# Metrics loaded to the weather metrics table, intermediate metrics being computed only when required
+WEATHER_COMPUTED_METRICS = [WEATHER_WIND_POWER]
+
+ComputedWeatherMetricsSchema = WEATHER_METRIC_REGISTRY.build_schema(
+    NormalizedWeatherMetricsSchema, outputs=WEATHER_COMPUTED_METRICS, schema_name="ComputedWeatherMetricsSchema"
+)
+
+
+def add_computed_metrics(input_df: pd.DataFrame) -> pd.DataFrame:
+    return WEATHER_METRIC_REGISTRY.evaluate(
+        input_df, outputs=WEATHER_METRIC_REGISTRY.get_schema_outputs(ComputedWeatherMetricsSchema)
+    )
 
 
 @validate_output(RawWeatherMetricsSchema)
@@ -109,8 +142,12 @@ def transform_from_raw_to_normalized_metrics(
 @validate_output(ComputedWeatherMetricsSchema)
 def transform_from_normalized_to_computed_metrics(
     input_df: pa.typing.DataFrame[NormalizedWeatherMetricsSchema],
-    add_computed_metrics_fn: Callable[
-        [pa.typing.DataFrame[NormalizedWeatherMetricsSchema]], pa.typing.DataFrame[ComputedWeatherMetricsSchema]
-    ],
+    add_computed_metrics_fn: Optional[
+        Callable[
+            [pa.typing.DataFrame[NormalizedWeatherMetricsSchema]], pa.typing.DataFrame[ComputedWeatherMetricsSchema]
+        ]
+    ] = None,
 ) -> pa.typing.DataFrame[ComputedWeatherMetricsSchema]:
+    if add_computed_metrics_fn is None:
+        add_computed_metrics_fn = add_computed_metrics
     return add_computed_metrics_fn(input_df)
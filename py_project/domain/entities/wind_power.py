@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from py_project.config import wind_power_config
+
+KMH_TO_MS = 1 / 3.6
+MBAR_TO_PA = 100.0
+CELSIUS_TO_KELVIN = 273.15
+DRY_AIR_SPECIFIC_GAS_CONSTANT = 287.05
+STANDARD_AIR_DENSITY_KG_M3 = 1.225
+
+
+class InvalidPowerCurveError(Exception):
+    pass
+
+
+@dataclass
+class TurbinePowerCurve:
+    wind_speeds_ms: List[float]
+    powers_kw: List[float]
+    cut_in_speed_ms: float
+    rated_speed_ms: float
+    cut_out_speed_ms: float
+    rated_power_kw: float
+
+    def __post_init__(self):
+        if len(self.wind_speeds_ms) != len(self.powers_kw) or len(self.wind_speeds_ms) < 2:
+            raise InvalidPowerCurveError("A power curve needs at least two points, with one power per wind speed")
+        if np.any(np.diff(self.wind_speeds_ms) <= 0):
+            raise InvalidPowerCurveError("Power curve wind speeds must be strictly increasing")
+        if not self.cut_in_speed_ms < self.rated_speed_ms < self.cut_out_speed_ms:
+            raise InvalidPowerCurveError("Power curve speeds must satisfy cut-in < rated < cut-out")
+
+    @staticmethod
+    def from_dict(power_curve_dict: dict) -> "TurbinePowerCurve":
+        return TurbinePowerCurve(
+            wind_speeds_ms=power_curve_dict["wind_speeds_ms"],
+            powers_kw=power_curve_dict["powers_kw"],
+            cut_in_speed_ms=power_curve_dict["cut_in_speed_ms"],
+            rated_speed_ms=power_curve_dict["rated_speed_ms"],
+            cut_out_speed_ms=power_curve_dict["cut_out_speed_ms"],
+            rated_power_kw=power_curve_dict["rated_power_kw"],
+        )
+
+
+def compute_air_density(temperature_c: np.ndarray, pressure_mbar: np.ndarray) -> np.ndarray:
+    # Ideal gas law for dry air, unknown or non physical measures falling back to the standard density
+    with np.errstate(divide="ignore", invalid="ignore"):
+        air_density = (np.asarray(pressure_mbar, dtype=float) * MBAR_TO_PA) / (
+            DRY_AIR_SPECIFIC_GAS_CONSTANT * (np.asarray(temperature_c, dtype=float) + CELSIUS_TO_KELVIN)
+        )
+    return np.where(np.isfinite(air_density) & (air_density > 0), air_density, STANDARD_AIR_DENSITY_KG_M3)
+
+
+def compute_wind_power_kw_from_air_density(
+    wind_speed_kmh: np.ndarray, air_density: np.ndarray, power_curve: TurbinePowerCurve
+) -> np.ndarray:
+    # Wind speeds are normalized to the standard air density (IEC 61400-12-1) before the power curve lookup
+    wind_speed_ms = np.asarray(wind_speed_kmh, dtype=float) * KMH_TO_MS
+    normalized_wind_speed_ms = wind_speed_ms * np.cbrt(air_density / STANDARD_AIR_DENSITY_KG_M3)
+
+    wind_power_kw = np.interp(normalized_wind_speed_ms, power_curve.wind_speeds_ms, power_curve.powers_kw)
+    wind_power_kw = np.where(
+        normalized_wind_speed_ms >= power_curve.rated_speed_ms, power_curve.rated_power_kw, wind_power_kw
+    )
+    wind_power_kw = np.where(
+        (normalized_wind_speed_ms < power_curve.cut_in_speed_ms)
+        | (normalized_wind_speed_ms >= power_curve.cut_out_speed_ms),
+        0.0,
+        wind_power_kw,
+    )
+    # Unknown wind speeds give an unknown power
+    return np.where(np.isnan(wind_speed_ms), np.nan, wind_power_kw)
+
+
+def compute_wind_power_kw(
+    wind_speed_kmh: np.ndarray,
+    temperature_c: np.ndarray,
+    pressure_mbar: np.ndarray,
+    power_curve: TurbinePowerCurve,
+) -> np.ndarray:
+    air_density = compute_air_density(temperature_c, pressure_mbar)
+    return compute_wind_power_kw_from_air_density(wind_speed_kmh, air_density, power_curve)
+
+
+def get_turbine_power_curve(turbine_model: str = wind_power_config.WIND_TURBINE_MODEL) -> TurbinePowerCurve:
+    return TurbinePowerCurve.from_dict(wind_power_config.TURBINE_POWER_CURVES[turbine_model])
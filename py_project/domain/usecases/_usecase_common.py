@@ -1,9 +1,29 @@
-from typing import List
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List
 
 import pandas as pd
 
-from py_project.config import database_config
+from py_project.config import database_config, functions_config
 from py_project.domain.adapters.database import Database
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.usecases._usecase_exceptions import InvalidIngestionMode
+
+
+def get_table_output_path(table_name: str) -> str:
+    return f"{database_config.DEFAULT_DATABASE}/{database_config.DEFAULT_SCHEMA}/{table_name}"
+
+
+def estimate_stage_memory_bytes(
+    file_handler: FileHandler, file_paths: List[str], file_type: str, **kwargs
+) -> List[int]:
+    return [
+        functions_config.MEMORY_STAGE_PEAK_FACTOR
+        * file_handler.estimate_file_memory_bytes(
+            file_path, file_type=file_type, sample_bytes=functions_config.MEMORY_ESTIMATE_SAMPLE_BYTES, **kwargs
+        )
+        for file_path in file_paths
+    ]
 
 
 def load_metrics_to_database(
@@ -20,12 +40,76 @@ def load_metrics_to_database(
             write_mode=write_mode,
         )
 
-        return [f"{database_config.DEFAULT_DATABASE}/{database_config.DEFAULT_SCHEMA}/{table_name}"]
+        return [get_table_output_path(table_name)]
 
     else:
         return []
 
 
+class _StageEnd:
+    pass
+
+
+class _StageError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def map_in_thread(fn: Callable[[Any], Any], items: Iterable[Any], max_queued_items: int) -> Iterator[Any]:
+    # Items are mapped ahead on a separate thread, blocking once max_queued_items results wait to be consumed
+    results: queue.Queue = queue.Queue(maxsize=max_queued_items)
+    is_stopped = threading.Event()
+
+    def put(result: Any) -> bool:
+        while not is_stopped.is_set():
+            try:
+                results.put(result, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run_stage():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put(fn(item)):
+                    return
+            put(_StageEnd())
+        except BaseException as error:
+            put(_StageError(error))
+        finally:
+            # Stop upstream stages as well, when they are generators
+            if hasattr(iterator, "close"):
+                iterator.close()
+
+    stage_thread = threading.Thread(target=run_stage, daemon=True)
+    stage_thread.start()
+    try:
+        while True:
+            result = results.get()
+            if isinstance(result, _StageEnd):
+                break
+            if isinstance(result, _StageError):
+                raise result.error
+            yield result
+    finally:
+        # Unblock the stage thread when the consumer stops early
+        is_stopped.set()
+        stage_thread.join()
+
+
+def get_database_write_mode(ingestion_mode: str) -> str:
+    # An incremental ingestion only loads new or changed files, so previously loaded metrics must be kept.
+    # Appended weather metrics are keyed by timestamp, so that rows of changed files replace the stored ones
+    if ingestion_mode == functions_config.FULL_INGESTION_MODE:
+        return database_config.WRITE_MODE_TRUNCATE_THEN_APPEND
+    elif ingestion_mode == functions_config.INCREMENTAL_INGESTION_MODE:
+        return database_config.WRITE_MODE_APPEND
+    else:
+        raise InvalidIngestionMode(f"Unknown ingestion mode {ingestion_mode}, use {functions_config.INGESTION_MODES}")
+
+
 def summarize_batch_to_load(input_df: pd.DataFrame, id_column: str, timestamp_column: str) -> pd.DataFrame:
     if not set([id_column, timestamp_column]).issubset(input_df.columns):
         bounds_df = pd.DataFrame(
@@ -1,8 +1,129 @@
-from typing import List
+import heapq
+import math
+from typing import List, Optional, Tuple
 
+from py_project.config import functions_config
+from py_project.domain.adapters.filesystem import FileDetails
+from py_project.domain.adapters.orchestrator_state_service import OrchestratorState
 from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.file_manifest import FileManifest
+from py_project.domain.usecases._usecase_exceptions import InvalidIngestionMode
 
 
 def get_file_paths_in_folder(file_handler: FileHandler, folder_path: str) -> List[str]:
     file_paths = file_handler.get_file_paths_in_folder(folder_path=folder_path, only_latest_file=False)
     return file_paths
+
+
+def get_checkpoint_file_details(
+    last_completed_state: Optional[OrchestratorState], orchestrator_function_name: str
+) -> Optional[List[FileDetails]]:
+    if last_completed_state is None:
+        return None
+    orchestrator_posts: dict = (last_completed_state.posts or {}).get(orchestrator_function_name, {})
+    checkpoint_file_details = orchestrator_posts.get(functions_config.POST_SOURCE_PROCESSED_FILE_DETAILS_KEY)
+    if checkpoint_file_details is not None:
+        return [FileDetails.from_dict(file_details_dict) for file_details_dict in checkpoint_file_details]
+    # Checkpoints written before file details were tracked only hold the processed paths
+    return [
+        FileDetails(path=file_path, size=None, last_modified=None)
+        for file_path in orchestrator_posts.get(functions_config.POST_SOURCE_PROCESSED_FILE_PATHS_KEY, [])
+    ]
+
+
+def is_file_changed(file_details: FileDetails, checkpoint_file_details: FileDetails) -> bool:
+    if checkpoint_file_details.size is None and checkpoint_file_details.last_modified is None:
+        return False
+    if file_details.content_hash is not None and checkpoint_file_details.content_hash is not None:
+        return file_details.content_hash != checkpoint_file_details.content_hash
+    if file_details.etag is not None and checkpoint_file_details.etag is not None:
+        return file_details.etag != checkpoint_file_details.etag
+    return (file_details.size, file_details.last_modified) != (
+        checkpoint_file_details.size,
+        checkpoint_file_details.last_modified,
+    )
+
+
+def filter_new_or_changed_files(
+    file_details: List[FileDetails], checkpoint_file_details: List[FileDetails]
+) -> List[FileDetails]:
+    checkpoint_file_details_by_path = {details.path: details for details in checkpoint_file_details}
+    # A renamed or re-uploaded file whose content was already ingested is skipped
+    checkpoint_content_hashes = {
+        details.content_hash for details in checkpoint_file_details if details.content_hash is not None
+    }
+    return [
+        details
+        for details in file_details
+        if details.content_hash not in checkpoint_content_hashes
+        and (
+            details.path not in checkpoint_file_details_by_path
+            or is_file_changed(details, checkpoint_file_details_by_path[details.path])
+        )
+    ]
+
+
+def get_file_details_to_ingest(
+    file_handler: FileHandler,
+    folder_path: str,
+    ingestion_mode: str,
+    checkpoint_file_details: Optional[List[FileDetails]] = None,
+    file_manifest: Optional[FileManifest] = None,
+) -> Tuple[List[FileDetails], List[FileDetails]]:
+    # Files to ingest, and every file of the folder to checkpoint once ingested
+    file_details = sorted(file_handler.get_file_details_in_folder(folder_path), key=lambda details: details.path)
+    if file_manifest is not None:
+        file_details = file_manifest.update(file_details)
+        file_manifest.save()
+    if ingestion_mode == functions_config.FULL_INGESTION_MODE:
+        return file_details, file_details
+    elif ingestion_mode == functions_config.INCREMENTAL_INGESTION_MODE:
+        if checkpoint_file_details is None:
+            return file_details, file_details
+        return filter_new_or_changed_files(file_details, checkpoint_file_details), file_details
+    else:
+        raise InvalidIngestionMode(f"Unknown ingestion mode {ingestion_mode}, use {functions_config.INGESTION_MODES}")
+
+
+def estimate_file_rows(file_details: FileDetails, bytes_per_row: int) -> int:
+    return math.ceil((file_details.size or 0) / bytes_per_row)
+
+
+def pack_file_batches(
+    file_details: List[FileDetails], max_batch_bytes: int, max_batch_rows: int, bytes_per_row: int
+) -> List[List[str]]:
+    if len(file_details) == 0:
+        return []
+
+    def get_file_load(details: FileDetails) -> float:
+        return max((details.size or 0) / max_batch_bytes, estimate_file_rows(details, bytes_per_row) / max_batch_rows)
+
+    def pack_in_batches(batch_count: int) -> List[List[FileDetails]]:
+        # Largest files first, each file going to the least loaded batch
+        batch_loads: List[Tuple[float, int]] = [(0.0, batch_index) for batch_index in range(batch_count)]
+        file_batches: List[List[FileDetails]] = [[] for _ in range(batch_count)]
+        for details in sorted(file_details, key=lambda details: (-get_file_load(details), details.path)):
+            batch_load, batch_index = heapq.heappop(batch_loads)
+            file_batches[batch_index].append(details)
+            heapq.heappush(batch_loads, (batch_load + get_file_load(details), batch_index))
+        return file_batches
+
+    def fits(file_batch: List[FileDetails]) -> bool:
+        # A file over budget on its own is left alone in its batch
+        return len(file_batch) == 1 or (
+            sum(details.size or 0 for details in file_batch) <= max_batch_bytes
+            and sum(estimate_file_rows(details, bytes_per_row) for details in file_batch) <= max_batch_rows
+        )
+
+    # Starting from the fewest batches both budgets allow, batches are added until every batch meets them
+    batch_count = max(
+        1,
+        math.ceil(sum(details.size or 0 for details in file_details) / max_batch_bytes),
+        math.ceil(sum(estimate_file_rows(details, bytes_per_row) for details in file_details) / max_batch_rows),
+    )
+    batch_count = min(batch_count, len(file_details))
+    file_batches = pack_in_batches(batch_count)
+    while not all(fits(file_batch) for file_batch in file_batches):
+        batch_count += 1
+        file_batches = pack_in_batches(batch_count)
+    return [sorted(details.path for details in file_batch) for file_batch in file_batches]
@@ -0,0 +1,53 @@
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from py_project.config import database_config
+from py_project.domain.adapters.database import Database
+from py_project.domain.entities import change_detection, weather_data_handler
+
+WEATHER_ROW_HASH_COLUMNS = [
+    column_name
+    for column_name in weather_data_handler.NORMALIZED_COLUMN_TYPES
+    if column_name != weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME
+] + weather_data_handler.WEATHER_COMPUTED_METRICS
+
+
+def add_weather_row_hashes(metrics_df: pd.DataFrame) -> pd.DataFrame:
+    if metrics_df.empty:
+        return metrics_df
+    return change_detection.add_row_hashes(metrics_df, hashed_columns=WEATHER_ROW_HASH_COLUMNS)
+
+
+def read_weather_metrics_rows(
+    database: Database,
+    timestamp_min: pd.Timestamp,
+    timestamp_max: pd.Timestamp,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    timestamp_column = weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME
+    metrics_df = database.read_dataframe(
+        database_config.DEFAULT_SCHEMA,
+        database_config.WEATHER_METRICS_TABLE_NAME,
+        columns=columns,
+        range_filter=(timestamp_column, timestamp_min, timestamp_max),
+    )
+    # Timestamps are read in the unit of normalized rows, so that their keys hash alike
+    metrics_df[timestamp_column] = pd.to_datetime(metrics_df[timestamp_column], utc=True).dt.as_unit("ns")
+    return metrics_df
+
+
+def split_new_and_changed_weather_rows(
+    database: Database, metrics_df: pd.DataFrame
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # Only the hashes stored within the time bounds of the metrics are read
+    if metrics_df.empty:
+        return metrics_df, metrics_df
+    timestamp_column = weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME
+    stored_row_hashes_df = read_weather_metrics_rows(
+        database,
+        timestamp_min=metrics_df[timestamp_column].min(),
+        timestamp_max=metrics_df[timestamp_column].max(),
+        columns=[timestamp_column, change_detection.ROW_HASH_COLUMN_NAME],
+    )
+    return change_detection.split_new_and_changed_rows(metrics_df, stored_row_hashes_df, key_columns=[timestamp_column])
@@ -1,56 +1,111 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
-from py_project.config import database_config
+from py_project.config import database_config, filesystem_config, functions_config
 from py_project.domain.adapters.database import Database
+from py_project.domain.entities.deduplication import RankedKeyDeduplicator
 from py_project.domain.entities import validate_output, weather_data_handler
 from py_project.domain.entities.file_handler import FileHandler
-from py_project.domain.usecases._usecase_common import load_metrics_to_database
+from py_project.domain.entities.stage_metrics import StageMetrics
+from py_project.domain.usecases._usecase_common import estimate_stage_memory_bytes, get_database_write_mode
+from py_project.domain.usecases.weather_normalize_metrics import get_weather_ranked_deduplicator
+from py_project.domain.usecases.weather_rollup_metrics import load_weather_metrics_to_database
+from py_project.memory_governor import MemoryGovernor
 
 
-def compute_weather_metrics(apps_file_handler: FileHandler, input_file_paths: List[str], database: Database):
-    normalized_metrics_df_to_load, _ = extract_and_transform_weather_normalized_metrics(
-        file_handler=apps_file_handler, file_paths=input_file_paths
-    )
-    outputs = load_metrics_to_database(
-        database=database,
-        metrics_df=normalized_metrics_df_to_load,
-        table_name=database_config.WEATHER_METRICS_TABLE_NAME,
-        write_mode=database_config.WRITE_MODE_TRUNCATE_THEN_APPEND,
+def compute_weather_metrics(
+    apps_file_handler: FileHandler,
+    input_file_paths: List[str],
+    database: Database,
+    ingestion_mode: str = functions_config.FULL_INGESTION_MODE,
+    memory_governor: Optional[MemoryGovernor] = None,
+    stage_metrics: Optional[StageMetrics] = None,
+):
+    # Normalized files are loaded in groups fitting the memory left, all at once when they fit
+    memory_governor = memory_governor if memory_governor is not None else MemoryGovernor()
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
+    estimated_bytes = estimate_stage_memory_bytes(
+        apps_file_handler, input_file_paths, filesystem_config.APPS_SILVER_NORMALIZED_FILE_TYPE
     )
+    write_mode = get_database_write_mode(ingestion_mode)
+    deduplicator = get_weather_ranked_deduplicator()
+    outputs: List[str] = []
+    for file_paths in memory_governor.iter_groups(input_file_paths, estimated_bytes):
+        normalized_metrics_df_to_load, _ = extract_and_transform_weather_normalized_metrics(
+            file_handler=apps_file_handler, file_paths=file_paths, stage_metrics=stage_metrics
+        )
+        group_outputs = load_weather_metrics_with_stage_metrics(
+            database,
+            normalized_metrics_df_to_load,
+            write_mode=write_mode,
+            stage_metrics=stage_metrics,
+            deduplicator=deduplicator,
+        )
+        # Only the first loaded group may truncate the table
+        if group_outputs:
+            write_mode = database_config.WRITE_MODE_APPEND
+        outputs += [output for output in group_outputs if output not in outputs]
 
-    del normalized_metrics_df_to_load
+        del normalized_metrics_df_to_load
 
     return input_file_paths, outputs
 
 
+def load_weather_metrics_with_stage_metrics(
+    database: Database,
+    metrics_df: pd.DataFrame,
+    write_mode: str,
+    stage_metrics: StageMetrics,
+    deduplicator: Optional[RankedKeyDeduplicator] = None,
+) -> List[str]:
+    with stage_metrics.measure(functions_config.PROCESSING_STAGE_LOAD):
+        outputs = load_weather_metrics_to_database(
+            database=database, metrics_df=metrics_df, write_mode=write_mode, deduplicator=deduplicator
+        )
+    stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_OUT, len(metrics_df))
+    return outputs
+
+
 def extract_and_transform_weather_normalized_metrics(
-    file_handler: FileHandler, file_paths: List[str]
+    file_handler: FileHandler, file_paths: List[str], stage_metrics: Optional[StageMetrics] = None
 ) -> Tuple[pd.DataFrame, List[str]]:
-    df_raw = file_handler.read_files(
-        file_paths=file_paths,
-        file_type="PARQUET",
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
+    with stage_metrics.measure(functions_config.PROCESSING_STAGE_READ):
+        df_raw = file_handler.read_files(
+            file_paths=file_paths,
+            file_type=filesystem_config.APPS_SILVER_NORMALIZED_FILE_TYPE,
+        )
+    stage_metrics.add(
+        functions_config.PROCESSING_METRIC_BYTES_READ,
+        sum(file_handler.get_file_size(file_path) for file_path in file_paths),
     )
-    metrics_df = validate_and_transform_weather_normalized_metrics(df_raw)
+    metrics_df = validate_and_transform_weather_normalized_metrics(df_raw, stage_metrics)
     return metrics_df, file_paths
 
 
 def add_computed_columns(metrics_df: pd.DataFrame) -> pd.DataFrame:
-    metrics_df[weather_data_handler.WEATHER_WIND_POWER] = 0.0
-    return metrics_df
+    return weather_data_handler.add_computed_metrics(metrics_df)
 
 
 def validate_and_transform_weather_normalized_metrics(
-    normalized_metrics_df: pd.DataFrame,
+    normalized_metrics_df: pd.DataFrame, stage_metrics: Optional[StageMetrics] = None
 ) -> pd.DataFrame:
-    transformed_df = normalized_metrics_df.copy()
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
+    # Computed columns are added to a shallow copy, memory-mapped input columns being neither copied nor modified
+    transformed_df = normalized_metrics_df.copy(deep=False)
     if not transformed_df.empty:
         data_validator_fn = validate_output(weather_data_handler.NormalizedWeatherMetricsSchema)(
             lambda input_df: input_df
         )
-        transformed_df = data_validator_fn(transformed_df)
-        transformed_df = weather_data_handler.transform_from_normalized_to_computed_metrics(
-            transformed_df, add_computed_metrics_fn=add_computed_columns
-        )
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_VALIDATE):
+            transformed_df = data_validator_fn(transformed_df)
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_TRANSFORM):
+            transformed_df = weather_data_handler.transform_from_normalized_to_computed_metrics(
+                transformed_df, add_computed_metrics_fn=add_computed_columns
+            )
+    stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_IN, len(normalized_metrics_df))
+    stage_metrics.add(
+        functions_config.PROCESSING_METRIC_REJECTED_ROWS, len(normalized_metrics_df) - len(transformed_df)
+    )
     return transformed_df
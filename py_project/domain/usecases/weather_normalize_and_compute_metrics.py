@@ -0,0 +1,96 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from py_project.config import database_config, filesystem_config, functions_config
+from py_project.domain.adapters.database import Database
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.stage_metrics import StageMetrics
+from py_project.domain.usecases._usecase_common import get_database_write_mode
+from py_project.domain.usecases.weather_compute_metrics import (
+    load_weather_metrics_with_stage_metrics,
+    validate_and_transform_weather_normalized_metrics,
+)
+from py_project.domain.usecases.weather_normalize_metrics import (
+    get_weather_ranked_deduplicator,
+    iter_normalized_file_groups,
+    write_normalized_file,
+)
+from py_project.logger import log_memory_percent_usage
+from py_project.profiler import profile_invocation
+from py_project.memory_governor import MemoryGovernor
+
+
+@log_memory_percent_usage
+@profile_invocation
+def normalize_and_compute_weather_metrics(
+    source_file_handler: FileHandler,
+    input_file_paths: List[str],
+    database: Database,
+    ingestion_mode: str = functions_config.FULL_INGESTION_MODE,
+    file_batches: Optional[List[List[str]]] = None,
+    deduplication_policy: str = functions_config.DEDUPLICATION_POLICY,
+    memory_governor: Optional[MemoryGovernor] = None,
+    normalize_stage_metrics: Optional[StageMetrics] = None,
+    compute_stage_metrics: Optional[StageMetrics] = None,
+) -> Tuple[Tuple[List[str], List[str]], Tuple[List[str], List[str]], int]:
+    # Batches are named as the fanned out normalize task would name them, so that lineage does not depend on the mode
+    batch_indexes: List[Optional[int]] = list(range(len(file_batches))) if file_batches else [None]
+    file_batches = file_batches if file_batches else [input_file_paths]
+    # Rows carry the rank of their file among the input files, so that loads resolve overlaps across batches
+    file_ranks = {file_path: file_rank for file_rank, file_path in enumerate(input_file_paths)}
+    deduplicator = get_weather_ranked_deduplicator(deduplication_policy)
+    write_mode = get_database_write_mode(ingestion_mode)
+    memory_governor = memory_governor if memory_governor is not None else MemoryGovernor()
+    # Metrics are split between the stages the chained tasks would have reported them for
+    normalize_stage_metrics = normalize_stage_metrics if normalize_stage_metrics is not None else StageMetrics()
+    compute_stage_metrics = compute_stage_metrics if compute_stage_metrics is not None else StageMetrics()
+
+    normalized_file_paths: List[str] = []
+    database_outputs: List[str] = []
+    duplicate_rows = 0
+    # Normalized files are written on the side, at most one write being pending to bound memory usage
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending_write: Optional[Future] = None
+        for batch_index, file_paths in zip(batch_indexes, file_batches):
+            for normalized_metrics_df, normalized_filename, part_duplicate_rows in iter_normalized_file_groups(
+                source_file_handler,
+                file_paths,
+                batch_index=batch_index,
+                file_ranks=[file_ranks[file_path] for file_path in file_paths],
+                deduplication_policy=deduplication_policy,
+                memory_governor=memory_governor,
+                stage_metrics=normalize_stage_metrics,
+            ):
+                duplicate_rows += part_duplicate_rows
+                if pending_write is not None:
+                    normalized_file_paths += pending_write.result()
+                pending_write = executor.submit(
+                    write_normalized_file,
+                    source_file_handler,
+                    normalized_metrics_df,
+                    filesystem_config.APPS_SILVER_NORMALIZED_FOLDER,
+                    normalized_filename,
+                    normalize_stage_metrics,
+                )
+
+                computed_metrics_df = validate_and_transform_weather_normalized_metrics(
+                    normalized_metrics_df, compute_stage_metrics
+                )
+                outputs = load_weather_metrics_with_stage_metrics(
+                    database,
+                    computed_metrics_df,
+                    write_mode=write_mode,
+                    stage_metrics=compute_stage_metrics,
+                    deduplicator=deduplicator,
+                )
+                # Only the first loaded batch may truncate the table
+                if outputs:
+                    write_mode = database_config.WRITE_MODE_APPEND
+                database_outputs += [output for output in outputs if output not in database_outputs]
+
+                del normalized_metrics_df, computed_metrics_df
+
+        if pending_write is not None:
+            normalized_file_paths += pending_write.result()
+
+    return (input_file_paths, normalized_file_paths), (normalized_file_paths, database_outputs), duplicate_rows
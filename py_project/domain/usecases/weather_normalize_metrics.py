@@ -1,48 +1,195 @@
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import pandas as pd
 
-from py_project.config import filesystem_config
+from py_project.config import filesystem_config, functions_config
 from py_project.domain.entities import weather_data_handler
+from py_project.domain.entities.deduplication import (
+    KeyDeduplicator,
+    RankedKeyDeduplicator,
+    add_source_file_rank,
+    order_files_for_deduplication,
+)
 from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.stage_metrics import StageMetrics
+from py_project.domain.usecases._usecase_common import estimate_stage_memory_bytes
 from py_project.logger import log_memory_percent_usage
+from py_project.profiler import profile_invocation
+from py_project.memory_governor import MemoryGovernor
 
 
-@log_memory_percent_usage
-def ingest_normalized_inclino_metrics_to_database(source_file_handler: FileHandler, input_file_paths: List[str]):
-    filtered_file_paths = input_file_paths
-    normalized_metrics_df_to_load, _ = extract_and_transform_raw_files(source_file_handler, filtered_file_paths)
+RAW_CSV_READ_OPTIONS = {
+    "sep": ",",
+    "encoding": "latin1",
+    "quotechar": '"',
+    "thousands": ",",
+}
+
+WEATHER_DEDUPLICATION_KEY_COLUMNS = [weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME]
+
+
+def get_normalized_filename(batch_index: Optional[int] = None, part_index: Optional[int] = None) -> str:
+    if batch_index is None and part_index is None:
+        return filesystem_config.APPS_SILVER_NORMALIZED_FILENAME
+    filename_stem, filename_extension = filesystem_config.APPS_SILVER_NORMALIZED_FILENAME.rsplit(".", 1)
+    if batch_index is not None:
+        filename_stem = f"{filename_stem}_{batch_index:05d}"
+    if part_index is not None:
+        filename_stem = f"{filename_stem}_part_{part_index:05d}"
+    return f"{filename_stem}.{filename_extension}"
+
+
+def get_weather_deduplicator() -> KeyDeduplicator:
+    return KeyDeduplicator(key_columns=WEATHER_DEDUPLICATION_KEY_COLUMNS)
+
+
+def get_weather_ranked_deduplicator(
+    deduplication_policy: str = functions_config.DEDUPLICATION_POLICY,
+) -> RankedKeyDeduplicator:
+    return RankedKeyDeduplicator(key_columns=WEATHER_DEDUPLICATION_KEY_COLUMNS, policy=deduplication_policy)
+
 
+@log_memory_percent_usage
+@profile_invocation
+def ingest_normalized_inclino_metrics_to_database(
+    source_file_handler: FileHandler,
+    input_file_paths: List[str],
+    batch_index: Optional[int] = None,
+    file_ranks: Optional[List[int]] = None,
+    deduplication_policy: str = functions_config.DEDUPLICATION_POLICY,
+    memory_governor: Optional[MemoryGovernor] = None,
+    stage_metrics: Optional[StageMetrics] = None,
+):
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
     dest_folder = filesystem_config.APPS_SILVER_NORMALIZED_FOLDER
-    dest_filename = filesystem_config.APPS_SILVER_NORMALIZED_FILENAME
-    output_file_paths = source_file_handler.write_file_in_folder(
-        input_df=normalized_metrics_df_to_load, dest_folder=dest_folder, filename=dest_filename
+    output_file_paths: List[str] = []
+    duplicate_rows = 0
+    for normalized_metrics_df_to_load, dest_filename, part_duplicate_rows in iter_normalized_file_groups(
+        source_file_handler,
+        input_file_paths,
+        batch_index=batch_index,
+        file_ranks=file_ranks,
+        deduplication_policy=deduplication_policy,
+        memory_governor=memory_governor,
+        stage_metrics=stage_metrics,
+    ):
+        output_file_paths += write_normalized_file(
+            source_file_handler, normalized_metrics_df_to_load, dest_folder, dest_filename, stage_metrics
+        )
+        duplicate_rows += part_duplicate_rows
+
+        del normalized_metrics_df_to_load
+
+    return input_file_paths, output_file_paths, duplicate_rows
+
+
+def write_normalized_file(
+    file_handler: FileHandler,
+    normalized_metrics_df: pd.DataFrame,
+    dest_folder: str,
+    filename: str,
+    stage_metrics: StageMetrics,
+) -> List[str]:
+    with stage_metrics.measure(functions_config.PROCESSING_STAGE_WRITE):
+        output_file_paths = file_handler.write_file_in_folder(
+            input_df=normalized_metrics_df,
+            dest_folder=dest_folder,
+            filename=filename,
+            file_type=filesystem_config.APPS_SILVER_NORMALIZED_FILE_TYPE,
+        )
+    stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_OUT, len(normalized_metrics_df))
+    stage_metrics.add(
+        functions_config.PROCESSING_METRIC_BYTES_WRITTEN,
+        sum(file_handler.get_file_size(output_file_path) for output_file_path in output_file_paths),
     )
+    return output_file_paths
+
 
-    del normalized_metrics_df_to_load
+def iter_normalized_file_groups(
+    file_handler: FileHandler,
+    file_paths: List[str],
+    batch_index: Optional[int] = None,
+    file_ranks: Optional[List[int]] = None,
+    deduplication_policy: str = functions_config.DEDUPLICATION_POLICY,
+    memory_governor: Optional[MemoryGovernor] = None,
+    stage_metrics: Optional[StageMetrics] = None,
+) -> Iterator[Tuple[pd.DataFrame, str, int]]:
+    # Files are normalized in groups fitting the memory left, a single file being written when they all fit at once.
+    # Groups share their deduplicator and follow its file order, so that the policy holds across groups.
+    # Rows carry the rank of their file among the files of the ingestion, so that loads resolve overlaps across batches
+    file_ranks = file_ranks if file_ranks is not None else list(range(len(file_paths)))
+    memory_governor = memory_governor if memory_governor is not None else MemoryGovernor()
+    deduplicator = get_weather_deduplicator()
+    ordered_file_indexes = order_files_for_deduplication(list(range(len(file_paths))), deduplication_policy)
+    estimated_bytes = estimate_stage_memory_bytes(
+        file_handler, [file_paths[file_index] for file_index in ordered_file_indexes], "CSV", **RAW_CSV_READ_OPTIONS
+    )
+    file_index_groups = memory_governor.iter_groups(ordered_file_indexes, estimated_bytes)
+    for part_index, file_indexes in enumerate(file_index_groups):
+        normalized_metrics_df, duplicate_rows = extract_and_transform_raw_files(
+            file_handler,
+            [file_paths[file_index] for file_index in sorted(file_indexes)],
+            file_ranks=[file_ranks[file_index] for file_index in sorted(file_indexes)],
+            deduplication_policy=deduplication_policy,
+            deduplicator=deduplicator,
+            stage_metrics=stage_metrics,
+        )
+        is_single_part = part_index == 0 and len(file_indexes) == len(file_paths)
+        normalized_filename = get_normalized_filename(batch_index, part_index=None if is_single_part else part_index)
+        yield normalized_metrics_df, normalized_filename, duplicate_rows
 
-    return input_file_paths, output_file_paths
+        del normalized_metrics_df
 
 
 @log_memory_percent_usage
-def extract_and_transform_raw_files(file_handler: FileHandler, file_paths: List[str]) -> Tuple[pd.DataFrame, List[str]]:
-    df_raw = file_handler.read_files(
-        file_paths=file_paths,
-        file_type="CSV",
-        sep=",",
-        encoding="latin1",
-        quotechar='"',
-        thousands=",",
-    )
+@profile_invocation
+def extract_and_transform_raw_files(
+    file_handler: FileHandler,
+    file_paths: List[str],
+    file_ranks: Optional[List[int]] = None,
+    deduplication_policy: str = functions_config.DEDUPLICATION_POLICY,
+    deduplicator: Optional[KeyDeduplicator] = None,
+    stage_metrics: Optional[StageMetrics] = None,
+) -> Tuple[pd.DataFrame, int]:
+    # Files are normalized one at a time, so that overlapping rows are dropped before being concatenated
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
+    deduplicator = deduplicator if deduplicator is not None else get_weather_deduplicator()
+    file_ranks = file_ranks if file_ranks is not None else list(range(len(file_paths)))
+    previous_duplicate_rows = deduplicator.duplicate_rows
+    file_indexes = order_files_for_deduplication(list(range(len(file_paths))), deduplication_policy)
+    metrics_dfs: List[pd.DataFrame] = [pd.DataFrame()] * len(file_paths)
+    for file_index in file_indexes:
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_READ):
+            df_raw = file_handler.read_file(file_path=file_paths[file_index], file_type="CSV", **RAW_CSV_READ_OPTIONS)
+        stage_metrics.add(
+            functions_config.PROCESSING_METRIC_BYTES_READ, file_handler.get_file_size(file_paths[file_index])
+        )
+        metrics_dfs[file_index] = add_source_file_rank(
+            deduplicator.drop_seen(validate_and_transform_raw_metrics(df_raw, stage_metrics)), file_ranks[file_index]
+        )
 
-    metrics_df = validate_and_transform_raw_metrics(df_raw)
-    return metrics_df, file_paths
+    # Rows are concatenated in file order whatever the order files were deduplicated in
+    non_empty_metrics_dfs = [metrics_df for metrics_df in metrics_dfs if not metrics_df.empty]
+    duplicate_rows = deduplicator.duplicate_rows - previous_duplicate_rows
+    if not non_empty_metrics_dfs:
+        return pd.DataFrame(), duplicate_rows
+    metrics_df = pd.concat(non_empty_metrics_dfs).reset_index(drop=True)
+    return metrics_df, duplicate_rows
 
 
 @log_memory_percent_usage
-def validate_and_transform_raw_metrics(df_raw: pd.DataFrame) -> pd.DataFrame:
+@profile_invocation
+def validate_and_transform_raw_metrics(
+    df_raw: pd.DataFrame, stage_metrics: Optional[StageMetrics] = None
+) -> pd.DataFrame:
+    # Rows are only dropped by validations, so that rejected rows are the ones missing once transformed
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
     transformed_df = df_raw.copy()
     if not transformed_df.empty:
-        transformed_df = weather_data_handler.transform_to_raw_metrics(transformed_df)
-        transformed_df = weather_data_handler.transform_from_raw_to_normalized_metrics(transformed_df)
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_VALIDATE):
+            transformed_df = weather_data_handler.transform_to_raw_metrics(transformed_df)
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_TRANSFORM):
+            transformed_df = weather_data_handler.transform_from_raw_to_normalized_metrics(transformed_df)
+    stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_IN, len(df_raw))
+    stage_metrics.add(functions_config.PROCESSING_METRIC_REJECTED_ROWS, len(df_raw) - len(transformed_df))
     return transformed_df
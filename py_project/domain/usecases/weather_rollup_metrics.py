@@ -0,0 +1,217 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from py_project.config import database_config
+from py_project.domain.adapters.database import Database, TableWrite
+from py_project.domain.entities import rollup, weather_data_handler
+from py_project.domain.entities.deduplication import SOURCE_FILE_RANK_COLUMN_NAME, RankedKeyDeduplicator
+from py_project.domain.usecases._usecase_common import get_table_output_path
+from py_project.domain.usecases.weather_change_detection import (
+    add_weather_row_hashes,
+    read_weather_metrics_rows,
+    split_new_and_changed_weather_rows,
+)
+from py_project.domain.usecases.weather_normalize_metrics import get_weather_ranked_deduplicator
+
+WEATHER_ROLLUP_METRIC_COLUMNS = [
+    weather_data_handler.WEATHER_TEMPERATURE_COLUMN_NAME,
+    weather_data_handler.WEATHER_HUMIDITY_COLUMN_NAME,
+    weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME,
+    weather_data_handler.WEATHER_VISIBILITY_COLUMN_NAME,
+    weather_data_handler.WEATHER_PRESSURE_COLUMN_NAME,
+    weather_data_handler.WEATHER_WIND_POWER,
+]
+
+
+def compute_weather_rollup_partials(metrics_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    return {
+        table_name: rollup.compute_rollup_partials(
+            metrics_df,
+            timestamp_column=weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME,
+            metric_columns=WEATHER_ROLLUP_METRIC_COLUMNS,
+            frequency=frequency,
+        )
+        for table_name, frequency in database_config.WEATHER_ROLLUP_TABLE_FREQUENCIES.items()
+    }
+
+
+def merge_weather_rollup_partials(rollup_partials_list: List[Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    return {
+        table_name: rollup.merge_rollup_partials(
+            [rollup_partials[table_name] for rollup_partials in rollup_partials_list],
+            metric_columns=WEATHER_ROLLUP_METRIC_COLUMNS,
+        )
+        for table_name in database_config.WEATHER_ROLLUP_TABLE_FREQUENCIES
+    }
+
+
+def read_rollup_rows(
+    database: Database, table_name: str, bucket_min: pd.Timestamp, bucket_max: pd.Timestamp
+) -> pd.DataFrame:
+    rollup_df = database.read_dataframe(
+        database_config.DEFAULT_SCHEMA,
+        table_name,
+        range_filter=(rollup.ROLLUP_BUCKET_COLUMN_NAME, bucket_min, bucket_max),
+    )
+    rollup_df[rollup.ROLLUP_BUCKET_COLUMN_NAME] = pd.to_datetime(rollup_df[rollup.ROLLUP_BUCKET_COLUMN_NAME], utc=True)
+    return rollup_df
+
+
+def get_weather_rollup_writes(
+    database: Database, rollup_partials: Dict[str, pd.DataFrame], write_mode: str
+) -> List[TableWrite]:
+    # Appended batches only read and rewrite the rollup rows within their time bounds, never the whole history
+    table_writes: List[TableWrite] = []
+    for table_name, rollup_df in rollup_partials.items():
+        if rollup_df.empty:
+            continue
+        rollup_write_mode = write_mode
+        if write_mode == database_config.WRITE_MODE_APPEND:
+            stored_rollup_df = read_rollup_rows(
+                database,
+                table_name,
+                bucket_min=rollup_df[rollup.ROLLUP_BUCKET_COLUMN_NAME].min(),
+                bucket_max=rollup_df[rollup.ROLLUP_BUCKET_COLUMN_NAME].max(),
+            )
+            rollup_df = rollup.merge_rollup_partials(
+                [stored_rollup_df, rollup_df], metric_columns=WEATHER_ROLLUP_METRIC_COLUMNS
+            )
+            rollup_write_mode = database_config.WRITE_MODE_UPSERT
+        table_writes.append(TableWrite(table_name=table_name, input_df=rollup_df, write_mode=rollup_write_mode))
+    return table_writes
+
+
+def filter_weather_rollup_partials(
+    rollup_partials: Dict[str, pd.DataFrame], bucket_min: pd.Timestamp, bucket_max: pd.Timestamp, is_within: bool
+) -> Dict[str, pd.DataFrame]:
+    return {
+        table_name: rollup_df[rollup_df[rollup.ROLLUP_BUCKET_COLUMN_NAME].between(bucket_min, bucket_max) == is_within]
+        for table_name, rollup_df in rollup_partials.items()
+    }
+
+
+def get_timestamp_bounds(metrics_df: pd.DataFrame) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    if metrics_df.empty:
+        return None
+    timestamps = metrics_df[weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME]
+    return timestamps.min(), timestamps.max()
+
+
+def merge_timestamp_bounds(
+    timestamp_bounds_list: List[Optional[Tuple[pd.Timestamp, pd.Timestamp]]]
+) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+    timestamp_bounds_list = [timestamp_bounds for timestamp_bounds in timestamp_bounds_list if timestamp_bounds]
+    if not timestamp_bounds_list:
+        return None
+    return min(bounds[0] for bounds in timestamp_bounds_list), max(bounds[1] for bounds in timestamp_bounds_list)
+
+
+def get_weather_rollup_writes_with_changes(
+    database: Database,
+    new_rollup_partials: Dict[str, pd.DataFrame],
+    loaded_rollup_partials: Dict[str, pd.DataFrame],
+    changed_timestamp_bounds: Optional[Tuple[pd.Timestamp, pd.Timestamp]],
+    is_loaded: Callable[[pd.DataFrame], np.ndarray],
+) -> List[TableWrite]:
+    # Rollups of changed rows cannot be merged, as min and max do not revert, so their whole days are recomputed
+    # from the stored rows the load does not replace and from every loaded row, unchanged ones included.
+    # Stored rows are read before the load commits, so that rollups are written along the metrics they come from
+    if changed_timestamp_bounds is None:
+        return get_weather_rollup_writes(database, new_rollup_partials, write_mode=database_config.WRITE_MODE_APPEND)
+    day_start = changed_timestamp_bounds[0].floor("D")
+    day_end = changed_timestamp_bounds[1].floor("D") + pd.Timedelta(days=1) - pd.Timedelta(1, unit="ns")
+    stored_metrics_df = read_weather_metrics_rows(
+        database,
+        timestamp_min=day_start,
+        timestamp_max=day_end,
+        columns=[weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME] + WEATHER_ROLLUP_METRIC_COLUMNS,
+    )
+    rebuilt_rollup_partials = merge_weather_rollup_partials(
+        [
+            compute_weather_rollup_partials(stored_metrics_df[~is_loaded(stored_metrics_df)]),
+            filter_weather_rollup_partials(loaded_rollup_partials, day_start, day_end, is_within=True),
+        ]
+    )
+    return get_weather_rollup_writes(
+        database,
+        filter_weather_rollup_partials(new_rollup_partials, day_start, day_end, is_within=False),
+        write_mode=database_config.WRITE_MODE_APPEND,
+    ) + get_weather_rollup_writes(database, rebuilt_rollup_partials, write_mode=database_config.WRITE_MODE_UPSERT)
+
+
+def write_weather_tables(database: Database, table_writes: Iterable[TableWrite]) -> Tuple[List[str], int]:
+    # Tables are written in a single transaction, outputs being the tables at least one row was written to
+    outputs: List[str] = []
+
+    def iter_table_writes() -> Iterator[TableWrite]:
+        for table_write in table_writes:
+            output = get_table_output_path(table_write.table_name)
+            if not table_write.input_df.empty and output not in outputs:
+                outputs.append(output)
+            yield table_write
+
+    written_rows = database.write_table_dataframes(iter_table_writes(), schema=database_config.DEFAULT_SCHEMA)
+    return outputs, written_rows
+
+
+def update_weather_rollup_tables(
+    database: Database, rollup_partials: Dict[str, pd.DataFrame], write_mode: str
+) -> List[str]:
+    outputs, _ = write_weather_tables(database, get_weather_rollup_writes(database, rollup_partials, write_mode))
+    return outputs
+
+
+def load_weather_metrics_to_database(
+    database: Database,
+    metrics_df: pd.DataFrame,
+    write_mode: str,
+    deduplicator: Optional[RankedKeyDeduplicator] = None,
+) -> List[str]:
+    if metrics_df.empty:
+        return []
+    # Timestamps being the table key, the row of the winning raw file wins, batches being loaded in any order.
+    # Loads of a same ingestion share their deduplicator, so that rows outranked by loaded ones are dropped
+    deduplicator = deduplicator if deduplicator is not None else get_weather_ranked_deduplicator()
+    metrics_df = add_weather_row_hashes(
+        deduplicator.drop_outranked(metrics_df).drop(columns=[SOURCE_FILE_RANK_COLUMN_NAME], errors="ignore")
+    )
+    if metrics_df.empty:
+        return []
+    metrics_table_name = database_config.WEATHER_METRICS_TABLE_NAME
+    if write_mode != database_config.WRITE_MODE_APPEND:
+        outputs, _ = write_weather_tables(
+            database,
+            [TableWrite(table_name=metrics_table_name, input_df=metrics_df, write_mode=write_mode)]
+            + get_weather_rollup_writes(database, compute_weather_rollup_partials(metrics_df), write_mode),
+        )
+        return outputs
+
+    # Appended metrics only load rows which are new or whose hash changed, unchanged rows being left as they are.
+    # Rollups are written in the same transaction, so that a retried load does not skip the rollups of its rows
+    timestamp_column = weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME
+    new_metrics_df, changed_metrics_df = split_new_and_changed_weather_rows(database, metrics_df)
+
+    def is_loaded(stored_metrics_df: pd.DataFrame) -> np.ndarray:
+        return stored_metrics_df[timestamp_column].isin(metrics_df[timestamp_column]).to_numpy()
+
+    outputs, _ = write_weather_tables(
+        database,
+        [
+            TableWrite(
+                table_name=metrics_table_name, input_df=new_metrics_df, write_mode=database_config.WRITE_MODE_APPEND
+            ),
+            TableWrite(
+                table_name=metrics_table_name, input_df=changed_metrics_df, write_mode=database_config.WRITE_MODE_UPSERT
+            ),
+        ]
+        + get_weather_rollup_writes_with_changes(
+            database,
+            new_rollup_partials=compute_weather_rollup_partials(new_metrics_df),
+            loaded_rollup_partials=compute_weather_rollup_partials(metrics_df),
+            changed_timestamp_bounds=get_timestamp_bounds(changed_metrics_df),
+            is_loaded=is_loaded,
+        ),
+    )
+    return outputs
@@ -0,0 +1,131 @@
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from py_project.config import database_config, functions_config
+from py_project.domain.adapters.database import Database, TableWrite
+from py_project.domain.entities.deduplication import order_files_for_deduplication
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.stage_metrics import StageMetrics
+from py_project.domain.usecases._usecase_common import get_database_write_mode, map_in_thread
+from py_project.domain.usecases.weather_change_detection import (
+    add_weather_row_hashes,
+    split_new_and_changed_weather_rows,
+)
+from py_project.domain.usecases.weather_compute_metrics import validate_and_transform_weather_normalized_metrics
+from py_project.domain.usecases.weather_normalize_metrics import (
+    RAW_CSV_READ_OPTIONS,
+    get_weather_deduplicator,
+    validate_and_transform_raw_metrics,
+)
+from py_project.domain.usecases.weather_rollup_metrics import (
+    compute_weather_rollup_partials,
+    get_timestamp_bounds,
+    merge_timestamp_bounds,
+    get_weather_rollup_writes,
+    get_weather_rollup_writes_with_changes,
+    merge_weather_rollup_partials,
+    write_weather_tables,
+)
+from py_project.logger import log_memory_percent_usage
+from py_project.profiler import profile_invocation
+
+
+@log_memory_percent_usage
+@profile_invocation
+def stream_weather_metrics_to_database(
+    source_file_handler: FileHandler,
+    input_file_paths: List[str],
+    database: Database,
+    ingestion_mode: str = functions_config.FULL_INGESTION_MODE,
+    chunk_rows: int = functions_config.STREAMING_CHUNK_ROWS,
+    max_queued_chunks: int = functions_config.STREAMING_MAX_QUEUED_CHUNKS,
+    deduplication_policy: str = functions_config.DEDUPLICATION_POLICY,
+    stage_metrics: Optional[StageMetrics] = None,
+) -> Tuple[List[str], List[str], int]:
+    # Every stage runs on its own thread, at most max_queued_chunks chunks waiting between two stages and one more
+    # being mapped by each stage, so that memory usage depends on the chunk size rather than on the input size.
+    # Changed rows are written along the chunk they were found in, which keeps the bound when rows changed
+    stage_metrics = stage_metrics if stage_metrics is not None else StageMetrics()
+    ordered_file_paths = order_files_for_deduplication(input_file_paths, deduplication_policy)
+    stage_metrics.add(
+        functions_config.PROCESSING_METRIC_BYTES_READ,
+        sum(source_file_handler.get_file_size(file_path) for file_path in ordered_file_paths),
+    )
+    raw_chunks = map_in_thread(
+        lambda raw_chunk: raw_chunk,
+        source_file_handler.iter_csv_chunks(ordered_file_paths, chunk_rows=chunk_rows, **RAW_CSV_READ_OPTIONS),
+        max_queued_items=max_queued_chunks,
+    )
+    # Only the normalize stage thread touches the deduplicator, which is read once every stage is done
+    deduplicator = get_weather_deduplicator()
+    deduplicated_chunks = map_in_thread(
+        lambda raw_chunk: deduplicator.drop_seen(validate_and_transform_raw_metrics(raw_chunk, stage_metrics)),
+        raw_chunks,
+        max_queued_items=max_queued_chunks,
+    )
+    # Chunks whose rows were all seen before are not passed on
+    normalized_chunks = (normalized_chunk for normalized_chunk in deduplicated_chunks if not normalized_chunk.empty)
+    write_mode = get_database_write_mode(ingestion_mode)
+    # Rollup partials of the streamed chunks are merged as they go, being small compared to the chunks.
+    # Partials of new rows are merged into stored rollups, partials of every streamed row rebuilding days of changes
+    new_rollup_partials = merge_weather_rollup_partials([])
+    streamed_rollup_partials = merge_weather_rollup_partials([])
+    # Changed rows cannot be copied over stored ones, so they are upserted chunk by chunk in the same transaction,
+    # only the time bounds of the changes being kept to rebuild their rollups
+    changed_timestamp_bounds: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None
+    loaded_rows = 0
+
+    def compute_chunk(normalized_chunk: pd.DataFrame) -> List[TableWrite]:
+        nonlocal new_rollup_partials, streamed_rollup_partials, changed_timestamp_bounds
+        computed_chunk = add_weather_row_hashes(
+            validate_and_transform_weather_normalized_metrics(normalized_chunk, stage_metrics)
+        )
+        streamed_rollup_partials = merge_weather_rollup_partials(
+            [streamed_rollup_partials, compute_weather_rollup_partials(computed_chunk)]
+        )
+        changed_chunk = computed_chunk.head(0)
+        if write_mode == database_config.WRITE_MODE_APPEND:
+            # Stored hashes are read through a connection of their own while the load transaction is open.
+            # They are the rows committed before the stream, the only ones to compare with as streamed rows were
+            # deduplicated already, and reading them does not wait for the rows being copied
+            computed_chunk, changed_chunk = split_new_and_changed_weather_rows(database, computed_chunk)
+            changed_timestamp_bounds = merge_timestamp_bounds(
+                [changed_timestamp_bounds, get_timestamp_bounds(changed_chunk)]
+            )
+        new_rollup_partials = merge_weather_rollup_partials(
+            [new_rollup_partials, compute_weather_rollup_partials(computed_chunk)]
+        )
+        metrics_table_name = database_config.WEATHER_METRICS_TABLE_NAME
+        return [
+            TableWrite(table_name=metrics_table_name, input_df=computed_chunk, write_mode=write_mode),
+            TableWrite(
+                table_name=metrics_table_name, input_df=changed_chunk, write_mode=database_config.WRITE_MODE_UPSERT
+            ),
+        ]
+
+    chunk_table_writes = map_in_thread(compute_chunk, normalized_chunks, max_queued_items=max_queued_chunks)
+
+    def iter_table_writes() -> Iterator[TableWrite]:
+        # Rollups are written in the transaction of the metrics, once every chunk was written
+        nonlocal loaded_rows
+        for table_writes in chunk_table_writes:
+            for table_write in table_writes:
+                loaded_rows += len(table_write.input_df)
+                yield table_write
+        if write_mode != database_config.WRITE_MODE_APPEND:
+            yield from get_weather_rollup_writes(database, new_rollup_partials, write_mode)
+            return
+        yield from get_weather_rollup_writes_with_changes(
+            database,
+            new_rollup_partials=new_rollup_partials,
+            loaded_rollup_partials=streamed_rollup_partials,
+            changed_timestamp_bounds=changed_timestamp_bounds,
+            is_loaded=deduplicator.is_seen,
+        )
+
+    # Stages overlap, so that the load duration is the one of the whole stream
+    with stage_metrics.measure(functions_config.PROCESSING_STAGE_LOAD):
+        outputs, _ = write_weather_tables(database, iter_table_writes())
+    stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_OUT, loaded_rows)
+    return input_file_paths, outputs, deduplicator.duplicate_rows
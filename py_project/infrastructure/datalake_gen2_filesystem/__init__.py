@@ -1,5 +1,8 @@
-from ._classes import DataLakeGen2FileSystem
+from ._cache import LocalDiskReadCache
+from ._classes import AsyncDataLakeGen2FileSystem, DataLakeGen2FileSystem
 
 __all__ = [
+    "AsyncDataLakeGen2FileSystem",
     "DataLakeGen2FileSystem",
+    "LocalDiskReadCache",
 ]
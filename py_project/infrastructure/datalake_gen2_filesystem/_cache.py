@@ -0,0 +1,86 @@
+import collections
+import hashlib
+import os
+import threading
+import uuid
+from typing import Callable, Dict, Optional
+
+from ._const import READ_CACHE_DEFAULT_MAX_BYTES, READ_CACHE_TMP_EXTENSION
+
+
+class LocalDiskReadCache:
+    """Bounded local disk cache of remote files, keyed by path and etag, evicting least recently used files"""
+
+    def __init__(self, cache_folder: str, max_bytes: int = READ_CACHE_DEFAULT_MAX_BYTES):
+        os.makedirs(cache_folder, exist_ok=True)
+        self.cache_folder = cache_folder
+        self.max_bytes = max_bytes
+        # Cache keys with their size in bytes, from least to most recently used
+        self.entries: Dict[str, int] = collections.OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.load_entries()
+
+    def load_entries(self):
+        # Files cached by previous instances are reused, the least recently accessed being evicted first
+        cached_files = [
+            entry
+            for entry in os.scandir(self.cache_folder)
+            if entry.is_file() and not entry.name.endswith(READ_CACHE_TMP_EXTENSION)
+        ]
+        for entry in sorted(cached_files, key=lambda entry: entry.stat().st_atime):
+            self.entries[entry.name] = entry.stat().st_size
+            self.size_bytes += entry.stat().st_size
+
+    @staticmethod
+    def get_cache_key(file_path: str, etag: Optional[str]) -> str:
+        return hashlib.sha256(f"{file_path}:{etag}".encode("utf-8")).hexdigest()
+
+    def get_cache_file_path(self, cache_key: str) -> str:
+        return os.path.join(self.cache_folder, cache_key)
+
+    def get_stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRatio": self.hits / requests if requests > 0 else None,
+            "entries": len(self.entries),
+            "sizeBytes": self.size_bytes,
+        }
+
+    def open(self, file_path: str, mode: str, etag: Optional[str], download_fn: Callable[[str, str], None]):
+        cache_key = self.get_cache_key(file_path, etag)
+        cache_file_path = self.get_cache_file_path(cache_key)
+        with self.lock:
+            if cache_key in self.entries:
+                self.entries.move_to_end(cache_key)
+                self.hits += 1
+                return open(cache_file_path, mode)
+            self.misses += 1
+
+        # Download to a temporary file first, so that concurrent readers never see a partial file
+        tmp_cache_file_path = f"{cache_file_path}.{uuid.uuid4().hex}{READ_CACHE_TMP_EXTENSION}"
+        download_fn(file_path, tmp_cache_file_path)
+        os.replace(tmp_cache_file_path, cache_file_path)
+        cached_file = open(cache_file_path, mode)
+
+        with self.lock:
+            if cache_key not in self.entries:
+                self.entries[cache_key] = os.path.getsize(cache_file_path)
+                self.size_bytes += self.entries[cache_key]
+            self.entries.move_to_end(cache_key)
+            self.evict()
+        return cached_file
+
+    def evict(self):
+        # The most recently used file is kept, even if it exceeds the cache size on its own
+        while self.size_bytes > self.max_bytes and len(self.entries) > 1:
+            cache_key, size_bytes = self.entries.popitem(last=False)
+            os.remove(self.get_cache_file_path(cache_key))
+            self.size_bytes -= size_bytes
+            self.evictions += 1
@@ -1,16 +1,32 @@
 # coding: utf-8
 
+import base64
+import collections
 import logging
 import pathlib
-from typing import List, Optional
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set
 
 import adlfs
 import fsspec
 import pandas as pd
+from azure.identity import ClientSecretCredential
+from azure.storage.blob import BlobPrefix, BlobServiceClient
 
-from py_project.domain.adapters.filesystem import FileSystem
+from py_project.domain.adapters.async_filesystem import AsyncFileSystem
+from py_project.domain.adapters.filesystem import FileDetails, FileSystem
 
-from ._const import BLOB_STORAGE_PROTOCOL_IMPLEMENTATION_NAME
+from ._cache import LocalDiskReadCache
+from ._const import (
+    BLOB_STORAGE_FOLDER_METADATA_KEY,
+    BLOB_STORAGE_LIST_RESULTS_PER_PAGE,
+    BLOB_STORAGE_PROTOCOL_IMPLEMENTATION_NAME,
+    MULTIPART_UPLOAD_MAX_CONCURRENCY,
+    MULTIPART_UPLOAD_SPOOL_MAX_SIZE,
+    READ_CACHE_MODES,
+)
 
 
 class DataLakeGen2FileSystem(FileSystem):
@@ -21,6 +37,11 @@ class DataLakeGen2FileSystem(FileSystem):
         tenant_id: str,
         adls_account_name: str,
         is_adls_connection_anonymous: bool = False,
+        skip_existence_checks: bool = False,
+        read_cache: Optional[LocalDiskReadCache] = None,
+        multipart_upload_block_size: Optional[int] = None,
+        multipart_upload_max_concurrency: int = MULTIPART_UPLOAD_MAX_CONCURRENCY,
+        account_host: Optional[str] = None,
     ):
         self.file_system_client: adlfs.spec.AzureBlobFileSystem = fsspec.filesystem(
             protocol=BLOB_STORAGE_PROTOCOL_IMPLEMENTATION_NAME,
@@ -29,58 +50,256 @@ class DataLakeGen2FileSystem(FileSystem):
             client_id=client_id,
             client_secret=client_secret,
             anon=is_adls_connection_anonymous,
+            # adlfs instances are cached per process, the one connected to another endpoint must not be shared
+            skip_instance_cache=account_host is not None,
         )
+        # The account host is only given for endpoints other than the public cloud, e.g. sovereign clouds or Azurite,
+        # adlfs reads it when connecting but does not take it as an argument
+        if account_host is not None:
+            self.file_system_client.account_host = account_host
+            self.file_system_client.do_connect()
+        # Blob listings are paged with the storage SDK, adlfs listings are fully loaded in memory,
+        # both clients share the endpoint resolved by adlfs
+        self.blob_service_client = BlobServiceClient(
+            account_url=self.file_system_client.account_url,
+            credential=(
+                None
+                if is_adls_connection_anonymous
+                else ClientSecretCredential(tenant_id=tenant_id, client_id=client_id, client_secret=client_secret)
+            ),
+        )
+        # Without existence checks, missing paths are reported by open errors,
+        # and folders known to exist are cached for the lifetime of the file system
+        self.skip_existence_checks = skip_existence_checks
+        self.known_folders: Set[str] = set()
+        self.round_trip_counts: Dict[str, int] = collections.Counter()
+        # Counts and known folders are updated from the threads writing files and uploading blocks
+        self._state_lock = threading.Lock()
+        self.read_cache = read_cache
+        # Parquet files are uploaded as blocks staged concurrently when a block size is given
+        self.multipart_upload_block_size = multipart_upload_block_size
+        self.multipart_upload_max_concurrency = multipart_upload_max_concurrency
+
+    def count_round_trip(self, operation: str, count: int = 1):
+        with self._state_lock:
+            self.round_trip_counts[operation] += count
+
+    def get_round_trip_count(self) -> int:
+        with self._state_lock:
+            return sum(self.round_trip_counts.values())
+
+    def log_round_trip_counts(self):
+        with self._state_lock:
+            round_trip_counts = dict(self.round_trip_counts)
+        logging.info(f"ADLS round trips: {sum(round_trip_counts.values())} ({round_trip_counts})")
+
+    def add_known_folder(self, folder_path: str):
+        with self._state_lock:
+            self.known_folders.add(self.normalize_folder_path(folder_path))
+
+    def is_known_folder(self, folder_path: str) -> bool:
+        with self._state_lock:
+            return self.normalize_folder_path(folder_path) in self.known_folders
+
+    @staticmethod
+    def normalize_folder_path(folder_path: str) -> str:
+        return folder_path.strip("/")
 
     def exists(self, path: str) -> bool:
+        self.count_round_trip("exists")
         return self.file_system_client.exists(path)
 
     def ls(self, folder: str):
         if folder.startswith("/"):
             folder: str = folder[1:]
+        self.count_round_trip("ls")
         file_paths: List[str] = self.file_system_client.ls(folder, invalidate_cache=True)
         filenames: List[str] = [item[len(folder) :] for item in file_paths]
         corrected_filenames: List[str] = [item[1:] if item.startswith("/") else item for item in filenames]
         return corrected_filenames
 
+    def iter_file_details(self, folder: str, recursive: bool = False, prefix: str = "") -> Iterator[FileDetails]:
+        container_name, _, blob_folder = folder.strip("/").partition("/")
+        blob_folder = f"{blob_folder}/" if blob_folder else ""
+        container_client = self.blob_service_client.get_container_client(container_name)
+        list_kwargs = {
+            "name_starts_with": f"{blob_folder}{prefix}",
+            "include": ["metadata"],
+            "results_per_page": BLOB_STORAGE_LIST_RESULTS_PER_PAGE,
+        }
+        blobs = container_client.list_blobs(**list_kwargs) if recursive else container_client.walk_blobs(**list_kwargs)
+        for blobs_page in blobs.by_page():
+            self.count_round_trip("list_page")
+            for blob in blobs_page:
+                is_folder = isinstance(blob, BlobPrefix) or (blob.metadata or {}).get(BLOB_STORAGE_FOLDER_METADATA_KEY)
+                if is_folder:
+                    continue
+                yield FileDetails(
+                    path=f"{folder.rstrip('/')}/{blob.name[len(blob_folder) :]}",
+                    size=blob.size,
+                    last_modified=blob.last_modified.timestamp() if blob.last_modified else None,
+                    etag=blob.etag,
+                )
+
     def mkdir(self, folder_name: str):
+        if self.skip_existence_checks and self.is_known_folder(folder_name):
+            return True
         empty_file_path = pathlib.Path(folder_name, "keep").as_posix()
+        self.count_round_trip("touch")
         self.file_system_client.touch(empty_file_path)
+        self.count_round_trip("rm")
         self.file_system_client.rm(empty_file_path)
-        return self.file_system_client.isdir(folder_name)
+        if self.skip_existence_checks:
+            # The touched file could only be written if the folder exists
+            self.add_known_folder(folder_name)
+            return True
+        return self.isdir(folder_name)
+
+    def mv(self, source_path: str, dest_path: str):
+        self.count_round_trip("mv")
+        return self.file_system_client.mv(source_path, dest_path)
 
     def isdir(self, folder_path: str):
-        return self.file_system_client.isdir(folder_path)
+        if self.skip_existence_checks and self.is_known_folder(folder_path):
+            return True
+        self.count_round_trip("isdir")
+        is_folder = self.file_system_client.isdir(folder_path)
+        if is_folder:
+            self.add_known_folder(folder_path)
+        return is_folder
 
     def open(self, file_path: str, mode: str):
+        if self.read_cache is not None and mode in READ_CACHE_MODES:
+            # The etag is checked on every read, so that a rewritten file is never served from cache
+            self.count_round_trip("info")
+            etag = self.file_system_client.info(file_path).get("etag")
+            return self.read_cache.open(file_path, mode, etag=etag, download_fn=self.download)
+        self.count_round_trip("open")
         return self.file_system_client.open(file_path, mode)
 
+    def download(self, file_path: str, local_file_path: str):
+        self.count_round_trip("get_file")
+        self.file_system_client.get_file(file_path, local_file_path)
+
     def read_csv(self, file_path: str, skiprows: int = 0, **kwargs) -> Optional[pd.DataFrame]:
-        does_path_exist = self.exists(file_path)
-        if not does_path_exist:
+        if not self.skip_existence_checks and not self.exists(file_path):
             logging.error(f"File: {file_path} not found!")
             return
 
-        with self.file_system_client.open(file_path, "rb") as f:
-            logging.info(f"Reading file: {file_path}!")
-            return pd.read_csv(f, skiprows=skiprows, **kwargs)
+        try:
+            with self.open(file_path, "rb") as f:
+                logging.info(f"Reading file: {file_path}!")
+                return pd.read_csv(f, skiprows=skiprows, **kwargs)
+        except FileNotFoundError:
+            logging.error(f"File: {file_path} not found!")
+            return
 
     def write_parquet(self, input_df: pd.DataFrame, file_path: str, **kwargs):
         parent_folder = pathlib.Path(file_path).parent.as_posix()
-        does_parent_folder_exist = self.exists(parent_folder)
-        if not does_parent_folder_exist:
+        if not self.skip_existence_checks and not self.exists(parent_folder):
             logging.warning(f"File: {file_path} not found!")
             return
 
-        with self.file_system_client.open(file_path, "wb") as f:
+        try:
+            if self.multipart_upload_block_size is not None:
+                return_value = self.write_parquet_multipart(input_df=input_df, file_path=file_path, **kwargs)
+            else:
+                with self.open(file_path, "wb") as f:
+                    logging.info(f"Writing file: {file_path}!")
+                    return_value = input_df.to_parquet(f, **kwargs)
+        except FileNotFoundError:
+            logging.warning(f"File: {file_path} not found!")
+            return
+        self.add_known_folder(parent_folder)
+        return return_value
+
+    def write_parquet_multipart(self, input_df: pd.DataFrame, file_path: str, **kwargs):
+        # Serialized in memory, spilling to disk for large dataframes, as parquet needs a seekable output
+        with tempfile.SpooledTemporaryFile(max_size=MULTIPART_UPLOAD_SPOOL_MAX_SIZE) as buffer:
+            input_df.to_parquet(buffer, **kwargs)
+            buffer.seek(0)
             logging.info(f"Writing file: {file_path}!")
-            return input_df.to_parquet(f, **kwargs)
+            self.upload_blocks(buffer, file_path)
+        self.file_system_client.invalidate_cache(pathlib.Path(file_path).parent.as_posix())
+
+    @staticmethod
+    def get_block_id(block_index: int) -> str:
+        # Block ids of a blob must all have the same length
+        return base64.b64encode(f"{block_index:032d}".encode("utf-8")).decode("utf-8")
+
+    def upload_blocks(self, buffer: BinaryIO, file_path: str) -> int:
+        container_name, _, blob_name = file_path.strip("/").partition("/")
+        blob_client = self.blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        block_ids: List[str] = []
+        # Bounds the blocks read from the buffer but not uploaded yet
+        pending_blocks = threading.BoundedSemaphore(self.multipart_upload_max_concurrency * 2)
+        with ThreadPoolExecutor(max_workers=self.multipart_upload_max_concurrency) as executor:
+            futures = []
+            for block_index, block in enumerate(iter(lambda: buffer.read(self.multipart_upload_block_size), b"")):
+                pending_blocks.acquire()
+                block_ids.append(self.get_block_id(block_index))
+                future = executor.submit(blob_client.stage_block, block_id=block_ids[-1], data=block)
+                future.add_done_callback(lambda _: pending_blocks.release())
+                futures.append(future)
+            for future in futures:
+                future.result()
+        self.count_round_trip("stage_block", len(block_ids))
+        self.count_round_trip("commit_block_list")
+        blob_client.commit_block_list(block_ids)
+        return len(block_ids)
 
     def read_parquet(self, file_path: str, **kwargs):
-        does_path_exist = self.exists(file_path)
-        if not does_path_exist:
+        if not self.skip_existence_checks and not self.exists(file_path):
             logging.error(f"File: {file_path} not found!")
             return
 
-        with self.file_system_client.open(file_path, "rb") as f:
-            logging.info(f"Reading file: {file_path}!")
-            return pd.read_parquet(f, **kwargs)
+        try:
+            with self.open(file_path, "rb") as f:
+                logging.info(f"Reading file: {file_path}!")
+                return pd.read_parquet(f, **kwargs)
+        except FileNotFoundError:
+            logging.error(f"File: {file_path} not found!")
+            return
+
+
+class AsyncDataLakeGen2FileSystem(AsyncFileSystem):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        tenant_id: str,
+        adls_account_name: str,
+        is_adls_connection_anonymous: bool = False,
+    ):
+        # adlfs is asynchronous underneath, its coroutines are awaited directly instead of through its sync wrappers
+        self.file_system_client: adlfs.spec.AzureBlobFileSystem = fsspec.filesystem(
+            protocol=BLOB_STORAGE_PROTOCOL_IMPLEMENTATION_NAME,
+            account_name=adls_account_name,
+            tenant_id=tenant_id,
+            client_id=client_id,
+            client_secret=client_secret,
+            anon=is_adls_connection_anonymous,
+            asynchronous=True,
+            skip_instance_cache=True,
+        )
+
+    async def ls(self, folder: str) -> List[str]:
+        if folder.startswith("/"):
+            folder: str = folder[1:]
+        file_paths: List[str] = await self.file_system_client._ls(folder, invalidate_cache=True)
+        filenames: List[str] = [item[len(folder) :] for item in file_paths]
+        return [item[1:] if item.startswith("/") else item for item in filenames]
+
+    async def exists(self, file_path: str) -> bool:
+        return await self.file_system_client._exists(file_path)
+
+    async def read_bytes(self, file_path: str) -> bytes:
+        logging.info(f"Reading file: {file_path}!")
+        return await self.file_system_client._cat_file(file_path)
+
+    async def write_bytes(self, file_path: str, data: bytes):
+        logging.info(f"Writing file: {file_path}!")
+        return await self.file_system_client._pipe_file(file_path, data)
+
+    async def close(self):
+        await self.file_system_client.service_client.close()
@@ -1 +1,8 @@
 BLOB_STORAGE_PROTOCOL_IMPLEMENTATION_NAME = "abfs"
+BLOB_STORAGE_LIST_RESULTS_PER_PAGE = 5000
+BLOB_STORAGE_FOLDER_METADATA_KEY = "hdi_isfolder"
+READ_CACHE_DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+READ_CACHE_MODES = ["r", "rb"]
+READ_CACHE_TMP_EXTENSION = ".tmp"
+MULTIPART_UPLOAD_MAX_CONCURRENCY = 8
+MULTIPART_UPLOAD_SPOOL_MAX_SIZE = 64 * 1024 * 1024
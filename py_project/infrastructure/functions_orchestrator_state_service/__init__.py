@@ -1,5 +1,6 @@
 from ._classes import (
     FunctionsOrchestratorBuilder,
+    FunctionsOrchestratorJsonLinesStateService,
     FunctionsOrchestratorStateService,
     FunctionsOrchestratorTaskManager,
     ProcessingItem,
@@ -7,6 +8,7 @@ from ._classes import (
 
 __all__ = [
     "FunctionsOrchestratorBuilder",
+    "FunctionsOrchestratorJsonLinesStateService",
     "FunctionsOrchestratorStateService",
     "FunctionsOrchestratorTaskManager",
     "ProcessingItem",
@@ -1,8 +1,13 @@
+import contextlib
 import datetime
+import fcntl
 import functools
+import gzip
 import json
+import threading
 import typing
-from typing import Any, Callable, Generator, List, Optional, Union
+import uuid
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Union
 
 import azure.durable_functions as durable_func
 
@@ -17,13 +22,125 @@ from py_project.logger import logger
 
 from ._const import (
     PAYLOAD_BASE_NAME_KEY,
+    PAYLOAD_BATCH_INDEX_KEY,
     PAYLOAD_INGESTION_MODE_KEY,
+    PAYLOAD_INPUT_FILE_BATCHES_KEY,
     PAYLOAD_INPUT_FILE_PATHS_KEY,
+    PAYLOAD_INPUT_FILE_RANKS_KEY,
+    POST_CRITICAL_PATH_KEY,
+    POST_INPUT_FILE_BATCHES_KEY,
     POST_INPUT_FILE_PATHS_KEY,
     POST_SOURCE_PROCESSED_FILE_PATHS_KEY,
+    POST_TASK_WAIT_TIMES_KEY,
+    STATE_CATALOG_FILENAME,
+    STATE_FILE_COMPRESSED_EXTENSION,
+    STATE_FILE_JSON_LINES_EXTENSION,
+    STATE_FLUSH_POLICIES,
+    STATE_FLUSH_POLICY_EVERY_N_TRANSITIONS,
+    STATE_FLUSH_POLICY_IMMEDIATE,
+    STATE_FLUSH_POLICY_PER_TASK,
+    STATE_INDEX_CATALOG_KEY,
+    STATE_INDEX_FILENAME,
+    STATE_INDEX_LAST_STATE_KEY,
+    STATE_INDEX_LAST_STATUS_BY_JOB_KEY,
+    STATE_INDEX_MAX_JOBS,
+    STATE_LOCK_FILENAME,
+    STATE_METADATA_FILENAME_PREFIX,
     TASK_STATUS_COMPLETED,
+    TASK_STATUS_FAILED,
     TASK_STATUS_RUNNING,
 )
+from ._exceptions import InvalidStateFlushPolicyError, InvalidTaskGraphError
+
+
+def split_in_batches(items: List[Any], batch_size: int) -> List[List[Any]]:
+    if batch_size <= 0:
+        raise ValueError(f"Batch size must be strictly positive, got {batch_size}")
+    if len(items) == 0:
+        return [[]]
+    return [items[index : index + batch_size] for index in range(0, len(items), batch_size)]
+
+
+def check_state_flush_policy(
+    state_flush_policy: str, state_flush_every_n: int, batch_task_logger_name: Optional[str]
+) -> None:
+    if state_flush_policy not in STATE_FLUSH_POLICIES:
+        raise InvalidStateFlushPolicyError(
+            f"Unknown state flush policy {state_flush_policy}, use {STATE_FLUSH_POLICIES}"
+        )
+    if state_flush_policy != STATE_FLUSH_POLICY_IMMEDIATE and batch_task_logger_name is None:
+        raise InvalidStateFlushPolicyError(f"State flush policy {state_flush_policy} requires a batch task logger")
+    if state_flush_every_n <= 0:
+        raise InvalidStateFlushPolicyError(
+            f"State flush frequency must be strictly positive, got {state_flush_every_n}"
+        )
+
+
+def sort_task_graph(task_graph: Dict[str, List[str]]) -> List[str]:
+    for task_name, dependencies in task_graph.items():
+        unknown_dependencies = [dependency for dependency in dependencies if dependency not in task_graph]
+        if unknown_dependencies:
+            raise InvalidTaskGraphError(f"Task {task_name} depends on unknown tasks: {unknown_dependencies}")
+
+    sorted_tasks: List[str] = []
+    remaining_tasks = list(task_graph.keys())
+    while remaining_tasks:
+        ready_tasks = [
+            task_name
+            for task_name in remaining_tasks
+            if all(dependency in sorted_tasks for dependency in task_graph[task_name])
+        ]
+        if not ready_tasks:
+            raise InvalidTaskGraphError(f"Task graph contains a cycle between tasks: {remaining_tasks}")
+        sorted_tasks += ready_tasks
+        remaining_tasks = [task_name for task_name in remaining_tasks if task_name not in ready_tasks]
+    return sorted_tasks
+
+
+def fuse_task_list(task_list: List[str], fused_tasks: Dict[str, List[str]]) -> List[str]:
+    # Replace every run of chained tasks executed by a fused task with the fused task
+    fused_task_list: List[str] = []
+    index = 0
+    while index < len(task_list):
+        for fused_task_name, fused_task_names in fused_tasks.items():
+            if task_list[index : index + len(fused_task_names)] == fused_task_names:
+                fused_task_list.append(fused_task_name)
+                index += len(fused_task_names)
+                break
+        else:
+            fused_task_list.append(task_list[index])
+            index += 1
+    return fused_task_list
+
+
+def check_fused_tasks(task_list: List[str], fused_tasks: Dict[str, List[str]]) -> None:
+    fused_task_list = fuse_task_list(task_list, fused_tasks)
+    unmatched_fused_tasks = [
+        fused_task_name for fused_task_name in fused_tasks if fused_task_name not in fused_task_list
+    ]
+    if unmatched_fused_tasks:
+        raise InvalidTaskGraphError(
+            f"Fused tasks {unmatched_fused_tasks} do not match a run of consecutive tasks in {task_list}"
+        )
+
+
+def compute_critical_path(task_graph: Dict[str, List[str]], task_end_times: Dict[str, float]) -> List[str]:
+    # Walk back from the last completed task through its last completed dependency,
+    # ties being broken by completion order
+    if not task_end_times:
+        return []
+    completion_order = {task_name: index for index, task_name in enumerate(task_end_times)}
+
+    def completion_key(task_name: str) -> Tuple[float, int]:
+        return task_end_times[task_name], completion_order[task_name]
+
+    critical_path: List[str] = []
+    current_task: Optional[str] = max(task_end_times, key=completion_key)
+    while current_task is not None:
+        critical_path.insert(0, current_task)
+        dependencies = task_graph.get(current_task, [])
+        current_task = max(dependencies, key=completion_key) if dependencies else None
+    return critical_path
 
 
 class FunctionsOrchestratorStateService(OrchestratorStateService):
@@ -32,11 +149,16 @@ class FunctionsOrchestratorStateService(OrchestratorStateService):
         file_system: LocalFileSystem,
     ):
         self.file_system = file_system
+        self._held_locks = threading.local()
 
     @staticmethod
     def get_current_utc_date() -> str:
         return datetime.datetime.today().strftime("%Y%m%d")
 
+    @staticmethod
+    def is_state_file(filename: str) -> bool:
+        return not filename.startswith(STATE_METADATA_FILENAME_PREFIX)
+
     def read_state_file(self, file_path: str) -> List[dict]:
         with self.file_system.open(file_path, "r") as f:
             json_obj = json.load(f)
@@ -47,63 +169,306 @@ class FunctionsOrchestratorStateService(OrchestratorStateService):
             json.dump(json_obj, f)
             return True
 
+    @contextlib.contextmanager
+    def lock_metadata(self, log_folder_path: str) -> Generator[None, None, None]:
+        # Metadata files are read, updated then written, so that concurrent orchestrations logging to the same
+        # folder must update them one at a time. Locks are re-entrant within a thread.
+        held_folder_paths: set = self._held_locks.__dict__.setdefault("folder_paths", set())
+        if log_folder_path in held_folder_paths:
+            yield
+            return
+        with self.file_system.open(f"{log_folder_path}/{STATE_LOCK_FILENAME}", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            held_folder_paths.add(log_folder_path)
+            try:
+                yield
+            finally:
+                held_folder_paths.discard(log_folder_path)
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def write_metadata_file(self, json_obj: Any, file_path: str) -> bool:
+        # Write then rename, so that concurrent readers never see a partially written file,
+        # the temporary file being unique to every write
+        tmp_file_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+        with self.file_system.open(tmp_file_path, "w") as f:
+            json.dump(json_obj, f)
+        self.file_system.mv(tmp_file_path, file_path)
+        return True
+
     def save_state(self, payload: OrchestratorState, log_file_path: str):
-        jsons_to_add = [json.loads(OrchestratorState.to_json(payload))]
-        if self.file_system.exists(log_file_path):
-            logs_json: List[Any] = self.read_state_file(log_file_path)
-            logs_json += jsons_to_add
-            self.write_state_file(logs_json, log_file_path)
-        else:
-            self.write_state_file(jsons_to_add, log_file_path)
+        self.save_states([payload], log_file_path)
+
+    def save_states(self, payloads: List[OrchestratorState], log_file_path: str):
+        jsons_to_add = [json.loads(OrchestratorState.to_json(payload)) for payload in payloads]
+        log_folder_path = log_file_path.rsplit("/", 1)[0]
+        # JSON state files are rewritten as a whole, so that they are updated under the lock of the catalog
+        with self.lock_metadata(log_folder_path):
+            if self.file_system.exists(log_file_path):
+                logs_json: List[Any] = self.read_state_file(log_file_path)
+                logs_json += jsons_to_add
+                self.write_state_file(logs_json, log_file_path)
+            else:
+                self.write_state_file(jsons_to_add, log_file_path)
+            self.save_catalog(jsons_to_add, log_folder_path)
+
+    @staticmethod
+    def get_catalog_file_path(log_folder_path: str) -> str:
+        return f"{log_folder_path}/{STATE_CATALOG_FILENAME}"
+
+    def read_catalog(self, log_folder_path: str) -> Optional[dict]:
+        catalog_file_path = self.get_catalog_file_path(log_folder_path)
+        if not self.file_system.exists(catalog_file_path):
+            return None
+        with self.file_system.open(catalog_file_path, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def update_catalog(catalog: dict, state_dicts: List[dict]) -> dict:
+        for state_dict in state_dicts:
+            # JSON object keys are strings, states without base are cataloged under an empty one
+            states_by_status = catalog.setdefault(state_dict.get("base") or "", {})
+            cataloged_state_dict = states_by_status.get(state_dict.get("status"))
+            # Orchestrations finishing out of order must not move a checkpoint back to an older execution,
+            # states of a same execution replacing each other in the order they are saved, as in the state files
+            if cataloged_state_dict is None or (cataloged_state_dict.get("executionTime") or 0) <= (
+                state_dict.get("executionTime") or 0
+            ):
+                states_by_status[state_dict.get("status")] = state_dict
+        return catalog
+
+    def rebuild_catalog(self, log_folder_path: str) -> dict:
+        catalog: dict = {}
+        for state_filename in sorted(filter(self.is_state_file, self.file_system.ls(log_folder_path))):
+            self.update_catalog(catalog, self.read_state_file(f"{log_folder_path}/{state_filename}"))
+        self.write_metadata_file(catalog, self.get_catalog_file_path(log_folder_path))
+        return catalog
+
+    def iter_completed_processing_items(
+        self, log_folder_path: str
+    ) -> Generator[Tuple[dict, ProcessingItem], None, None]:
+        for state_filename in sorted(filter(self.is_state_file, self.file_system.ls(log_folder_path))):
+            for state_dict in self.read_state_file(f"{log_folder_path}/{state_filename}"):
+                for item_dict in state_dict.get("stateProcessingItems") or []:
+                    processing_item = ProcessingItem.from_dict(item_dict)
+                    # Completion states of the orchestrator itself repeat the item of its last task
+                    if state_dict.get("status") == f"{processing_item.step_name} {TASK_STATUS_COMPLETED}":
+                        yield state_dict, processing_item
+
+    def save_catalog(self, state_dicts: List[dict], log_folder_path: str):
+        with self.lock_metadata(log_folder_path):
+            catalog = self.read_catalog(log_folder_path)
+            if catalog is None:
+                # Logs written before the catalog existed are cataloged once
+                self.rebuild_catalog(log_folder_path)
+            else:
+                self.write_metadata_file(
+                    self.update_catalog(catalog, state_dicts), self.get_catalog_file_path(log_folder_path)
+                )
+
+    @staticmethod
+    def get_last_state_given_status_from_catalog(
+        catalog: dict, status: str, base: Optional[str] = None
+    ) -> Optional[OrchestratorState]:
+        state_dicts = [
+            states_by_status[status]
+            for catalog_base, states_by_status in catalog.items()
+            if (base is None or catalog_base == base) and status in states_by_status
+        ]
+        if len(state_dicts) == 0:
+            return None
+        return OrchestratorState.from_dict(max(state_dicts, key=lambda state_dict: state_dict.get("executionTime")))
 
     def get_last_state(self, log_folder_path: str) -> Optional[OrchestratorState]:
         if self.file_system.isdir(log_folder_path):
-            last_log_filename = max(self.file_system.ls(log_folder_path))
+            last_log_filename = max(filter(self.is_state_file, self.file_system.ls(log_folder_path)))
             last_log_file_path = f"{log_folder_path}/{last_log_filename}"
             last_state_dicts = self.read_state_file(last_log_file_path)
             if len(last_state_dicts) > 0:
                 last_state_dict: dict = last_state_dicts[-1]
-                last_state: OrchestratorState = OrchestratorState.from_json(json.dumps(last_state_dict))
+                last_state: OrchestratorState = OrchestratorState.from_dict(last_state_dict)
                 return last_state
             return None
         return None
 
-    def get_last_state_given_status(self, log_folder_path: str, status: str) -> Optional[OrchestratorState]:
+    def get_last_state_given_status(
+        self, log_folder_path: str, status: str, base: Optional[str] = None
+    ) -> Optional[OrchestratorState]:
         if self.file_system.isdir(log_folder_path):
-            state_filenames = sorted(self.file_system.ls(log_folder_path), reverse=True)
+            catalog = self.read_catalog(log_folder_path)
+            if catalog is not None:
+                return self.get_last_state_given_status_from_catalog(catalog=catalog, status=status, base=base)
+            # Without catalog, log files are scanned from the most recent one
+            state_filenames = sorted(filter(self.is_state_file, self.file_system.ls(log_folder_path)), reverse=True)
             for state_filename in state_filenames:
                 state_file_path = f"{log_folder_path}/{state_filename}"
                 last_state = self.get_last_state_given_status_from_state_file(
-                    state_file_path=state_file_path, status=status
+                    state_file_path=state_file_path, status=status, base=base
                 )
                 if last_state is not None:
                     return last_state
         return None
 
     def get_last_state_given_status_from_state_file(
-        self, state_file_path: str, status: str
+        self, state_file_path: str, status: str, base: Optional[str] = None
     ) -> Optional[OrchestratorState]:
         last_state_dicts: List[dict] = self.read_state_file(state_file_path)
         filtered_last_state_dicts: List[dict] = [
-            state_dict for state_dict in last_state_dicts if state_dict.get("status") == status
+            state_dict
+            for state_dict in last_state_dicts
+            if state_dict.get("status") == status and (base is None or state_dict.get("base") == base)
         ]
         if len(filtered_last_state_dicts) > 0:
             last_state_dict = filtered_last_state_dicts[-1]
-            last_state: OrchestratorState = OrchestratorState.from_json(json.dumps(last_state_dict))
+            last_state: OrchestratorState = OrchestratorState.from_dict(last_state_dict)
             return last_state
         return None
 
 
+class FunctionsOrchestratorJsonLinesStateService(FunctionsOrchestratorStateService):
+    """Appends states to JSON Lines log files, and indexes the latest state per status and job in a sidecar file"""
+
+    def __init__(
+        self,
+        file_system: LocalFileSystem,
+        compress: bool = False,
+    ):
+        super().__init__(file_system=file_system)
+        self.compress = compress
+
+    def get_log_filename(self, log_filename_pattern: str, date_pattern: str) -> str:
+        log_filename = log_filename_pattern.replace(date_pattern, self.get_current_utc_date())
+        return f"{log_filename}{STATE_FILE_COMPRESSED_EXTENSION}" if self.compress else log_filename
+
+    @staticmethod
+    def is_state_file(filename: str) -> bool:
+        return filename.endswith(STATE_FILE_JSON_LINES_EXTENSION) or filename.endswith(
+            f"{STATE_FILE_JSON_LINES_EXTENSION}{STATE_FILE_COMPRESSED_EXTENSION}"
+        )
+
+    @contextlib.contextmanager
+    def open_state_file(self, file_path: str, mode: str):
+        if file_path.endswith(STATE_FILE_COMPRESSED_EXTENSION):
+            with self.file_system.open(file_path, f"{mode}b") as raw_file:
+                with gzip.open(raw_file, f"{mode}t", encoding="utf-8") as f:
+                    yield f
+        else:
+            with self.file_system.open(file_path, mode) as f:
+                yield f
+
+    def read_state_file(self, file_path: str) -> List[dict]:
+        with self.open_state_file(file_path, "r") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def write_state_file(self, json_obj: Any, file_path: str) -> bool:
+        with self.open_state_file(file_path, "w") as f:
+            f.writelines(f"{json.dumps(state_dict)}\n" for state_dict in json_obj)
+            return True
+
+    def append_state_file(self, json_obj: List[dict], file_path: str) -> bool:
+        with self.open_state_file(file_path, "a") as f:
+            f.writelines(f"{json.dumps(state_dict)}\n" for state_dict in json_obj)
+            return True
+
+    @staticmethod
+    def get_index_file_path(log_folder_path: str) -> str:
+        return f"{log_folder_path}/{STATE_INDEX_FILENAME}"
+
+    def read_index(self, log_folder_path: str) -> Optional[dict]:
+        index_file_path = self.get_index_file_path(log_folder_path)
+        if not self.file_system.exists(index_file_path):
+            return None
+        with self.file_system.open(index_file_path, "r") as f:
+            return json.load(f)
+
+    def write_index(self, index: dict, log_folder_path: str) -> bool:
+        return self.write_metadata_file(index, self.get_index_file_path(log_folder_path))
+
+    @classmethod
+    def update_index(cls, index: dict, state_dicts: List[dict], log_file_path: str) -> dict:
+        cls.update_catalog(index.setdefault(STATE_INDEX_CATALOG_KEY, {}), state_dicts)
+        last_status_by_job: dict = index.setdefault(STATE_INDEX_LAST_STATUS_BY_JOB_KEY, {})
+        for state_dict in state_dicts:
+            index[STATE_INDEX_LAST_STATE_KEY] = state_dict
+            # Re-insert the job so that the dict stays ordered from least to most recently updated
+            last_status_by_job.pop(state_dict.get("jobId"), None)
+            last_status_by_job[state_dict.get("jobId")] = {
+                "status": state_dict.get("status"),
+                "executionTime": state_dict.get("executionTime"),
+                "logFilePath": log_file_path,
+            }
+        for job_id in list(last_status_by_job.keys())[: max(0, len(last_status_by_job) - STATE_INDEX_MAX_JOBS)]:
+            del last_status_by_job[job_id]
+        return index
+
+    def rebuild_index(self, log_folder_path: str) -> dict:
+        index: dict = {STATE_INDEX_CATALOG_KEY: {}}
+        state_filenames = sorted(filter(self.is_state_file, self.file_system.ls(log_folder_path)))
+        for state_filename in state_filenames:
+            state_file_path = f"{log_folder_path}/{state_filename}"
+            self.update_index(index, self.read_state_file(state_file_path), state_file_path)
+        self.write_index(index, log_folder_path)
+        return index
+
+    def get_index(self, log_folder_path: str) -> Optional[dict]:
+        if not self.file_system.isdir(log_folder_path):
+            return None
+        index = self.read_index(log_folder_path)
+        if index is None:
+            index = self.rebuild_index(log_folder_path)
+        return index
+
+    def save_states(self, payloads: List[OrchestratorState], log_file_path: str):
+        jsons_to_add = [json.loads(OrchestratorState.to_json(payload)) for payload in payloads]
+        self.append_state_file(jsons_to_add, log_file_path)
+
+        log_folder_path = log_file_path.rsplit("/", 1)[0]
+        with self.lock_metadata(log_folder_path):
+            index = self.read_index(log_folder_path)
+            if index is None or STATE_INDEX_CATALOG_KEY not in index:
+                # Logs written before the index, or before it held the catalog, are indexed once
+                self.rebuild_index(log_folder_path)
+            else:
+                self.write_index(self.update_index(index, jsons_to_add, log_file_path), log_folder_path)
+
+    # The checkpoint catalog is kept in the index, so that every save rewrites a single metadata file
+    def read_catalog(self, log_folder_path: str) -> Optional[dict]:
+        index = self.read_index(log_folder_path)
+        return None if index is None else index.get(STATE_INDEX_CATALOG_KEY)
+
+    def rebuild_catalog(self, log_folder_path: str) -> dict:
+        return self.rebuild_index(log_folder_path)[STATE_INDEX_CATALOG_KEY]
+
+    def get_last_state(self, log_folder_path: str) -> Optional[OrchestratorState]:
+        index = self.get_index(log_folder_path)
+        if index is None or index.get(STATE_INDEX_LAST_STATE_KEY) is None:
+            return None
+        return OrchestratorState.from_dict(index[STATE_INDEX_LAST_STATE_KEY])
+
+    def get_last_job_status(self, log_folder_path: str, job_id: str) -> Optional[dict]:
+        index = self.get_index(log_folder_path)
+        if index is None:
+            return None
+        return index.get(STATE_INDEX_LAST_STATUS_BY_JOB_KEY, {}).get(job_id)
+
+
 class FunctionsOrchestratorTaskManager(OrchestratorTaskManager):
     def __init__(
         self,
         orchestrator_context: durable_func.DurableOrchestrationContext,
         orchestrator_state: OrchestratorState,
         task_logger_name: str,
+        state_flush_policy: str = STATE_FLUSH_POLICY_IMMEDIATE,
+        state_flush_every_n: int = 1,
+        batch_task_logger_name: Optional[str] = None,
     ):
+        check_state_flush_policy(state_flush_policy, state_flush_every_n, batch_task_logger_name)
         self.orchestrator_context = orchestrator_context
         self.task_logger_name = task_logger_name
         self.orchestrator_state = orchestrator_state
+        self.state_flush_policy = state_flush_policy
+        self.state_flush_every_n = state_flush_every_n
+        self.batch_task_logger_name = batch_task_logger_name
+        self.buffered_states: List[OrchestratorState] = []
 
     def update_state(self, task: str, status: str, processing_item: Optional[ProcessingItem]):
         self.orchestrator_state.update_state(
@@ -127,6 +492,31 @@ class FunctionsOrchestratorTaskManager(OrchestratorTaskManager):
     def log_state(self) -> OrchestratorState:
         return self.orchestrator_context.call_activity(name=self.task_logger_name, input_=self.orchestrator_state)
 
+    @try_task_decorator
+    def flush_states(self) -> List[OrchestratorState]:
+        buffered_states, self.buffered_states = self.buffered_states, []
+        return self.orchestrator_context.call_activity(name=self.batch_task_logger_name, input_=buffered_states)
+
+    def should_flush_states(self, is_task_completed: bool) -> bool:
+        if self.state_flush_policy == STATE_FLUSH_POLICY_PER_TASK:
+            return is_task_completed
+        if self.state_flush_policy == STATE_FLUSH_POLICY_EVERY_N_TRANSITIONS:
+            return len(self.buffered_states) >= self.state_flush_every_n
+        return False
+
+    def record_state(self, is_task_completed: bool = False) -> Generator[Any, Any, None]:
+        if self.state_flush_policy == STATE_FLUSH_POLICY_IMMEDIATE:
+            yield self.log_state()
+            return
+        # Snapshot the state, as the orchestrator state is updated in place between transitions
+        self.buffered_states.append(OrchestratorState.from_json(OrchestratorState.to_json(self.orchestrator_state)))
+        if self.should_flush_states(is_task_completed):
+            yield self.flush_states()
+
+    def flush_pending_states(self) -> Generator[Any, Any, None]:
+        if self.buffered_states:
+            yield self.flush_states()
+
     @try_task_decorator
     def do_task(self, task_name: str, task_payload: dict) -> ProcessingItem:
         return self.orchestrator_context.call_activity(name=task_name, input_=task_payload)
@@ -139,17 +529,160 @@ class FunctionsOrchestratorTaskManager(OrchestratorTaskManager):
             status=TASK_STATUS_RUNNING,
             processing_item=None,
         )
-        yield self.log_state()
+        yield from self.record_state()
         processing_result: ProcessingItem = yield self.do_task(task_name=task_name, task_payload=task_payload)
         self.update_state(
             task=task_name,
             status=TASK_STATUS_COMPLETED,
             processing_item=processing_result,
         )
-        yield self.log_state()
+        yield from self.record_state(is_task_completed=True)
+
+        return processing_result
+
+    def execute_fused_task(
+        self, task_name: str, task_payload: dict
+    ) -> Generator[Union[OrchestratorState, List[ProcessingItem]], None, List[ProcessingItem]]:
+        self.update_state(
+            task=task_name,
+            status=TASK_STATUS_RUNNING,
+            processing_item=None,
+        )
+        yield from self.record_state()
+        # A fused task returns one processing item per chained task it executed, in the chained order
+        processing_results: List[ProcessingItem] = yield self.do_task(task_name=task_name, task_payload=task_payload)
+        for processing_result in processing_results:
+            self.update_state(
+                task=processing_result.step_name,
+                status=TASK_STATUS_COMPLETED,
+                processing_item=processing_result,
+            )
+            yield from self.record_state(is_task_completed=True)
+
+        return processing_results
+
+    def schedule_task(self, task_name: str, task_payload: dict, batch_size: Optional[int] = None):
+        if batch_size is None:
+            return self.do_task(task_name=task_name, task_payload=task_payload)
+        # Batches posted by upstream tasks take precedence over fixed size batches
+        file_paths = task_payload.get(PAYLOAD_INPUT_FILE_PATHS_KEY) or []
+        file_paths_batches = task_payload.get(PAYLOAD_INPUT_FILE_BATCHES_KEY) or split_in_batches(
+            file_paths, batch_size
+        )
+        # Batches are not ranges of the input files, so each one is given the rank of its files among them
+        file_ranks = {file_path: file_rank for file_rank, file_path in enumerate(file_paths)}
+        batch_payloads = [
+            {
+                **{key: value for key, value in task_payload.items() if key != PAYLOAD_INPUT_FILE_BATCHES_KEY},
+                PAYLOAD_INPUT_FILE_PATHS_KEY: file_paths_batch,
+                PAYLOAD_INPUT_FILE_RANKS_KEY: [file_ranks.get(file_path) for file_path in file_paths_batch],
+                PAYLOAD_BATCH_INDEX_KEY: batch_index,
+            }
+            for batch_index, file_paths_batch in enumerate(file_paths_batches)
+        ]
+        return self.orchestrator_context.task_all(
+            [self.do_task(task_name=task_name, task_payload=batch_payload) for batch_payload in batch_payloads]
+        )
+
+    @staticmethod
+    def collect_task_result(task_name: str, task_result: Union[ProcessingItem, List[ProcessingItem]]) -> ProcessingItem:
+        if isinstance(task_result, list):
+            return ProcessingItem.merge(step_name=task_name, processing_items=task_result)
+        return task_result
+
+    def execute_fan_out_task(
+        self, task_name: str, task_payload: dict, batch_size: int
+    ) -> Generator[Union[OrchestratorState, List[ProcessingItem]], None, ProcessingItem]:
+        self.update_state(
+            task=task_name,
+            status=TASK_STATUS_RUNNING,
+            processing_item=None,
+        )
+        yield from self.record_state()
+        batch_results: List[ProcessingItem] = yield self.schedule_task(
+            task_name=task_name, task_payload=task_payload, batch_size=batch_size
+        )
+        processing_result = self.collect_task_result(task_name=task_name, task_result=batch_results)
+        self.update_state(
+            task=task_name,
+            status=TASK_STATUS_COMPLETED,
+            processing_item=processing_result,
+        )
+        yield from self.record_state(is_task_completed=True)
 
         return processing_result
 
+    def execute_task_graph(
+        self,
+        task_graph: Dict[str, List[str]],
+        task_payload: dict,
+        fan_out_batch_sizes: Optional[Dict[str, int]] = None,
+    ) -> Generator[Any, Any, Tuple[List[ProcessingItem], dict]]:
+        fan_out_batch_sizes = fan_out_batch_sizes if fan_out_batch_sizes is not None else {}
+        sorted_tasks = sort_task_graph(task_graph)
+        scheduled_tasks: Dict[str, Any] = {}
+        scheduled_times: Dict[str, float] = {}
+        completed_results: Dict[str, ProcessingItem] = {}
+        completed_times: Dict[str, float] = {}
+        results: List[ProcessingItem] = []
+
+        while len(completed_results) < len(sorted_tasks):
+            # Schedule every task whose dependencies are all completed
+            for task_name in sorted_tasks:
+                is_ready = all(dependency in completed_results for dependency in task_graph[task_name])
+                if task_name in scheduled_tasks or not is_ready:
+                    continue
+                ready_task_payload = {
+                    **task_payload,
+                    PAYLOAD_INPUT_FILE_PATHS_KEY: ProcessingItem.extract_payload_file_paths_from_processing_items(
+                        results, task_name, POST_INPUT_FILE_PATHS_KEY
+                    ),
+                    PAYLOAD_INPUT_FILE_BATCHES_KEY: ProcessingItem.extract_payload_file_paths_from_processing_items(
+                        results, task_name, POST_INPUT_FILE_BATCHES_KEY
+                    ),
+                }
+                self.update_state(task=task_name, status=TASK_STATUS_RUNNING, processing_item=None)
+                yield from self.record_state()
+                scheduled_tasks[task_name] = self.schedule_task(
+                    task_name=task_name,
+                    task_payload=ready_task_payload,
+                    batch_size=fan_out_batch_sizes.get(task_name),
+                )
+                scheduled_times[task_name] = datetime.datetime.timestamp(self.orchestrator_context.current_utc_datetime)
+
+            # Wait for the first running task to complete
+            running_tasks = {
+                task_name: task for task_name, task in scheduled_tasks.items() if task_name not in completed_results
+            }
+            finished_task = yield self.orchestrator_context.task_any(list(running_tasks.values()))
+            finished_task_name = next(task_name for task_name, task in running_tasks.items() if task is finished_task)
+            if isinstance(finished_task.result, Exception):
+                logger.exception(f"FAILED TASK ERROR: {finished_task.result}")
+                raise finished_task.result
+
+            processing_result = self.collect_task_result(finished_task_name, finished_task.result)
+            completed_results[finished_task_name] = processing_result
+            completed_times[finished_task_name] = datetime.datetime.timestamp(
+                self.orchestrator_context.current_utc_datetime
+            )
+            results.append(processing_result)
+            self.update_state(task=finished_task_name, status=TASK_STATUS_COMPLETED, processing_item=processing_result)
+            yield from self.record_state(is_task_completed=True)
+
+        task_wait_times = {
+            task_name: (
+                max(0.0, completed_results[task_name].start_time - scheduled_times[task_name])
+                if completed_results[task_name].start_time is not None
+                else None
+            )
+            for task_name in sorted_tasks
+        }
+        graph_report = {
+            POST_CRITICAL_PATH_KEY: compute_critical_path(task_graph, completed_times),
+            POST_TASK_WAIT_TIMES_KEY: task_wait_times,
+        }
+        return results, graph_report
+
 
 class FunctionsOrchestratorBuilder:
     def __init__(
@@ -157,12 +690,33 @@ class FunctionsOrchestratorBuilder:
         base_name: str,
         orchestrator_function_name: str,
         task_logger: str,
-        task_list: typing.List[str],
+        task_list: Optional[typing.List[str]] = None,
+        fan_out_batch_sizes: Optional[Dict[str, int]] = None,
+        task_graph: Optional[Dict[str, List[str]]] = None,
+        state_flush_policy: str = STATE_FLUSH_POLICY_IMMEDIATE,
+        state_flush_every_n: int = 1,
+        batch_task_logger: Optional[str] = None,
+        fused_tasks: Optional[Dict[str, List[str]]] = None,
     ):
+        check_state_flush_policy(state_flush_policy, state_flush_every_n, batch_task_logger)
+        if task_list is None and task_graph is None:
+            raise InvalidTaskGraphError("Either a task_list or a task_graph must be provided")
+        if task_graph is not None:
+            sort_task_graph(task_graph)
+        if fused_tasks:
+            if task_graph is not None:
+                raise InvalidTaskGraphError("Fused tasks are only supported with a task_list")
+            check_fused_tasks(task_list, fused_tasks)
         self.base_name = base_name
         self.orchestrator_function_name = orchestrator_function_name
         self.task_logger = task_logger
-        self.task_list = task_list
+        self.task_list = task_list if task_list is not None else []
+        self.fan_out_batch_sizes = fan_out_batch_sizes if fan_out_batch_sizes is not None else {}
+        self.task_graph = task_graph
+        self.state_flush_policy = state_flush_policy
+        self.state_flush_every_n = state_flush_every_n
+        self.batch_task_logger = batch_task_logger
+        self.fused_tasks = fused_tasks if fused_tasks is not None else {}
 
     @staticmethod
     def _orchestrator_function(
@@ -171,6 +725,12 @@ class FunctionsOrchestratorBuilder:
         orchestrator_function_name: str,
         task_logger: str,
         task_list: typing.List[str],
+        fan_out_batch_sizes: Optional[Dict[str, int]] = None,
+        task_graph: Optional[Dict[str, List[str]]] = None,
+        state_flush_policy: str = STATE_FLUSH_POLICY_IMMEDIATE,
+        state_flush_every_n: int = 1,
+        batch_task_logger: Optional[str] = None,
+        fused_tasks: Optional[Dict[str, List[str]]] = None,
     ) -> str:
         ingestion_mode = context.get_input()[PAYLOAD_INGESTION_MODE_KEY]
         # Set initial payload
@@ -192,6 +752,9 @@ class FunctionsOrchestratorBuilder:
             orchestrator_context=context,
             orchestrator_state=orchestration_state,
             task_logger_name=task_logger,
+            state_flush_policy=state_flush_policy,
+            state_flush_every_n=state_flush_every_n,
+            batch_task_logger_name=batch_task_logger,
         )
 
         # Update orchestrator function state to running
@@ -200,40 +763,83 @@ class FunctionsOrchestratorBuilder:
             status=TASK_STATUS_RUNNING,
             processing_item=None,
         )
-        yield orchestration_manager.log_state()
+        yield from orchestration_manager.record_state()
 
         # Init ProcessingItem list
         results: typing.List[ProcessingItem] = []
+        orchestrator_posts: dict = {}
 
         # Prepare Chained Tasks
-        task_list = task_list
-
-        # Execute Chained Tasks
-        for task in task_list:
-            activity_task_payload[
-                PAYLOAD_INPUT_FILE_PATHS_KEY
-            ] = ProcessingItem.extract_payload_file_paths_from_processing_items(
-                results, task, POST_INPUT_FILE_PATHS_KEY
-            )
-            result: ProcessingItem = yield from orchestration_manager.execute_task(
-                task_name=task, task_payload=activity_task_payload
+        fused_tasks = fused_tasks if fused_tasks is not None else {}
+        task_list = fuse_task_list(task_list, fused_tasks) if task_graph is None else []
+
+        try:
+            # Execute Task Graph, scheduling concurrently every task whose dependencies are completed
+            if task_graph is not None:
+                results, graph_report = yield from orchestration_manager.execute_task_graph(
+                    task_graph=task_graph, task_payload=activity_task_payload, fan_out_batch_sizes=fan_out_batch_sizes
+                )
+                orchestrator_posts.update(graph_report)
+
+            # Execute Chained Tasks
+            for task in task_list:
+                # A fused task receives the posts addressed to the first chained task it executes
+                recipient_task = fused_tasks[task][0] if task in fused_tasks else task
+                activity_task_payload[
+                    PAYLOAD_INPUT_FILE_PATHS_KEY
+                ] = ProcessingItem.extract_payload_file_paths_from_processing_items(
+                    results, recipient_task, POST_INPUT_FILE_PATHS_KEY
+                )
+                activity_task_payload[
+                    PAYLOAD_INPUT_FILE_BATCHES_KEY
+                ] = ProcessingItem.extract_payload_file_paths_from_processing_items(
+                    results, recipient_task, POST_INPUT_FILE_BATCHES_KEY
+                )
+                if task in fused_tasks:
+                    fused_results: List[ProcessingItem] = yield from orchestration_manager.execute_fused_task(
+                        task_name=task, task_payload=activity_task_payload
+                    )
+                    results += fused_results
+                    continue
+                if fan_out_batch_sizes and task in fan_out_batch_sizes:
+                    result: ProcessingItem = yield from orchestration_manager.execute_fan_out_task(
+                        task_name=task, task_payload=activity_task_payload, batch_size=fan_out_batch_sizes[task]
+                    )
+                else:
+                    result: ProcessingItem = yield from orchestration_manager.execute_task(
+                        task_name=task, task_payload=activity_task_payload
+                    )
+                results.append(result)
+        except Exception:
+            # Make sure buffered states, with the failure, are logged before failing the orchestration
+            orchestration_manager.update_state(
+                task=orchestrator_function_name,
+                status=TASK_STATUS_FAILED,
+                processing_item=None,
             )
-            results.append(result)
-
-        # Get Checkmark for orchestration and add it to  Orchestrator posts attribute
-        last_processed_file_paths = ProcessingItem.extract_payload_file_paths_from_processing_items(
-            results, orchestrator_function_name, POST_SOURCE_PROCESSED_FILE_PATHS_KEY
+            yield from orchestration_manager.record_state()
+            yield from orchestration_manager.flush_pending_states()
+            raise
+
+        # Get Checkmark for orchestration, with any other post to the orchestrator, and add it to Orchestrator posts
+        orchestrator_posts.update(
+            ProcessingItem.merge_posts(
+                [
+                    {orchestrator_function_name: posts}
+                    for posts in ProcessingItem.filter_posts_in_processing_items(results, orchestrator_function_name)
+                ]
+            ).get(orchestrator_function_name, {})
         )
-        orchestration_manager.orchestrator_state.posts = {
-            orchestrator_function_name: {POST_SOURCE_PROCESSED_FILE_PATHS_KEY: last_processed_file_paths}
-        }
+        orchestrator_posts.setdefault(POST_SOURCE_PROCESSED_FILE_PATHS_KEY, [])
+        orchestration_manager.orchestrator_state.posts = {orchestrator_function_name: orchestrator_posts}
         # update_state_to_done
         orchestration_manager.update_state(
             task=orchestrator_function_name,
             status=TASK_STATUS_COMPLETED,
             processing_item=None,
         )
-        yield orchestration_manager.log_state()
+        yield from orchestration_manager.record_state(is_task_completed=True)
+        yield from orchestration_manager.flush_pending_states()
 
         return list(map(lambda item: ProcessingItem.to_json(item), results))
 
@@ -244,4 +850,10 @@ class FunctionsOrchestratorBuilder:
             orchestrator_function_name=self.orchestrator_function_name,
             task_logger=self.task_logger,
             task_list=self.task_list,
+            fan_out_batch_sizes=self.fan_out_batch_sizes,
+            task_graph=self.task_graph,
+            state_flush_policy=self.state_flush_policy,
+            state_flush_every_n=self.state_flush_every_n,
+            batch_task_logger=self.batch_task_logger,
+            fused_tasks=self.fused_tasks,
         )
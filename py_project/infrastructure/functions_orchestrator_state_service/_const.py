@@ -1,13 +1,46 @@
+from py_project.config.functions_config import (
+    STATE_FLUSH_POLICY_EVERY_N_TRANSITIONS,
+    STATE_FLUSH_POLICY_IMMEDIATE,
+    STATE_FLUSH_POLICY_ON_COMPLETION,
+    STATE_FLUSH_POLICY_PER_TASK,
+)
+
 TASK_STATUS_COMPLETED = "COMPLETED"
 TASK_STATUS_RUNNING = "RUNNING"
+TASK_STATUS_FAILED = "FAILED"
 POST_INPUT_FILE_PATHS_KEY = "file_paths"
+POST_INPUT_FILE_BATCHES_KEY = "file_batches"
 POST_INPUT_DATABASE_SPECS_KEY = "database_specs"
 POST_SOURCE_PROCESSED_FILE_PATHS_KEY = "checkpoint_mark_files"
+POST_CRITICAL_PATH_KEY = "critical_path"
+POST_TASK_WAIT_TIMES_KEY = "task_wait_times"
 
 PAYLOAD_INGESTION_MODE_KEY = "ingestion_mode"
 PAYLOAD_INPUT_FILE_PATHS_KEY = "file_paths"
+PAYLOAD_INPUT_FILE_BATCHES_KEY = "file_batches"
+PAYLOAD_INPUT_FILE_RANKS_KEY = "file_ranks"
 PAYLOAD_INPUT_DATABASE_SPECS_KEY = "database_specs"
 PAYLOAD_REQUEST_ID_KEY = "request_id"
 PAYLOAD_BASE_NAME_KEY = "base"
+PAYLOAD_BATCH_INDEX_KEY = "batch_index"
 
 ORCHESTRATOR_LOGGING_ACTIVITY = "name"
+
+STATE_FLUSH_POLICIES = [
+    STATE_FLUSH_POLICY_IMMEDIATE,
+    STATE_FLUSH_POLICY_PER_TASK,
+    STATE_FLUSH_POLICY_EVERY_N_TRANSITIONS,
+    STATE_FLUSH_POLICY_ON_COMPLETION,
+]
+
+STATE_FILE_JSON_LINES_EXTENSION = ".jsonl"
+STATE_FILE_COMPRESSED_EXTENSION = ".gz"
+STATE_INDEX_FILENAME = "_index.json"
+STATE_INDEX_LAST_STATE_KEY = "lastState"
+STATE_INDEX_LAST_STATUS_BY_JOB_KEY = "lastStatusByJob"
+STATE_INDEX_CATALOG_KEY = "checkpoints"
+STATE_INDEX_MAX_JOBS = 1000
+
+STATE_METADATA_FILENAME_PREFIX = "_"
+STATE_CATALOG_FILENAME = "_checkpoints.json"
+STATE_LOCK_FILENAME = "_metadata.lock"
@@ -0,0 +1,6 @@
+class InvalidTaskGraphError(Exception):
+    pass
+
+
+class InvalidStateFlushPolicyError(Exception):
+    pass
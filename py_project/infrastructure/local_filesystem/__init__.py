@@ -1,5 +1,6 @@
-from ._classes import LocalFileSystem
+from ._classes import AsyncLocalFileSystem, LocalFileSystem
 
 __all__ = [
+    "AsyncLocalFileSystem",
     "LocalFileSystem",
 ]
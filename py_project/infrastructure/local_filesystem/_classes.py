@@ -1,9 +1,12 @@
+import asyncio
 import os
-from typing import Optional
+from typing import Iterator, List, Optional
 
 import pandas as pd
+from pyarrow import feather
 
-from py_project.domain.adapters.filesystem import FileSystem
+from py_project.domain.adapters.async_filesystem import AsyncFileSystem
+from py_project.domain.adapters.filesystem import FileDetails, FileSystem
 from py_project.logger import logging
 
 
@@ -17,6 +20,26 @@ class LocalFileSystem(FileSystem):
     def ls(self, folder: str):
         return os.listdir(folder)
 
+    def iter_file_details(self, folder: str, recursive: bool = False, prefix: str = "") -> Iterator[FileDetails]:
+        yield from self._iter_file_details(folder, relative_folder="", recursive=recursive, prefix=prefix)
+
+    def _iter_file_details(
+        self, folder: str, relative_folder: str, recursive: bool, prefix: str
+    ) -> Iterator[FileDetails]:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                relative_path = f"{relative_folder}{entry.name}"
+                if entry.is_dir():
+                    # Only walk down folders that can hold paths starting with the prefix
+                    relative_subfolder = f"{relative_path}/"
+                    if recursive and (relative_subfolder.startswith(prefix) or prefix.startswith(relative_subfolder)):
+                        yield from self._iter_file_details(entry.path, relative_subfolder, recursive, prefix)
+                elif relative_path.startswith(prefix):
+                    entry_stat = entry.stat()
+                    yield FileDetails(
+                        path=f"{folder}/{entry.name}", size=entry_stat.st_size, last_modified=entry_stat.st_mtime
+                    )
+
     def mkdir(self, folder_name: str):
         if not os.path.exists(folder_name):
             return os.makedirs(folder_name)
@@ -27,6 +50,9 @@ class LocalFileSystem(FileSystem):
     def open(self, file_path: str, mode: str):
         return open(file_path, mode)
 
+    def mv(self, source_path: str, dest_path: str):
+        return os.replace(source_path, dest_path)
+
     def read_csv(self, file_path: str, skiprows: int = 0, **kwargs) -> Optional[pd.DataFrame]:
         logging.info(f"Reading file: {file_path}")
         return pd.read_csv(file_path, skiprows=skiprows, **kwargs)
@@ -38,3 +64,46 @@ class LocalFileSystem(FileSystem):
     def read_parquet(self, file_path: str, **kwargs):
         logging.info(f"Reading file: {file_path}")
         return pd.read_parquet(file_path, **kwargs)
+
+    def write_feather(self, input_df: pd.DataFrame, file_path: str, **kwargs):
+        logging.info(f"Writing file: {file_path}")
+        return input_df.to_feather(file_path, **kwargs)
+
+    def read_feather(self, file_path: str, columns: Optional[List[str]] = None, **kwargs) -> pd.DataFrame:
+        logging.info(f"Reading file: {file_path}")
+        # Uncompressed columns are wrapped over the mapped pages instead of being copied to the heap
+        table = feather.read_table(file_path, columns=columns, memory_map=True)
+        return table.to_pandas(split_blocks=True, **kwargs)
+
+
+class AsyncLocalFileSystem(AsyncFileSystem):
+    def __init__(self):
+        pass
+
+    async def ls(self, folder: str) -> List[str]:
+        return await asyncio.to_thread(os.listdir, folder)
+
+    async def exists(self, file_path: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, file_path)
+
+    @staticmethod
+    def _read_bytes(file_path: str) -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _write_bytes(file_path: str, data: bytes):
+        with open(file_path, "wb") as f:
+            return f.write(data)
+
+    async def read_bytes(self, file_path: str) -> bytes:
+        logging.info(f"Reading file: {file_path}")
+        return await asyncio.to_thread(self._read_bytes, file_path)
+
+    async def write_bytes(self, file_path: str, data: bytes):
+        logging.info(f"Writing file: {file_path}")
+        return await asyncio.to_thread(self._write_bytes, file_path, data)
+
+    async def read_feather(self, file_path: str, columns: Optional[List[str]] = None, **kwargs) -> pd.DataFrame:
+        # Local files are memory-mapped as by the synchronous file system, instead of being read in memory
+        return await asyncio.to_thread(LocalFileSystem().read_feather, file_path, columns=columns, **kwargs)
@@ -0,0 +1,5 @@
+from ._classes import InMemoryFileSystem
+
+__all__ = [
+    "InMemoryFileSystem",
+]
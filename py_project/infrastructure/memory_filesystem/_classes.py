@@ -0,0 +1,105 @@
+import io
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from py_project.domain.adapters.filesystem import FileDetails, FileSystem
+from py_project.logger import logging
+
+
+class _InMemoryWrittenFile(io.BytesIO):
+    def __init__(self, on_close: Callable[[bytes], None], initial_bytes: bytes = b""):
+        super().__init__(initial_bytes)
+        self.seek(0, io.SEEK_END)
+        self.on_close = on_close
+
+    def close(self):
+        if not self.closed:
+            self.on_close(self.getvalue())
+        super().close()
+
+
+class InMemoryFileSystem(FileSystem):
+    def __init__(self):
+        # File paths with their content and modification time
+        self.files: Dict[str, Tuple[bytes, float]] = {}
+        self.folders: Set[str] = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        return "/" + path.strip("/")
+
+    def save_file(self, file_path: str, content: bytes):
+        with self.lock:
+            self.files[self.normalize_path(file_path)] = (content, time.time())
+
+    def exists(self, path: str) -> bool:
+        return self.normalize_path(path) in self.files or self.isdir(path)
+
+    def ls(self, folder: str) -> List[str]:
+        folder_prefix = self.normalize_path(folder).rstrip("/") + "/"
+        with self.lock:
+            paths = list(self.files.keys()) + list(self.folders)
+        return sorted({path[len(folder_prefix) :].split("/")[0] for path in paths if path.startswith(folder_prefix)})
+
+    def iter_file_details(self, folder: str, recursive: bool = False, prefix: str = "") -> Iterator[FileDetails]:
+        folder_prefix = self.normalize_path(folder).rstrip("/") + "/"
+        with self.lock:
+            files = sorted(self.files.items())
+        for path, (content, last_modified) in files:
+            relative_path = path[len(folder_prefix) :]
+            if not path.startswith(folder_prefix) or not relative_path.startswith(prefix):
+                continue
+            if not recursive and "/" in relative_path:
+                continue
+            yield FileDetails(
+                path=f"{folder.rstrip('/')}/{relative_path}", size=len(content), last_modified=last_modified
+            )
+
+    def mkdir(self, folder_name: str):
+        with self.lock:
+            self.folders.add(self.normalize_path(folder_name))
+
+    def isdir(self, folder_path: str) -> bool:
+        normalized_folder_path = self.normalize_path(folder_path)
+        with self.lock:
+            return normalized_folder_path in self.folders or any(
+                path.startswith(normalized_folder_path.rstrip("/") + "/") for path in self.files
+            )
+
+    def open(self, file_path: str, mode: str):
+        normalized_file_path = self.normalize_path(file_path)
+        if "r" in mode:
+            if normalized_file_path not in self.files:
+                raise FileNotFoundError(file_path)
+            binary_file = io.BytesIO(self.files[normalized_file_path][0])
+        elif "w" in mode or "a" in mode:
+            initial_bytes = self.files.get(normalized_file_path, (b"", None))[0] if "a" in mode else b""
+            binary_file = _InMemoryWrittenFile(
+                on_close=lambda content: self.save_file(file_path, content), initial_bytes=initial_bytes
+            )
+        else:
+            raise ValueError(f"Unsupported file mode {mode}")
+        return binary_file if "b" in mode else io.TextIOWrapper(binary_file, encoding="utf-8")
+
+    def mv(self, source_path: str, dest_path: str):
+        with self.lock:
+            self.files[self.normalize_path(dest_path)] = self.files.pop(self.normalize_path(source_path))
+
+    def read_csv(self, file_path: str, skiprows: int = 0, **kwargs) -> Optional[pd.DataFrame]:
+        logging.info(f"Reading file: {file_path}")
+        with self.open(file_path, "rb") as f:
+            return pd.read_csv(f, skiprows=skiprows, **kwargs)
+
+    def write_parquet(self, input_df: pd.DataFrame, file_path: str, **kwargs):
+        logging.info(f"Writing file: {file_path}")
+        with self.open(file_path, "wb") as f:
+            return input_df.to_parquet(f, **kwargs)
+
+    def read_parquet(self, file_path: str, **kwargs):
+        logging.info(f"Reading file: {file_path}")
+        with self.open(file_path, "rb") as f:
+            return pd.read_parquet(f, **kwargs)
@@ -1,12 +1,13 @@
+import io
 import logging
-from typing import Optional
+from typing import Any, Iterable, List, Optional, Set, Tuple
 
 import pandas as pd
 from psycopg2 import sql
 from psycopg2.sql import Composed
-from sqlalchemy import MetaData, inspect, text
-from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.engine import Engine
+from sqlalchemy import column, inspect, literal_column, select, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import Select
 
 from py_project.config.database_config import (
     WRITE_MODE_APPEND,
@@ -14,11 +15,101 @@ from py_project.config.database_config import (
     WRITE_MODE_TRUNCATE_THEN_APPEND,
     WRITE_MODE_UPSERT,
 )
-from py_project.domain.adapters.database import Database
+from py_project.domain.adapters.database import Database, TableWrite
 
 from ._exceptions import PostgresError
 
 CHUNKSIZE: int = 10000
+TEMPORARY_SCHEMA: str = "pg_temp"
+
+
+def copy_dataframe(cursor, input_df: pd.DataFrame, schema: str, table_name: str):
+    buffer = io.StringIO()
+    input_df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    copy_statement = sql.SQL("COPY {schema}.{table_name} ({columns}) FROM STDIN WITH (FORMAT csv)").format(
+        schema=sql.Identifier(schema),
+        table_name=sql.Identifier(table_name),
+        columns=sql.SQL(", ").join(map(sql.Identifier, input_df.columns)),
+    )
+    cursor.copy_expert(copy_statement, buffer)
+
+
+def upsert_dataframe(connection: Connection, cursor, input_df: pd.DataFrame, schema: str, table_name: str):
+    # Rows are copied to a temporary table and upserted by a single statement rather than one statement per row,
+    # their keys being unique as a row cannot be updated twice by the same statement
+    key_columns = inspect(connection).get_pk_constraint(table_name, schema=schema)["constrained_columns"]
+    if not key_columns:
+        raise PostgresError(f"Table '{schema}.{table_name}' has no primary key to upsert on")
+    staging_table_name = f"upsert_{table_name}"
+    cursor.execute(
+        sql.SQL("CREATE TEMPORARY TABLE {staging_table_name} (LIKE {schema}.{table_name}) ON COMMIT DROP;").format(
+            staging_table_name=sql.Identifier(staging_table_name),
+            schema=sql.Identifier(schema),
+            table_name=sql.Identifier(table_name),
+        )
+    )
+    copy_dataframe(cursor, input_df, schema=TEMPORARY_SCHEMA, table_name=staging_table_name)
+    columns = sql.SQL(", ").join(map(sql.Identifier, input_df.columns))
+    updated_columns = [column_name for column_name in input_df.columns if column_name not in key_columns]
+    conflict_action = (
+        sql.SQL("DO UPDATE SET {assignments}").format(
+            assignments=sql.SQL(", ").join(
+                sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column_name))
+                for column_name in updated_columns
+            )
+        )
+        if updated_columns
+        else sql.SQL("DO NOTHING")
+    )
+    cursor.execute(
+        sql.SQL(
+            "INSERT INTO {schema}.{table_name} ({columns})"
+            " SELECT {columns} FROM {temporary_schema}.{staging_table_name}"
+            " ON CONFLICT ({key_columns}) {conflict_action};"
+        ).format(
+            schema=sql.Identifier(schema),
+            table_name=sql.Identifier(table_name),
+            columns=columns,
+            temporary_schema=sql.Identifier(TEMPORARY_SCHEMA),
+            staging_table_name=sql.Identifier(staging_table_name),
+            key_columns=sql.SQL(", ").join(map(sql.Identifier, key_columns)),
+            conflict_action=conflict_action,
+        )
+    )
+    cursor.execute(
+        sql.SQL("DROP TABLE {temporary_schema}.{staging_table_name};").format(
+            temporary_schema=sql.Identifier(TEMPORARY_SCHEMA), staging_table_name=sql.Identifier(staging_table_name)
+        )
+    )
+
+
+def prepare_table(connection: Connection, cursor, table_write: TableWrite, schema: str):
+    # A missing table is created in the transaction of its first write, so that it is not left behind on failure,
+    # an existing one being truncated by its first write only
+    if not inspect(connection).has_table(table_name=table_write.table_name, schema=schema):
+        table_write.input_df.head(0).to_sql(name=table_write.table_name, con=connection, schema=schema, index=False)
+    elif table_write.write_mode == WRITE_MODE_TRUNCATE_THEN_APPEND:
+        cursor.execute(
+            sql.SQL("TRUNCATE TABLE {schema}.{table_name};").format(
+                schema=sql.Identifier(schema), table_name=sql.Identifier(table_write.table_name)
+            )
+        )
+
+
+def build_select_statement(
+    schema_name: str,
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    range_filter: Optional[Tuple[str, Any, Any]] = None,
+) -> Select:
+    # Names are quoted by SQLAlchemy and range bounds are bound as parameters, never formatted in the query
+    statement = select(*map(column, columns)) if columns else select(literal_column("*"))
+    statement = statement.select_from(table(table_name, schema=schema_name))
+    if range_filter is not None:
+        range_column, range_min, range_max = range_filter
+        statement = statement.where(column(range_column).between(range_min, range_max))
+    return statement
 
 
 def convert_composable_to_string(seq: Composed) -> str:
@@ -34,27 +125,6 @@ class PostgresDatabase(Database):
     def has_table(self, table_name: str, schema_name: str) -> bool:
         return self.inspect.has_table(table_name=table_name, schema=schema_name)
 
-    def upsert_maker(self, schema):
-        metadata_obj = MetaData(schema=schema)
-        metadata_obj.reflect(bind=self.engine)
-
-        def _upsert(table, conn, keys, data_iter):
-            upsert_args = {
-                "index_elements": [
-                    column.name
-                    for column in metadata_obj.tables[f"{metadata_obj.schema}.{table.name}"].columns
-                    if column.primary_key
-                ]
-            }
-            for data in data_iter:
-                data = {k: data[i] for i, k in enumerate(keys)}
-                upsert_args["set_"] = data
-                insert_stmt = insert(metadata_obj.tables[f"{metadata_obj.schema}.{table.name}"]).values(**data)
-                upsert_stmt = insert_stmt.on_conflict_do_update(**upsert_args)
-                conn.execute(upsert_stmt)
-
-        return _upsert
-
     def write_dataframe(self, input_df: pd.DataFrame, schema: str, table_name: str, write_mode: str, **kwargs):
         logging.info(f"Begin Writing to database: Schema:{schema}, Tablename:{table_name} in write_mode: {write_mode}!")
         if write_mode in [WRITE_MODE_REPLACE, WRITE_MODE_APPEND, "fail"]:
@@ -69,16 +139,8 @@ class PostgresDatabase(Database):
                 **kwargs,
             )
         elif write_mode == WRITE_MODE_UPSERT:
-            upsert_method = self.upsert_maker(schema=schema)
-            input_df.to_sql(
-                name=table_name,
-                con=self.engine,
-                schema=schema,
-                index=False,
-                method=upsert_method,
-                if_exists=WRITE_MODE_APPEND,
-                chunksize=CHUNKSIZE,
-                **kwargs,
+            self.write_table_dataframes(
+                [TableWrite(table_name=table_name, input_df=input_df, write_mode=write_mode)], schema=schema
             )
         elif write_mode == WRITE_MODE_TRUNCATE_THEN_APPEND:
             with self.engine.connect() as connection:
@@ -97,10 +159,58 @@ class PostgresDatabase(Database):
             )
         logging.info(f"End Writing: Schema:{schema}, Tablename:{table_name} in write_mode: {write_mode}!")
 
-    def read_dataframe(self, schema_name: str, table_name: str, query: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    def write_dataframes(self, input_dfs: Iterable[pd.DataFrame], table_name: str, schema: str, write_mode: str) -> int:
+        if write_mode not in [WRITE_MODE_APPEND, WRITE_MODE_TRUNCATE_THEN_APPEND]:
+            return super().write_dataframes(input_dfs, table_name=table_name, schema=schema, write_mode=write_mode)
+        return self.write_table_dataframes(
+            (TableWrite(table_name=table_name, input_df=input_df, write_mode=write_mode) for input_df in input_dfs),
+            schema=schema,
+        )
+
+    def write_table_dataframes(self, table_writes: Iterable[TableWrite], schema: str) -> int:
+        # Dataframes are written in a single transaction, so that a failing write or stream leaves every table as is
+        written_rows = 0
+        ready_table_names: Set[str] = set()
+        with self.engine.begin() as connection:
+            with connection.connection.cursor() as cursor:
+                for table_write in table_writes:
+                    if table_write.input_df.empty:
+                        continue
+                    if table_write.table_name not in ready_table_names:
+                        prepare_table(connection, cursor, table_write, schema=schema)
+                        ready_table_names.add(table_write.table_name)
+                    self.write_table_dataframe(connection, cursor, table_write, schema=schema)
+                    written_rows += len(table_write.input_df)
+        logging.info(f"End Writing {written_rows} rows: Schema:{schema}!")
+        return written_rows
+
+    def write_table_dataframe(self, connection: Connection, cursor, table_write: TableWrite, schema: str):
+        logging.info(
+            f"Writing {len(table_write.input_df)} rows: Schema:{schema}, Tablename:{table_write.table_name}"
+            f" in write_mode: {table_write.write_mode}"
+        )
+        if table_write.write_mode == WRITE_MODE_UPSERT:
+            upsert_dataframe(connection, cursor, table_write.input_df, schema=schema, table_name=table_write.table_name)
+        elif table_write.write_mode in [WRITE_MODE_APPEND, WRITE_MODE_TRUNCATE_THEN_APPEND]:
+            copy_dataframe(cursor, table_write.input_df, schema=schema, table_name=table_write.table_name)
+        else:
+            raise PostgresError(f"Write mode {table_write.write_mode} cannot be used along other writes")
+
+    def read_dataframe(
+        self,
+        schema_name: str,
+        table_name: str,
+        query: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        range_filter: Optional[Tuple[str, Any, Any]] = None,
+        **kwargs,
+    ) -> pd.DataFrame:
         if query is None:
             if not self.has_table(table_name, schema_name):
                 raise PostgresError(f"Table '{schema_name}.{table_name}' doesn't exist")
+            if columns is not None or range_filter is not None:
+                statement = build_select_statement(schema_name, table_name, columns=columns, range_filter=range_filter)
+                return pd.read_sql(statement, self.engine, **kwargs)
             composable = sql.SQL(""" SELECT * FROM {schema_name}.{table_name};""").format(
                 schema_name=sql.Literal(schema_name),
                 table_name=sql.Literal(table_name),
@@ -0,0 +1,5 @@
+from ._classes import SimulatedRemoteFileSystem
+
+__all__ = [
+    "SimulatedRemoteFileSystem",
+]
@@ -0,0 +1,108 @@
+import collections
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from py_project.domain.adapters.filesystem import FileDetails, FileSystem
+
+
+class _ThrottledFile:
+    def __init__(self, file: Any, throttle_fn: Callable[[int], None]):
+        self.file = file
+        self.throttle_fn = throttle_fn
+
+    def read(self, *args) -> Any:
+        data = self.file.read(*args)
+        self.throttle_fn(len(data))
+        return data
+
+    def write(self, data: Any) -> int:
+        self.throttle_fn(len(data))
+        return self.file.write(data)
+
+    def __iter__(self):
+        for line in self.file:
+            self.throttle_fn(len(line))
+            yield line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.file.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.file, name)
+
+
+class SimulatedRemoteFileSystem(FileSystem):
+    """Wraps a file system with a per request latency and a bandwidth limit, to benchmark remote storage offline"""
+
+    def __init__(
+        self,
+        file_system: FileSystem,
+        latency_seconds: float = 0.0,
+        bandwidth_bytes_per_second: Optional[float] = None,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ):
+        self.file_system = file_system
+        self.latency_seconds = latency_seconds
+        self.bandwidth_bytes_per_second = bandwidth_bytes_per_second
+        self.sleep_fn = sleep_fn
+        self.round_trip_counts: Dict[str, int] = collections.Counter()
+        self.transferred_bytes = 0
+
+    def request(self, operation: str):
+        self.round_trip_counts[operation] += 1
+        if self.latency_seconds > 0:
+            self.sleep_fn(self.latency_seconds)
+
+    def transfer(self, byte_count: int):
+        self.transferred_bytes += byte_count
+        if self.bandwidth_bytes_per_second is not None and byte_count > 0:
+            self.sleep_fn(byte_count / self.bandwidth_bytes_per_second)
+
+    def get_round_trip_count(self) -> int:
+        return sum(self.round_trip_counts.values())
+
+    def exists(self, path: str) -> bool:
+        self.request("exists")
+        return self.file_system.exists(path)
+
+    def ls(self, folder: str) -> List[str]:
+        self.request("ls")
+        return self.file_system.ls(folder)
+
+    def iter_file_details(self, folder: str, recursive: bool = False, prefix: str = "") -> Iterator[FileDetails]:
+        self.request("list_page")
+        yield from self.file_system.iter_file_details(folder, recursive=recursive, prefix=prefix)
+
+    def mkdir(self, folder_name: str):
+        self.request("mkdir")
+        return self.file_system.mkdir(folder_name)
+
+    def isdir(self, folder_path: str) -> bool:
+        self.request("isdir")
+        return self.file_system.isdir(folder_path)
+
+    def open(self, file_path: str, mode: str):
+        self.request("open")
+        return _ThrottledFile(self.file_system.open(file_path, mode), throttle_fn=self.transfer)
+
+    def mv(self, source_path: str, dest_path: str):
+        self.request("mv")
+        return self.file_system.mv(source_path, dest_path)
+
+    # Dataframes are read and written through open, so that their bytes go through the bandwidth limit
+    def read_csv(self, file_path: str, skiprows: int = 0, **kwargs) -> Optional[pd.DataFrame]:
+        with self.open(file_path, "rb") as f:
+            return pd.read_csv(f, skiprows=skiprows, **kwargs)
+
+    def write_parquet(self, input_df: pd.DataFrame, file_path: str, **kwargs):
+        with self.open(file_path, "wb") as f:
+            return input_df.to_parquet(f, **kwargs)
+
+    def read_parquet(self, file_path: str, **kwargs):
+        with self.open(file_path, "rb") as f:
+            return pd.read_parquet(f, **kwargs)
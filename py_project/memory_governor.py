@@ -0,0 +1,77 @@
+import os
+import resource
+import sys
+import typing
+
+import psutil
+
+from py_project.config import functions_config
+from py_project.logger import logger
+
+T = typing.TypeVar("T")
+
+CGROUP_MEMORY_LIMIT_FILE_PATHS = [
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+]
+
+
+def get_rss_bytes() -> int:
+    return psutil.Process(os.getpid()).memory_info().rss
+
+
+def get_peak_rss_bytes() -> int:
+    # High-water mark of the process, so that memory freed before it is sampled is still accounted for
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def get_memory_limit_bytes() -> int:
+    # Containers are usually limited below the host memory, which is what psutil reports
+    total_memory_bytes = psutil.virtual_memory().total
+    for file_path in CGROUP_MEMORY_LIMIT_FILE_PATHS:
+        try:
+            with open(file_path) as f:
+                limit = f.read().strip()
+        except OSError:
+            continue
+        if limit.isdigit():
+            return min(int(limit), total_memory_bytes)
+    return total_memory_bytes
+
+
+class MemoryGovernor:
+    def __init__(
+        self,
+        max_usage_fraction: float = functions_config.MEMORY_MAX_USAGE_FRACTION,
+        memory_limit_bytes: typing.Optional[int] = None,
+    ):
+        memory_limit_bytes = memory_limit_bytes if memory_limit_bytes is not None else get_memory_limit_bytes()
+        self.memory_budget_bytes = int(max_usage_fraction * memory_limit_bytes)
+
+    def get_available_bytes(self) -> int:
+        return max(0, self.memory_budget_bytes - get_rss_bytes())
+
+    def fits(self, estimated_bytes: int) -> bool:
+        return estimated_bytes <= self.get_available_bytes()
+
+    def iter_groups(self, items: typing.List[T], estimated_bytes: typing.List[int]) -> typing.Iterator[typing.List[T]]:
+        # Groups are made lazily, so that each one fits the memory left once the previous one was processed
+        item_index = 0
+        while item_index < len(items):
+            available_bytes = self.get_available_bytes()
+            group = [items[item_index]]
+            group_bytes = estimated_bytes[item_index]
+            item_index += 1
+            while item_index < len(items) and group_bytes + estimated_bytes[item_index] <= available_bytes:
+                group.append(items[item_index])
+                group_bytes += estimated_bytes[item_index]
+                item_index += 1
+            if group_bytes > available_bytes:
+                logger.warning(
+                    f"Processing an item estimated to {group_bytes} bytes while {available_bytes} bytes are available"
+                )
+            elif len(group) < len(items):
+                logger.info(f"Memory pressure: processing {len(group)} items out of {len(items)} at once")
+            yield group
@@ -0,0 +1,181 @@
+import cProfile
+import collections
+import datetime
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+import types
+import typing
+
+import wrapt
+from decouple import config
+
+from py_project.config import filesystem_config, functions_config
+from py_project.logger import logger
+
+
+def parse_comma_separated_list(value: str) -> typing.List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def get_enabled_profiling_modes(profiling_env_value: str) -> typing.List[str]:
+    profiling_modes = [profiling_mode.lower() for profiling_mode in parse_comma_separated_list(profiling_env_value)]
+    unknown_profiling_modes = [mode for mode in profiling_modes if mode not in functions_config.PROFILING_MODES]
+    if unknown_profiling_modes:
+        # A typo in a diagnostic setting should not fail the activities
+        logger.warning(
+            f"Ignored unknown profiling modes {unknown_profiling_modes}, use {functions_config.PROFILING_MODES}"
+        )
+    return [mode for mode in functions_config.PROFILING_MODES if mode in profiling_modes]
+
+
+# Settings are read once per worker, so that a disabled profiler costs a single check per call
+ENABLED_PROFILING_MODES = get_enabled_profiling_modes(str(config(functions_config.PROFILING_ENV_VARIABLE, "")))
+PROFILING_TARGETS = parse_comma_separated_list(str(config(functions_config.PROFILING_TARGETS_ENV_VARIABLE, "")))
+
+# cProfile, tracemalloc and the sampler are process wide, so that only one invocation is profiled at a time
+_profiling_lock = threading.Lock()
+
+
+class WallClockSampler:
+    """Samples the stacks of every thread at a fixed interval, time spent waiting on I/O or locks included"""
+
+    def __init__(self, interval_seconds: float = functions_config.PROFILING_SAMPLING_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.stack_counts: typing.Counter[str] = collections.Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+
+    @staticmethod
+    def format_stack(thread_name: str, frame: typing.Optional[types.FrameType]) -> str:
+        frame_names = []
+        while frame is not None:
+            frame_names.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        # Stacks are collapsed from the root, as expected by flame graph tools
+        return ";".join([thread_name.replace(" ", "_")] + frame_names[::-1])
+
+    def sample(self):
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != self._thread.ident:
+                self.stack_counts[self.format_stack(thread_names.get(thread_id, str(thread_id)), frame)] += 1
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            self.sample()
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def to_collapsed_stacks(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stack_counts.most_common())
+
+
+class InvocationProfiler:
+    """Profiles one invocation with the enabled modes and writes a report per mode in the profiles folder"""
+
+    def __init__(self, name: str, profiling_modes: typing.List[str]):
+        self.name = name
+        self.profiling_modes = profiling_modes
+        self._profile: typing.Optional[cProfile.Profile] = None
+        self._sampler: typing.Optional[WallClockSampler] = None
+        self._tracemalloc_started = False
+        self._tracemalloc_snapshot: typing.Optional[tracemalloc.Snapshot] = None
+        self._tracemalloc_peak_bytes = 0
+
+    def start(self):
+        if functions_config.PROFILING_MODE_TRACEMALLOC in self.profiling_modes and not tracemalloc.is_tracing():
+            tracemalloc.start(functions_config.PROFILING_TRACEMALLOC_FRAMES)
+            self._tracemalloc_started = True
+        if functions_config.PROFILING_MODE_SAMPLING in self.profiling_modes:
+            self._sampler = WallClockSampler()
+            self._sampler.start()
+        if functions_config.PROFILING_MODE_CPROFILE in self.profiling_modes:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if tracemalloc.is_tracing() and functions_config.PROFILING_MODE_TRACEMALLOC in self.profiling_modes:
+            self._tracemalloc_snapshot = tracemalloc.take_snapshot()
+            self._tracemalloc_peak_bytes = tracemalloc.get_traced_memory()[1]
+            if self._tracemalloc_started:
+                tracemalloc.stop()
+
+    def get_report_file_path_prefix(self) -> str:
+        report_time = datetime.datetime.today().strftime("%Y%m%d-%H%M%S-%f")
+        return f"{filesystem_config.PROFILES_FOLDER}/{self.name}_{report_time}_{os.getpid()}"
+
+    def format_cprofile_report(self) -> str:
+        report = io.StringIO()
+        pstats.Stats(self._profile, stream=report).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            functions_config.PROFILING_REPORT_TOP_N
+        )
+        return report.getvalue()
+
+    def format_tracemalloc_report(self) -> str:
+        statistics = self._tracemalloc_snapshot.statistics("lineno")
+        lines = [f"Peak traced memory: {self._tracemalloc_peak_bytes} B"]
+        lines += [str(statistic) for statistic in statistics[: functions_config.PROFILING_REPORT_TOP_N]]
+        return "\n".join(lines) + "\n"
+
+    def write_reports(self) -> typing.List[str]:
+        os.makedirs(filesystem_config.PROFILES_FOLDER, exist_ok=True)
+        report_file_path_prefix = self.get_report_file_path_prefix()
+        reports: typing.Dict[str, str] = {}
+        if self._profile is not None:
+            self._profile.dump_stats(f"{report_file_path_prefix}.prof")
+            reports[f"{report_file_path_prefix}_cprofile.txt"] = self.format_cprofile_report()
+        if self._tracemalloc_snapshot is not None:
+            reports[f"{report_file_path_prefix}_tracemalloc.txt"] = self.format_tracemalloc_report()
+        if self._sampler is not None:
+            reports[f"{report_file_path_prefix}_sampling.txt"] = self._sampler.to_collapsed_stacks()
+        for report_file_path, report in reports.items():
+            with open(report_file_path, "w") as f:
+                f.write(report)
+        report_file_paths = ([f"{report_file_path_prefix}.prof"] if self._profile is not None else []) + list(reports)
+        logger.info(f"Profiling reports of {self.name} written to {report_file_paths}")
+        return report_file_paths
+
+
+def is_profiling_target(name: str) -> bool:
+    return not PROFILING_TARGETS or any(target in name for target in PROFILING_TARGETS)
+
+
+@wrapt.decorator
+def profile_invocation(
+    wrapped_fn: types.FunctionType,
+    instance: typing.Union[None, typing.Any],
+    args: typing.Tuple[typing.Any, ...],
+    kwargs: typing.Dict[str, typing.Any],
+):
+    if not ENABLED_PROFILING_MODES:
+        return wrapped_fn(*args, **kwargs)
+    name = f"{wrapped_fn.__module__}.{wrapped_fn.__qualname__}"
+    # Nested profiled calls are covered by the outermost one
+    if not is_profiling_target(name) or not _profiling_lock.acquire(blocking=False):
+        return wrapped_fn(*args, **kwargs)
+    try:
+        profiler = InvocationProfiler(name, ENABLED_PROFILING_MODES)
+        profiler.start()
+        try:
+            return wrapped_fn(*args, **kwargs)
+        finally:
+            profiler.stop()
+            try:
+                profiler.write_reports()
+            except OSError as error:
+                logger.warning(f"Could not write profiling reports of {name}: {error}")
+    finally:
+        _profiling_lock.release()
@@ -0,0 +1,46 @@
+import time
+
+import pandas as pd
+
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
+from py_project.infrastructure.simulated_remote_filesystem import SimulatedRemoteFileSystem
+
+LATENCY_SECONDS = 0.02
+BANDWIDTH_BYTES_PER_SECOND = 50 * 1024 * 1024
+FILE_COUNT = 40
+ROW_COUNT = 10_000
+
+
+def bench_write_files():
+    input_dfs = {
+        f"/container/normalized/file_{index:03d}.parquet": pd.DataFrame({"value": range(ROW_COUNT)})
+        for index in range(FILE_COUNT)
+    }
+    for max_workers in [1, 4, 16]:
+        file_system = SimulatedRemoteFileSystem(
+            InMemoryFileSystem(), latency_seconds=LATENCY_SECONDS, bandwidth_bytes_per_second=BANDWIDTH_BYTES_PER_SECOND
+        )
+        start_time = time.perf_counter()
+        FileHandler(file_system).write_files(input_dfs, max_workers=max_workers)
+        print(
+            f"write_files max_workers={max_workers:<3} {time.perf_counter() - start_time:.3f} s "
+            f"({file_system.get_round_trip_count()} requests, {file_system.transferred_bytes} bytes)"
+        )
+
+
+def bench_latest_file_lookup():
+    file_system = SimulatedRemoteFileSystem(InMemoryFileSystem(), latency_seconds=LATENCY_SECONDS)
+    for index in range(FILE_COUNT):
+        with file_system.file_system.open(f"/container/raw/file_{index:03d}.csv", "wb") as f:
+            f.write(b"a,b\n")
+    start_time = time.perf_counter()
+    FileHandler(file_system).get_file_paths_in_folder("/container/raw", only_latest_file=True)
+    print(
+        f"latest file lookup {time.perf_counter() - start_time:.3f} s ({file_system.get_round_trip_count()} requests)"
+    )
+
+
+if __name__ == "__main__":
+    bench_write_files()
+    bench_latest_file_lookup()
@@ -0,0 +1,82 @@
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from py_project.domain.entities import weather_data_handler
+from py_project.domain.entities.wind_power import (
+    CELSIUS_TO_KELVIN,
+    DRY_AIR_SPECIFIC_GAS_CONSTANT,
+    KMH_TO_MS,
+    MBAR_TO_PA,
+    STANDARD_AIR_DENSITY_KG_M3,
+    TurbinePowerCurve,
+    compute_wind_power_kw,
+    get_turbine_power_curve,
+)
+
+ROW_COUNTS = [10_000, 100_000, 1_000_000]
+
+
+def compute_wind_power_kw_per_row(row: pd.Series, power_curve: TurbinePowerCurve) -> float:
+    air_density = (row[weather_data_handler.WEATHER_PRESSURE_COLUMN_NAME] * MBAR_TO_PA) / (
+        DRY_AIR_SPECIFIC_GAS_CONSTANT * (row[weather_data_handler.WEATHER_TEMPERATURE_COLUMN_NAME] + CELSIUS_TO_KELVIN)
+    )
+    if not air_density > 0:
+        air_density = STANDARD_AIR_DENSITY_KG_M3
+    wind_speed_ms = row[weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME] * KMH_TO_MS
+    wind_speed_ms *= math.pow(air_density / STANDARD_AIR_DENSITY_KG_M3, 1 / 3)
+    if wind_speed_ms < power_curve.cut_in_speed_ms or wind_speed_ms >= power_curve.cut_out_speed_ms:
+        return 0.0
+    if wind_speed_ms >= power_curve.rated_speed_ms:
+        return power_curve.rated_power_kw
+    points = list(zip(power_curve.wind_speeds_ms, power_curve.powers_kw))
+    for (lower_speed, lower_power), (upper_speed, upper_power) in zip(points, points[1:]):
+        if lower_speed <= wind_speed_ms <= upper_speed:
+            return lower_power + (upper_power - lower_power) * (wind_speed_ms - lower_speed) / (
+                upper_speed - lower_speed
+            )
+    return power_curve.powers_kw[-1]
+
+
+def generate_metrics_df(row_count: int) -> pd.DataFrame:
+    random_generator = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME: random_generator.uniform(0.0, 100.0, row_count),
+            weather_data_handler.WEATHER_TEMPERATURE_COLUMN_NAME: random_generator.uniform(-10.0, 35.0, row_count),
+            weather_data_handler.WEATHER_PRESSURE_COLUMN_NAME: random_generator.uniform(980.0, 1040.0, row_count),
+        }
+    )
+
+
+def bench_wind_power():
+    power_curve = get_turbine_power_curve()
+    for row_count in ROW_COUNTS:
+        metrics_df = generate_metrics_df(row_count)
+
+        start_time = time.perf_counter()
+        vectorized_wind_power_kw = compute_wind_power_kw(
+            wind_speed_kmh=metrics_df[weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME].to_numpy(),
+            temperature_c=metrics_df[weather_data_handler.WEATHER_TEMPERATURE_COLUMN_NAME].to_numpy(),
+            pressure_mbar=metrics_df[weather_data_handler.WEATHER_PRESSURE_COLUMN_NAME].to_numpy(),
+            power_curve=power_curve,
+        )
+        vectorized_duration = time.perf_counter() - start_time
+
+        # The per row implementation is only run on a sample, its duration being extrapolated
+        sample_df = metrics_df.head(10_000)
+        start_time = time.perf_counter()
+        per_row_wind_power_kw = sample_df.apply(compute_wind_power_kw_per_row, axis=1, power_curve=power_curve)
+        per_row_duration = (time.perf_counter() - start_time) * row_count / len(sample_df)
+
+        np.testing.assert_allclose(vectorized_wind_power_kw[: len(sample_df)], per_row_wind_power_kw.to_numpy())
+        print(
+            f"wind power rows={row_count:<9} vectorized {vectorized_duration:.3f} s, "
+            f"per row ~{per_row_duration:.3f} s (x{per_row_duration / vectorized_duration:.0f})"
+        )
+
+
+if __name__ == "__main__":
+    bench_wind_power()
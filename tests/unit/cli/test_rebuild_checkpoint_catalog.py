@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from py_project.cli.rebuild_checkpoint_catalog import main
+from py_project.infrastructure.functions_orchestrator_state_service import (
+    FunctionsOrchestratorJsonLinesStateService,
+)
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+
+TESTED_MODULE = "py_project.cli.rebuild_checkpoint_catalog"
+
+
+class TestRebuildCheckpointCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_folder_path = self.tmp_dir.name
+        self.data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "infrastructure", "data")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_main_should_rebuild_catalog_and_index(self):
+        # Given
+        given_base_name = "GIVEN_BASE"
+        shutil.copy(os.path.join(self.data_path, "logs", "logs_sample.json"), self.log_folder_path)
+        with open(f"{self.log_folder_path}/LOG_20210101.jsonl", "w") as f:
+            f.write(
+                '{"executionTime": 1.0, "base": "GIVEN_BASE", "mode": "FULL", "status": "task COMPLETED", '
+                '"stateProcessingItems": [], "jobId": "given_job_id", "posts": {}}\n'
+            )
+        given_mapping = {given_base_name: {"ORCHESTRATOR_LOG_FOLDER": self.log_folder_path}}
+
+        # When
+        with patch(f"{TESTED_MODULE}.filesystem_config.ORCHESTRATOR_LOG_MAPPING", given_mapping):
+            exit_code = main(["--base", given_base_name])
+
+        # Then
+        assert exit_code == 0
+        assert os.path.exists(f"{self.log_folder_path}/_index.json")
+        assert not os.path.exists(f"{self.log_folder_path}/_checkpoints.json")
+        with patch.object(FunctionsOrchestratorJsonLinesStateService, "read_state_file") as mock_read_state_file:
+            last_state = FunctionsOrchestratorJsonLinesStateService(LocalFileSystem()).get_last_state_given_status(
+                self.log_folder_path, "task COMPLETED", base=given_base_name
+            )
+        assert last_state.job_id == "given_job_id"
+        mock_read_state_file.assert_not_called()
@@ -0,0 +1,69 @@
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from py_project.cli.summarize_throughput import main, summarize_throughput
+
+TESTED_MODULE = "py_project.cli.summarize_throughput"
+
+
+def get_state_line(job_id: str, execution_time: float, status: str, step_name: str, seconds: float, metrics: dict):
+    processing_item = {
+        "stepName": step_name,
+        "startTime": execution_time,
+        "endTime": execution_time + seconds,
+        "inputs": [],
+        "outputs": [],
+        "posts": {},
+        "metrics": metrics,
+    }
+    state = {
+        "executionTime": execution_time,
+        "base": "GIVEN_BASE",
+        "mode": "FULL",
+        "status": status,
+        "stateProcessingItems": [processing_item],
+        "jobId": job_id,
+        "posts": {},
+    }
+    return f"{json.dumps(state)}\n"
+
+
+class TestSummarizeThroughput(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_folder_path = self.tmp_dir.name
+        self.given_mapping = {"GIVEN_BASE": {"ORCHESTRATOR_LOG_FOLDER": self.log_folder_path}}
+        with open(f"{self.log_folder_path}/LOG_20210101.jsonl", "w") as f:
+            f.write(get_state_line("job_1", 1.0, "task COMPLETED", "task", 2.0, {"rows_out": 10, "read_seconds": 1.0}))
+            f.write(get_state_line("job_1", 3.0, "orchestrator COMPLETED", "task", 2.0, {"rows_out": 10}))
+        with open(f"{self.log_folder_path}/LOG_20210102.jsonl", "w") as f:
+            f.write(get_state_line("job_2", 5.0, "task STARTED", "task", 0.0, {}))
+            f.write(get_state_line("job_2", 6.0, "task COMPLETED", "task", 2.0, {"rows_out": 15}))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_summarize_throughput_should_trend_rows_per_second_of_completed_tasks(self):
+        # When
+        with patch(f"{TESTED_MODULE}.filesystem_config.ORCHESTRATOR_LOG_MAPPING", self.given_mapping):
+            summary_df = summarize_throughput(["GIVEN_BASE"])
+
+        # Then
+        assert summary_df["jobId"].tolist() == ["job_1", "job_2"]
+        assert summary_df["rows_per_second"].tolist() == [5.0, 7.5]
+        assert summary_df["rows_per_second_change"].tolist()[1] == 0.5
+        assert summary_df["read_seconds"].tolist()[0] == 1.0
+        assert "write_seconds" not in summary_df.columns
+
+    def test_main_should_print_summary(self):
+        # When
+        with patch(f"{TESTED_MODULE}.filesystem_config.ORCHESTRATOR_LOG_MAPPING", self.given_mapping), patch(
+            "builtins.print"
+        ) as mock_print:
+            exit_code = main(["--base", "GIVEN_BASE", "--step", "task"])
+
+        # Then
+        assert exit_code == 0
+        assert "job_2" in mock_print.call_args[0][0]
@@ -71,6 +71,22 @@ class TestProcessingItem(unittest.TestCase):
         # Then
         assert self.processing_item.outputs == expected_outputs
 
+    def test_add_metrics(self):
+        # When
+        self.processing_item.add_metrics({"duplicate_rows": 2})
+        self.processing_item.add_metrics({"duplicate_rows": 3, "rows": 1})
+
+        # Then
+        assert self.processing_item.metrics == {"duplicate_rows": 5, "rows": 1}
+
+    def test_add_metrics_should_keep_the_max_of_peaks(self):
+        # When
+        self.processing_item.add_metrics({"peak_rss_bytes": 3, "read_seconds": 1.0})
+        self.processing_item.add_metrics({"peak_rss_bytes": 2, "read_seconds": 0.5})
+
+        # Then
+        assert self.processing_item.metrics == {"peak_rss_bytes": 3, "read_seconds": 1.5}
+
     @patch(f"{TESTED_MODULE}.time")
     def test_processing_done(self, mock_time):
         mock_time.return_value = 2.0
@@ -107,7 +123,7 @@ class TestProcessingItem(unittest.TestCase):
         expected_json_result = (
             '{"stepName": "step_name", "startTime": 0.0, "endTime": 1.0,'
             ' "inputs": ["input_file"], "outputs": ["output_file"],'
-            ' "posts": {"task_name": {"file_paths": ["path/to_file"]}}}'
+            ' "posts": {"task_name": {"file_paths": ["path/to_file"]}}, "metrics": {}}'
         )
         # When
         json_result = ProcessingItem.to_json(given_processing_item)
@@ -168,6 +184,35 @@ class TestProcessingItem(unittest.TestCase):
         # Then
         assert result == given_post_value
 
+    def test_merge(self):
+        # Given
+        given_step_name = "step_name"
+        given_recipient = "given_recipient"
+        given_processing_item_a = ProcessingItem(
+            step_name=given_step_name, start_time=1.0, end_time=3.0, inputs=["input_a"], outputs=["output_a"]
+        )
+        given_processing_item_a.posts = {given_recipient: {"file_paths": ["output_a"]}}
+        given_processing_item_b = ProcessingItem(
+            step_name=given_step_name, start_time=0.0, end_time=2.0, inputs=["input_b"], outputs=["output_b"]
+        )
+        given_processing_item_b.posts = {given_recipient: {"file_paths": ["output_b"]}}
+        given_processing_item_a.add_metrics({"duplicate_rows": 1})
+        given_processing_item_b.add_metrics({"duplicate_rows": 2})
+
+        # When
+        merged_item = ProcessingItem.merge(
+            step_name=given_step_name, processing_items=[given_processing_item_a, given_processing_item_b]
+        )
+
+        # Then
+        assert merged_item.step_name == given_step_name
+        assert merged_item.start_time == 0.0
+        assert merged_item.end_time == 3.0
+        assert merged_item.inputs == ["input_a", "input_b"]
+        assert merged_item.outputs == ["output_a", "output_b"]
+        assert merged_item.posts == {given_recipient: {"file_paths": ["output_a", "output_b"]}}
+        assert merged_item.metrics == {"duplicate_rows": 3}
+
 
 class TestOrchestratorState(unittest.TestCase):
     def setUp(self):
@@ -274,6 +319,25 @@ class TestOrchestratorState(unittest.TestCase):
         # Then
         assert orchestrator_state.job_id == expected_job_id
 
+    def test_from_dict(self):
+        # Given
+        given_state_dict = {
+            "executionTime": 0,
+            "base": "given_base",
+            "mode": "given_mode",
+            "status": "given_status",
+            "stateProcessingItems": [{"stepName": "given_step_name", "startTime": 0.0, "endTime": 1.0}],
+            "jobId": "given_job_id",
+            "posts": {"given_recipient": {"given_object": "message"}},
+        }
+        # When
+        orchestrator_state = OrchestratorState.from_dict(given_state_dict)
+        # Then
+        assert orchestrator_state.job_id == "given_job_id"
+        assert orchestrator_state.state_processing_items[0].step_name == "given_step_name"
+        assert orchestrator_state.state_processing_items[0].end_time == 1.0
+        assert orchestrator_state.posts == {"given_recipient": {"given_object": "message"}}
+
     def test_update_state(self):
         # Given
         given_execution_time = 3.0
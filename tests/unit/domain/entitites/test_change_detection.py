@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from py_project.domain.entities.change_detection import (
+    ROW_HASH_COLUMN_NAME,
+    add_row_hashes,
+    split_new_and_changed_rows,
+)
+
+
+class TestChangeDetection(unittest.TestCase):
+    def test_add_row_hashes_should_only_depend_on_hashed_columns(self):
+        # Given
+        given_df = pd.DataFrame({"timestamp": [1, 2, 3], "value": [1.0, 1.0, 2.0]})
+
+        # When
+        hashed_df = add_row_hashes(given_df, hashed_columns=["value"])
+
+        # Then
+        assert hashed_df[ROW_HASH_COLUMN_NAME].dtype == np.int64
+        assert hashed_df[ROW_HASH_COLUMN_NAME].iloc[0] == hashed_df[ROW_HASH_COLUMN_NAME].iloc[1]
+        assert hashed_df[ROW_HASH_COLUMN_NAME].iloc[0] != hashed_df[ROW_HASH_COLUMN_NAME].iloc[2]
+        assert ROW_HASH_COLUMN_NAME not in given_df.columns
+
+    def test_split_new_and_changed_rows(self):
+        # Given
+        given_df = add_row_hashes(
+            pd.DataFrame({"timestamp": [1, 2, 3], "value": [1.0, 2.0, 3.0]}, index=[10, 11, 12]),
+            hashed_columns=["value"],
+        )
+        given_stored_df = pd.DataFrame(
+            {
+                "timestamp": [1, 2, 2],
+                ROW_HASH_COLUMN_NAME: [given_df[ROW_HASH_COLUMN_NAME].iloc[0], 0, 0],
+            }
+        )
+
+        # When
+        new_df, changed_df = split_new_and_changed_rows(given_df, given_stored_df, key_columns=["timestamp"])
+
+        # Then
+        assert new_df["timestamp"].tolist() == [3]
+        assert changed_df["timestamp"].tolist() == [2]
+        assert changed_df.index.tolist() == [11]
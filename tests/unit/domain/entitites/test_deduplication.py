@@ -0,0 +1,73 @@
+import unittest
+
+import pandas as pd
+import pytest
+
+from py_project.config import functions_config
+from py_project.domain.entities.deduplication import (
+    KeyDeduplicator,
+    RankedKeyDeduplicator,
+    UnknownDeduplicationPolicyError,
+    order_files_for_deduplication,
+)
+
+
+class TestDeduplication(unittest.TestCase):
+    def test_order_files_for_deduplication(self):
+        assert order_files_for_deduplication(["a", "b"], functions_config.DEDUPLICATION_POLICY_FIRST_SEEN) == ["a", "b"]
+        assert order_files_for_deduplication(["a", "b"], functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS) == [
+            "b",
+            "a",
+        ]
+        with pytest.raises(UnknownDeduplicationPolicyError):
+            order_files_for_deduplication(["a", "b"], "UNKNOWN")
+
+    def test_drop_seen_should_keep_first_occurrence_of_keys_across_chunks(self):
+        # Given
+        deduplicator = KeyDeduplicator(key_columns=["timestamp", "station"])
+        given_chunks = [
+            pd.DataFrame({"timestamp": [3, 1, 3], "station": ["a", "a", "a"], "value": [0, 1, 2]}),
+            pd.DataFrame({"timestamp": [1, 2, 1], "station": ["a", "a", "b"], "value": [3, 4, 5]}),
+            pd.DataFrame({"timestamp": [], "station": [], "value": []}),
+        ]
+
+        # When
+        deduplicated_chunks = [deduplicator.drop_seen(given_chunk) for given_chunk in given_chunks]
+
+        # Then
+        assert [chunk["value"].tolist() for chunk in deduplicated_chunks] == [[0, 1], [4, 5], []]
+        assert deduplicator.duplicate_rows == 2
+        assert deduplicator.seen_keys == 4
+
+    def test_drop_outranked_should_keep_rows_of_winning_files_across_chunks(self):
+        # Given
+        deduplicator = RankedKeyDeduplicator(
+            key_columns=["timestamp"], policy=functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS
+        )
+        given_chunks = [
+            pd.DataFrame({"timestamp": [1, 2, 2], "source_file_rank": [2, 0, 1], "value": [0, 1, 2]}),
+            pd.DataFrame({"timestamp": [1, 2, 3], "source_file_rank": [1, 3, 0], "value": [3, 4, 5]}),
+        ]
+
+        # When
+        deduplicated_chunks = [deduplicator.drop_outranked(given_chunk) for given_chunk in given_chunks]
+
+        # Then
+        assert [chunk["value"].tolist() for chunk in deduplicated_chunks] == [[0, 2], [4, 5]]
+        assert deduplicator.outranked_rows == 2
+        assert deduplicator.seen_keys == 3
+
+    def test_drop_outranked_under_first_seen_policy_should_keep_rows_of_first_files(self):
+        # Given
+        deduplicator = RankedKeyDeduplicator(
+            key_columns=["timestamp"], policy=functions_config.DEDUPLICATION_POLICY_FIRST_SEEN
+        )
+
+        # When
+        deduplicated_dfs = [
+            deduplicator.drop_outranked(pd.DataFrame({"timestamp": [1], "source_file_rank": [1], "value": [0]})),
+            deduplicator.drop_outranked(pd.DataFrame({"timestamp": [1], "source_file_rank": [0], "value": [1]})),
+        ]
+
+        # Then
+        assert [df["value"].tolist() for df in deduplicated_dfs] == [[0], [1]]
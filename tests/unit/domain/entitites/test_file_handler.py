@@ -0,0 +1,217 @@
+import asyncio
+import io
+import tempfile
+import unittest
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+
+import pandas as pd
+import pytest
+
+from py_project.domain.adapters.async_filesystem import AsyncFileSystem
+from py_project.domain.adapters.filesystem import FileDetails
+from py_project.domain.entities.file_handler import FileHandler, MissingAsyncFileSystemError
+from py_project.infrastructure.local_filesystem import AsyncLocalFileSystem, LocalFileSystem
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
+
+TESTED_MODULE = "py_project.domain.entities.file_handler"
+
+
+class GivenSlowAsyncFileSystem(AsyncFileSystem):
+    def __init__(self):
+        self.in_flight_requests = 0
+        self.max_in_flight_requests = 0
+
+    async def ls(self, folder: str) -> List[str]:
+        return []
+
+    async def exists(self, file_path: str) -> bool:
+        return True
+
+    async def read_bytes(self, file_path: str) -> bytes:
+        self.in_flight_requests += 1
+        self.max_in_flight_requests = max(self.max_in_flight_requests, self.in_flight_requests)
+        await asyncio.sleep(0.01)
+        self.in_flight_requests -= 1
+        return f"value\n{file_path}\n".encode("utf-8")
+
+    async def write_bytes(self, file_path: str, data: bytes):
+        pass
+
+
+class TestFileHandler(unittest.TestCase):
+    def test_get_file_paths_in_folder_should_stream_listing_for_latest_file(self):
+        # Given
+        given_file_system = MagicMock()
+        given_file_system.iter_files.return_value = iter(
+            FileDetails(path=f"folder/file_{index:03d}.csv", size=0, last_modified=0.0) for index in range(100)
+        )
+        given_file_handler = FileHandler(given_file_system)
+
+        # When
+        file_paths = given_file_handler.get_file_paths_in_folder("folder", only_latest_file=True)
+
+        # Then
+        assert file_paths == ["folder/file_099.csv"]
+        given_file_system.ls.assert_not_called()
+
+    def test_get_file_paths_in_folder_should_return_no_latest_file_for_empty_folder(self):
+        # Given
+        given_file_system = MagicMock()
+        given_file_system.iter_files.return_value = iter([])
+
+        # When
+        file_paths = FileHandler(given_file_system).get_file_paths_in_folder("folder", only_latest_file=True)
+
+        # Then
+        assert file_paths == []
+
+    def test_write_then_read_files_async(self):
+        # Given
+        given_file_handler = FileHandler(LocalFileSystem(), async_filesystem=AsyncLocalFileSystem())
+        with tempfile.TemporaryDirectory() as given_folder_path:
+            given_input_dfs = {
+                f"{given_folder_path}/file_{index}.parquet": pd.DataFrame({"value": [index, index]})
+                for index in range(5)
+            }
+
+            # When
+            written_file_paths = asyncio.run(given_file_handler.write_files_async(given_input_dfs))
+            output_df = asyncio.run(given_file_handler.read_files_async(written_file_paths, file_type="PARQUET"))
+
+        # Then
+        assert written_file_paths == list(given_input_dfs.keys())
+        assert output_df["value"].tolist() == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+
+    def test_read_files_async_should_read_feather_files(self):
+        # Given
+        given_file_handler = FileHandler(LocalFileSystem(), async_filesystem=AsyncLocalFileSystem())
+        with tempfile.TemporaryDirectory() as given_folder_path:
+            given_file_paths = [f"{given_folder_path}/file_{index}.arrow" for index in range(3)]
+            for index, given_file_path in enumerate(given_file_paths):
+                given_file_handler.write_file(
+                    pd.DataFrame({"value": [index, index]}), file_path=given_file_path, file_type="FEATHER"
+                )
+
+            # When
+            output_df = asyncio.run(given_file_handler.read_files_async(given_file_paths, file_type="FEATHER"))
+
+        # Then
+        assert output_df["value"].tolist() == [0, 0, 1, 1, 2, 2]
+
+    def test_read_file_async_should_read_feather_file_through_read_bytes(self):
+        # Given
+        given_async_filesystem = GivenSlowAsyncFileSystem()
+        given_buffer = io.BytesIO()
+        pd.DataFrame({"value": [1.5, 2.5]}).to_feather(given_buffer)
+        given_async_filesystem.read_bytes = AsyncMock(return_value=given_buffer.getvalue())
+        given_file_handler = FileHandler(MagicMock(), async_filesystem=given_async_filesystem)
+
+        # When
+        output_df = asyncio.run(given_file_handler.read_file_async("file.arrow", file_type="FEATHER"))
+
+        # Then
+        assert output_df["value"].tolist() == [1.5, 2.5]
+
+    def test_read_files_async_should_bound_requests_in_flight(self):
+        # Given
+        given_async_filesystem = GivenSlowAsyncFileSystem()
+        given_file_handler = FileHandler(MagicMock(), async_filesystem=given_async_filesystem)
+        given_file_paths = [f"file_{index:02d}" for index in range(40)]
+
+        # When
+        output_df = asyncio.run(given_file_handler.read_files_async(given_file_paths, max_concurrency=8))
+
+        # Then
+        assert output_df["value"].tolist() == given_file_paths
+        assert given_async_filesystem.max_in_flight_requests == 8
+
+    def test_read_files_async_should_require_async_filesystem(self):
+        with pytest.raises(MissingAsyncFileSystemError):
+            asyncio.run(FileHandler(MagicMock()).read_files_async(["file"]))
+
+    def test_write_files(self):
+        # Given
+        given_file_handler = FileHandler(LocalFileSystem())
+        with tempfile.TemporaryDirectory() as given_folder_path:
+            given_input_dfs = {
+                f"{given_folder_path}/file_{index}.parquet": pd.DataFrame({"value": [index]}) for index in range(5)
+            }
+
+            # When
+            written_file_paths = given_file_handler.write_files(given_input_dfs, max_workers=3)
+
+            # Then
+            assert written_file_paths == list(given_input_dfs.keys())
+            assert given_file_handler.read_files(written_file_paths, file_type="PARQUET")["value"].tolist() == [
+                0,
+                1,
+                2,
+                3,
+                4,
+            ]
+
+    def test_write_file_and_read_file_should_round_trip_memory_mapped_feather_file(self):
+        # Given
+        given_file_handler = FileHandler(LocalFileSystem())
+        given_input_df = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(["2023-01-01 00:00", "2023-01-01 01:00"], utc=True),
+                "value": [1.5, 2.5],
+            }
+        )
+        with tempfile.TemporaryDirectory() as given_folder_path:
+            given_file_path = f"{given_folder_path}/file.arrow"
+
+            # When
+            given_file_handler.write_file(given_input_df, file_path=given_file_path, file_type="FEATHER")
+            output_df = given_file_handler.read_file(given_file_path, file_type="FEATHER")
+
+            # Then
+            pd.testing.assert_frame_equal(output_df, given_input_df)
+
+    def test_read_files_should_keep_single_feather_file_memory_mapped(self):
+        # Given
+        given_file_handler = FileHandler(LocalFileSystem())
+        given_input_df = pd.DataFrame({"value": [1.5, 2.5, 3.5]})
+        with tempfile.TemporaryDirectory() as given_folder_path:
+            given_file_paths = [f"{given_folder_path}/a.arrow", f"{given_folder_path}/b.arrow"]
+            for given_file_path in given_file_paths:
+                given_file_handler.write_file(given_input_df, file_path=given_file_path, file_type="FEATHER")
+
+            # When
+            output_df = given_file_handler.read_files(given_file_paths[:1], file_type="FEATHER")
+            concatenated_df = given_file_handler.read_files(given_file_paths, file_type="FEATHER")
+
+            # Then
+            # Mapped pages are read-only, a copied column would be writeable
+            assert not output_df["value"].to_numpy().flags.writeable
+            pd.testing.assert_frame_equal(output_df, given_input_df)
+            pd.testing.assert_frame_equal(concatenated_df, pd.concat([given_input_df] * 2, ignore_index=True))
+
+    def test_write_file_and_read_file_should_round_trip_feather_file_through_open(self):
+        # Given
+        given_file_handler = FileHandler(InMemoryFileSystem())
+        given_input_df = pd.DataFrame({"value": [1.5, 2.5]})
+
+        # When
+        given_file_handler.write_file(given_input_df, file_path="folder/file.arrow", file_type="FEATHER")
+        output_df = given_file_handler.read_file("folder/file.arrow", file_type="FEATHER")
+
+        # Then
+        pd.testing.assert_frame_equal(output_df, given_input_df)
+
+    def test_estimate_csv_memory_bytes_should_extrapolate_sampled_rows(self):
+        # Given
+        given_file_handler = FileHandler(InMemoryFileSystem())
+        given_input_df = pd.DataFrame({"label": [f"label_{index}" for index in range(1000)], "value": 1.5})
+        with given_file_handler.filesystem.open("folder/file.csv", "w") as f:
+            given_input_df.to_csv(f, index=False)
+
+        # When
+        estimated_bytes = given_file_handler.estimate_csv_memory_bytes("folder/file.csv", sample_bytes=1024)
+
+        # Then
+        memory_bytes = given_input_df.memory_usage(index=False, deep=True).sum()
+        assert 0.9 * memory_bytes < estimated_bytes < 1.1 * memory_bytes
+        assert given_file_handler.get_file_size("folder/file.csv") < memory_bytes
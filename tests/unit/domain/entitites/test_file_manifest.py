@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.entities.file_manifest import FileManifest
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+
+TESTED_MODULE = "py_project.domain.entities.file_manifest"
+
+
+class TestFileManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder_path = self.tmp_dir.name
+        self.file_system = LocalFileSystem()
+        self.file_handler = FileHandler(self.file_system)
+        self.manifest_file_path = f"{self.folder_path}/manifest.json"
+        os.makedirs(f"{self.folder_path}/raw")
+        for filename, content in [("a.csv", "a,b\n1,2\n"), ("b.csv", "a,b\n3,4\n"), ("c.csv", "a,b\n1,2\n")]:
+            with open(f"{self.folder_path}/raw/{filename}", "w") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_update_should_hash_files_content(self):
+        # Given
+        given_file_manifest = FileManifest(self.file_handler, self.manifest_file_path, max_workers=2).load()
+
+        # When
+        file_details = given_file_manifest.update(self.file_system.ls_details(f"{self.folder_path}/raw"))
+
+        # Then
+        content_hashes = {os.path.basename(details.path): details.content_hash for details in file_details}
+        assert content_hashes["a.csv"] == content_hashes["c.csv"]
+        assert content_hashes["a.csv"] != content_hashes["b.csv"]
+        assert content_hashes["a.csv"].startswith("sha256:")
+
+    def test_update_should_only_hash_files_with_changed_metadata(self):
+        # Given
+        given_file_manifest = FileManifest(self.file_handler, self.manifest_file_path)
+        given_file_manifest.update(self.file_system.ls_details(f"{self.folder_path}/raw"))
+        given_file_manifest.save()
+        os.utime(f"{self.folder_path}/raw/b.csv", (0, 0))
+
+        # When
+        with patch.object(FileHandler, "compute_file_hash", return_value="given_hash") as mock_compute_file_hash:
+            file_details = (
+                FileManifest(self.file_handler, self.manifest_file_path)
+                .load()
+                .update(self.file_system.ls_details(f"{self.folder_path}/raw"))
+            )
+
+        # Then
+        mock_compute_file_hash.assert_called_once_with(f"{self.folder_path}/raw/b.csv")
+        assert [details.content_hash for details in file_details].count("given_hash") == 1
+
+    def test_save_should_keep_previous_manifest_when_interrupted(self):
+        # Given
+        given_file_manifest = FileManifest(self.file_handler, self.manifest_file_path)
+        given_file_manifest.update(self.file_system.ls_details(f"{self.folder_path}/raw"))
+        given_file_manifest.save()
+        given_file_manifest.file_details_by_path = {}
+
+        # When
+        with patch("py_project.domain.entities.file_handler.json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                given_file_manifest.save()
+
+        # Then
+        assert len(FileManifest(self.file_handler, self.manifest_file_path).load().file_details_by_path) == 3
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+import pytest
+
+from py_project.domain.entities.metric_registry import (
+    CyclicMetricDependencyError,
+    MetricRegistry,
+    UnknownMetricError,
+)
+
+TESTED_MODULE = "py_project.domain.entities.metric_registry"
+
+
+class GivenSchema(pa.SchemaModel):
+    value: pa.typing.Series[pa.typing.Float64] = pa.Field(alias="value", coerce=True)
+
+
+class TestMetricRegistry(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.registry = MetricRegistry()
+
+        @self.registry.register(output="double", inputs=["value"])
+        def compute_double(value: np.ndarray) -> np.ndarray:
+            self.calls.append("double")
+            return value * 2
+
+        @self.registry.register(output="quadruple", inputs=["double"])
+        def compute_quadruple(double: np.ndarray) -> np.ndarray:
+            self.calls.append("quadruple")
+            return double * 2
+
+        @self.registry.register(output="sextuple", inputs=["double", "value"])
+        def compute_sextuple(double: np.ndarray, value: np.ndarray) -> np.ndarray:
+            self.calls.append("sextuple")
+            return double * 2 + double
+
+        @self.registry.register(output="unused", inputs=["value"])
+        def compute_unused(value: np.ndarray) -> np.ndarray:
+            self.calls.append("unused")
+            return value
+
+    def test_evaluate_should_only_compute_requested_metrics_and_their_dependencies_once(self):
+        # Given
+        given_input_df = pd.DataFrame({"value": [1.0, 2.0]})
+
+        # When
+        output_df = self.registry.evaluate(given_input_df, outputs=["sextuple", "quadruple"])
+
+        # Then
+        assert self.calls == ["double", "sextuple", "quadruple"]
+        assert output_df.columns.tolist() == ["value", "sextuple", "quadruple"]
+        assert output_df["sextuple"].tolist() == [6.0, 12.0]
+
+    def test_evaluate_should_read_available_columns_instead_of_computing_them(self):
+        # When
+        output_df = self.registry.evaluate(pd.DataFrame({"double": [10.0]}), outputs=["quadruple"])
+
+        # Then
+        assert self.calls == ["quadruple"]
+        assert output_df["quadruple"].tolist() == [20.0]
+
+    def test_resolve_should_raise_for_unknown_metric(self):
+        with pytest.raises(UnknownMetricError):
+            self.registry.resolve(["unknown"], available_columns=[])
+
+    def test_resolve_should_raise_for_cyclic_dependencies(self):
+        # Given
+        self.registry.register(output="a", inputs=["b"])(lambda b: b)
+        self.registry.register(output="b", inputs=["a"])(lambda a: a)
+
+        # When
+        with pytest.raises(CyclicMetricDependencyError):
+            self.registry.resolve(["a"], available_columns=[])
+
+    def test_build_schema_should_add_registered_outputs(self):
+        # When
+        given_schema = self.registry.build_schema(GivenSchema, outputs=["double"], schema_name="GivenComputedSchema")
+
+        # Then
+        assert list(given_schema.to_schema().columns) == ["value", "double"]
+        assert self.registry.get_schema_outputs(given_schema) == ["double"]
+        given_schema.validate(pd.DataFrame({"value": [1.0], "double": [2]}))
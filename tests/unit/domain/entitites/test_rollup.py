@@ -0,0 +1,57 @@
+import unittest
+
+import pandas as pd
+
+from py_project.domain.entities.rollup import compute_rollup_partials, merge_rollup_partials
+
+TESTED_MODULE = "py_project.domain.entities.rollup"
+
+
+class TestRollup(unittest.TestCase):
+    def setUp(self):
+        self.metrics_df = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(
+                    ["2022-05-26 18:10:00", "2022-05-26 18:50:00", "2022-05-26 19:00:00", "2022-05-26 19:30:00"],
+                    utc=True,
+                ),
+                "value": [1.0, 3.0, 5.0, None],
+            }
+        )
+
+    def test_compute_rollup_partials(self):
+        # When
+        rollup_df = compute_rollup_partials(self.metrics_df, "timestamp", ["value"], frequency="h")
+
+        # Then
+        assert (
+            rollup_df["bucket_start"].tolist()
+            == pd.to_datetime(["2022-05-26 18:00:00", "2022-05-26 19:00:00"], utc=True).tolist()
+        )
+        assert rollup_df["value_min"].tolist() == [1.0, 5.0]
+        assert rollup_df["value_max"].tolist() == [3.0, 5.0]
+        assert rollup_df["value_count"].tolist() == [2, 1]
+        assert rollup_df["value_mean"].tolist() == [2.0, 5.0]
+
+    def test_merge_rollup_partials_should_equal_rollup_of_whole_batch(self):
+        # Given
+        given_first_partials_df = compute_rollup_partials(self.metrics_df.head(2), "timestamp", ["value"], "D")
+        given_second_partials_df = compute_rollup_partials(self.metrics_df.tail(2), "timestamp", ["value"], "D")
+
+        # When
+        rollup_df = merge_rollup_partials([given_first_partials_df, given_second_partials_df], ["value"])
+
+        # Then
+        pd.testing.assert_frame_equal(
+            rollup_df, compute_rollup_partials(self.metrics_df, "timestamp", ["value"], "D"), check_dtype=False
+        )
+
+    def test_merge_rollup_partials_without_rows(self):
+        assert merge_rollup_partials([pd.DataFrame()], ["value"]).columns.tolist() == [
+            "bucket_start",
+            "value_min",
+            "value_max",
+            "value_sum",
+            "value_count",
+            "value_mean",
+        ]
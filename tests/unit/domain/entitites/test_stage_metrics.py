@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from py_project.config import functions_config
+from py_project.domain.entities.stage_metrics import StageMetrics
+
+TESTED_MODULE = "py_project.domain.entities.stage_metrics"
+
+
+class TestStageMetrics(unittest.TestCase):
+    def test_add_should_sum_counters(self):
+        # Given
+        stage_metrics = StageMetrics()
+
+        # When
+        stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_IN, 2)
+        stage_metrics.add(functions_config.PROCESSING_METRIC_ROWS_IN, 3)
+
+        # Then
+        assert stage_metrics.to_dict() == {functions_config.PROCESSING_METRIC_ROWS_IN: 5}
+
+    @patch(f"{TESTED_MODULE}.get_peak_rss_bytes")
+    @patch(f"{TESTED_MODULE}.time.perf_counter")
+    def test_measure_should_record_duration_and_peak_rss_even_on_error(
+        self, mock_perf_counter, mock_get_peak_rss_bytes
+    ):
+        # Given
+        stage_metrics = StageMetrics()
+        mock_perf_counter.side_effect = [1.0, 3.0, 10.0, 10.5]
+        mock_get_peak_rss_bytes.side_effect = [200, 100]
+
+        # When
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_READ):
+            pass
+        with pytest.raises(ValueError):
+            with stage_metrics.measure(functions_config.PROCESSING_STAGE_READ):
+                raise ValueError()
+
+        # Then
+        assert stage_metrics.to_dict() == {
+            "read_seconds": 2.5,
+            functions_config.PROCESSING_METRIC_PEAK_RSS_BYTES: 200,
+        }
+
+    def test_measure_should_record_peak_rss_of_memory_freed_within_stage(self):
+        # Given
+        stage_metrics = StageMetrics()
+        given_allocated_bytes = 256 * 1024 * 1024
+
+        # When
+        with stage_metrics.measure(functions_config.PROCESSING_STAGE_TRANSFORM):
+            buffer = b"\x01" * given_allocated_bytes
+            del buffer
+
+        # Then
+        assert stage_metrics.to_dict()[functions_config.PROCESSING_METRIC_PEAK_RSS_BYTES] > given_allocated_bytes
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+import pytest
+
+from py_project.domain.entities.wind_power import (
+    STANDARD_AIR_DENSITY_KG_M3,
+    InvalidPowerCurveError,
+    TurbinePowerCurve,
+    compute_air_density,
+    compute_wind_power_kw,
+)
+
+TESTED_MODULE = "py_project.domain.entities.wind_power"
+
+
+class TestWindPower(unittest.TestCase):
+    def setUp(self):
+        self.power_curve = TurbinePowerCurve(
+            wind_speeds_ms=[3.0, 5.0, 10.0],
+            powers_kw=[0.0, 200.0, 1000.0],
+            cut_in_speed_ms=3.0,
+            rated_speed_ms=10.0,
+            cut_out_speed_ms=20.0,
+            rated_power_kw=1000.0,
+        )
+        # Temperature and pressure giving the standard air density
+        self.temperature_c = 15.0
+        self.pressure_mbar = STANDARD_AIR_DENSITY_KG_M3 * 287.05 * (15.0 + 273.15) / 100.0
+
+    def test_compute_wind_power_kw_should_follow_power_curve(self):
+        # Given
+        given_wind_speed_ms = np.array([2.0, 4.0, 7.5, 12.0, 20.0, 30.0, np.nan])
+
+        # When
+        wind_power_kw = compute_wind_power_kw(
+            wind_speed_kmh=given_wind_speed_ms * 3.6,
+            temperature_c=np.full(len(given_wind_speed_ms), self.temperature_c),
+            pressure_mbar=np.full(len(given_wind_speed_ms), self.pressure_mbar),
+            power_curve=self.power_curve,
+        )
+
+        # Then
+        np.testing.assert_allclose(wind_power_kw, [0.0, 100.0, 600.0, 1000.0, 0.0, 0.0, np.nan])
+
+    def test_compute_wind_power_kw_should_correct_wind_speed_with_air_density(self):
+        # When
+        wind_power_kw = compute_wind_power_kw(
+            wind_speed_kmh=np.array([5.0 * 3.6]),
+            temperature_c=np.array([self.temperature_c]),
+            pressure_mbar=np.array([self.pressure_mbar * 8]),
+            power_curve=self.power_curve,
+        )
+
+        # Then
+        # An air eight times denser doubles the equivalent wind speed
+        np.testing.assert_allclose(wind_power_kw, [1000.0])
+
+    def test_compute_air_density_should_fall_back_to_standard_density(self):
+        np.testing.assert_allclose(
+            compute_air_density(np.array([15.0, 15.0]), np.array([0.0, np.nan])), [STANDARD_AIR_DENSITY_KG_M3] * 2
+        )
+
+    def test_power_curve_should_have_increasing_wind_speeds(self):
+        with pytest.raises(InvalidPowerCurveError):
+            TurbinePowerCurve(
+                wind_speeds_ms=[5.0, 3.0],
+                powers_kw=[0.0, 100.0],
+                cut_in_speed_ms=3.0,
+                rated_speed_ms=10.0,
+                cut_out_speed_ms=20.0,
+                rated_power_kw=1000.0,
+            )
@@ -0,0 +1,53 @@
+import threading
+import time
+import unittest
+
+import pytest
+
+from py_project.domain.usecases._usecase_common import map_in_thread
+
+TESTED_MODULE = "py_project.domain.usecases._usecase_common"
+
+
+class TestUsecaseCommon(unittest.TestCase):
+    def test_map_in_thread_should_keep_items_order(self):
+        assert list(map_in_thread(lambda item: item * 2, range(10), max_queued_items=2)) == list(range(0, 20, 2))
+
+    def test_map_in_thread_should_not_map_further_than_queued_items(self):
+        # Given
+        mapped_items = []
+
+        def map_item(item: int) -> int:
+            mapped_items.append(item)
+            return item
+
+        # When
+        results = map_in_thread(map_item, range(100), max_queued_items=2)
+        next(results)
+        time.sleep(0.1)
+
+        # Then
+        # One item is consumed, two are queued and one waits to be queued
+        assert len(mapped_items) == 4
+        results.close()
+
+    def test_map_in_thread_should_raise_stage_error(self):
+        def map_item(item: int) -> int:
+            if item == 3:
+                raise ValueError("given_error")
+            return item
+
+        with pytest.raises(ValueError):
+            list(map_in_thread(map_item, range(10), max_queued_items=2))
+
+    def test_map_in_thread_should_stop_upstream_stages_when_closed(self):
+        # Given
+        given_thread_count = threading.active_count()
+
+        # When
+        results = map_in_thread(lambda item: item, map_in_thread(lambda item: item, range(100), 1), 1)
+        next(results)
+        results.close()
+
+        # Then
+        assert threading.active_count() == given_thread_count
@@ -1,7 +1,162 @@
+import math
 import unittest
+from unittest.mock import MagicMock
+
+from py_project.config import functions_config
+from py_project.domain.adapters.filesystem import FileDetails
+from py_project.domain.adapters.orchestrator_state_service import OrchestratorState
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.usecases._usecase_exceptions import InvalidIngestionMode
+from py_project.domain.usecases.prepare_ingestion import (
+    get_checkpoint_file_details,
+    get_file_details_to_ingest,
+    pack_file_batches,
+)
 
 TESTED_MODULE = "py_project.domain.usecases.prepare_ingestion"
 
 
 class TestPrepareIngestion(unittest.TestCase):
-    pass
+    def setUp(self):
+        self.file_details = [
+            FileDetails(path="raw/b.csv", size=20, last_modified=2.0),
+            FileDetails(path="raw/a.csv", size=10, last_modified=1.0),
+            FileDetails(path="raw/c.csv", size=30, last_modified=3.0, etag="etag_c"),
+        ]
+        self.file_system = MagicMock()
+        self.file_system.ls_details.return_value = self.file_details
+        self.file_handler = FileHandler(self.file_system)
+
+    def test_get_file_details_to_ingest_in_full_mode(self):
+        # When
+        file_details_to_ingest, file_details_to_checkpoint = get_file_details_to_ingest(
+            self.file_handler, "raw", functions_config.FULL_INGESTION_MODE, checkpoint_file_details=[]
+        )
+
+        # Then
+        assert [details.path for details in file_details_to_ingest] == ["raw/a.csv", "raw/b.csv", "raw/c.csv"]
+        assert file_details_to_checkpoint == file_details_to_ingest
+
+    def test_get_file_details_to_ingest_in_incremental_mode_should_only_return_new_or_changed_files(self):
+        # Given
+        given_checkpoint_file_details = [
+            FileDetails(path="raw/a.csv", size=10, last_modified=1.0),
+            FileDetails(path="raw/b.csv", size=20, last_modified=1.5),
+            FileDetails(path="raw/c.csv", size=0, last_modified=0.0, etag="etag_c"),
+        ]
+
+        # When
+        file_details_to_ingest, file_details_to_checkpoint = get_file_details_to_ingest(
+            self.file_handler, "raw", functions_config.INCREMENTAL_INGESTION_MODE, given_checkpoint_file_details
+        )
+
+        # Then
+        assert [details.path for details in file_details_to_ingest] == ["raw/b.csv"]
+        assert len(file_details_to_checkpoint) == 3
+
+    def test_get_file_details_to_ingest_in_incremental_mode_without_checkpoint(self):
+        # When
+        file_details_to_ingest, _ = get_file_details_to_ingest(
+            self.file_handler, "raw", functions_config.INCREMENTAL_INGESTION_MODE, checkpoint_file_details=None
+        )
+
+        # Then
+        assert len(file_details_to_ingest) == 3
+
+    def test_get_file_details_to_ingest_should_raise_error_for_unknown_mode(self):
+        with self.assertRaises(InvalidIngestionMode):
+            get_file_details_to_ingest(self.file_handler, "raw", "UNKNOWN")
+
+    def test_get_checkpoint_file_details_from_processed_file_paths(self):
+        # Given
+        given_state = OrchestratorState(execution_time=0, base="", status="", mode="", job_id="")
+        given_state.posts = {
+            functions_config.AZFN_ORCHESTRATE_INGESTION: {
+                functions_config.POST_SOURCE_PROCESSED_FILE_PATHS_KEY: ["raw/a.csv", "raw/b.csv"]
+            }
+        }
+
+        # When
+        checkpoint_file_details = get_checkpoint_file_details(given_state, functions_config.AZFN_ORCHESTRATE_INGESTION)
+        file_details_to_ingest, _ = get_file_details_to_ingest(
+            self.file_handler, "raw", functions_config.INCREMENTAL_INGESTION_MODE, checkpoint_file_details
+        )
+
+        # Then
+        assert [details.path for details in checkpoint_file_details] == ["raw/a.csv", "raw/b.csv"]
+        assert [details.path for details in file_details_to_ingest] == ["raw/c.csv"]
+        assert get_checkpoint_file_details(None, functions_config.AZFN_ORCHESTRATE_INGESTION) is None
+
+    def test_get_file_details_to_ingest_should_skip_files_with_already_ingested_content(self):
+        # Given
+        self.file_details[0].content_hash = "hash_b"
+        self.file_details[1].content_hash = "hash_a"
+        self.file_details[2].content_hash = "hash_a"
+        given_checkpoint_file_details = [
+            FileDetails(path="raw/a.csv", size=0, last_modified=0.0, content_hash="hash_a"),
+            FileDetails(path="raw/b.csv", size=20, last_modified=2.0, content_hash="hash_b_before_upload"),
+        ]
+
+        # When
+        file_details_to_ingest, _ = get_file_details_to_ingest(
+            self.file_handler, "raw", functions_config.INCREMENTAL_INGESTION_MODE, given_checkpoint_file_details
+        )
+
+        # Then
+        assert [details.path for details in file_details_to_ingest] == ["raw/b.csv"]
+
+    def test_pack_file_batches_should_balance_batches_sizes(self):
+        # Given
+        given_file_details = [FileDetails(path="raw/large.csv", size=2000, last_modified=0.0)] + [
+            FileDetails(path=f"raw/small_{index:02d}.csv", size=100, last_modified=0.0) for index in range(20)
+        ]
+
+        # When
+        file_batches = pack_file_batches(
+            given_file_details, max_batch_bytes=2000, max_batch_rows=1000, bytes_per_row=10
+        )
+
+        # Then
+        assert file_batches == [["raw/large.csv"], [f"raw/small_{index:02d}.csv" for index in range(20)]]
+
+    def test_pack_file_batches_should_meet_row_budget(self):
+        # Given
+        given_file_details = [FileDetails(path=f"raw/{index}.csv", size=100, last_modified=0.0) for index in range(4)]
+
+        # When
+        file_batches = pack_file_batches(given_file_details, max_batch_bytes=1000, max_batch_rows=20, bytes_per_row=10)
+
+        # Then
+        assert sorted(len(file_batch) for file_batch in file_batches) == [2, 2]
+        assert pack_file_batches([], max_batch_bytes=1000, max_batch_rows=20, bytes_per_row=10) == []
+
+    def test_pack_file_batches_should_fit_every_batch_within_both_budgets(self):
+        # Given
+        given_cases = [
+            ([60, 60, 60], 100, 1000),
+            ([70, 40, 40, 40, 10], 100, 1000),
+            ([30, 30, 30, 30], 1000, 7),
+            ([90, 55, 45, 35, 25, 15, 5], 100, 12),
+        ]
+
+        for given_sizes, given_max_batch_bytes, given_max_batch_rows in given_cases:
+            given_file_details = [
+                FileDetails(path=f"raw/{index}.csv", size=size, last_modified=0.0)
+                for index, size in enumerate(given_sizes)
+            ]
+            sizes_by_path = {details.path: details.size for details in given_file_details}
+
+            # When
+            file_batches = pack_file_batches(
+                given_file_details,
+                max_batch_bytes=given_max_batch_bytes,
+                max_batch_rows=given_max_batch_rows,
+                bytes_per_row=10,
+            )
+
+            # Then
+            assert sorted(path for file_batch in file_batches for path in file_batch) == sorted(sizes_by_path)
+            for file_batch in file_batches:
+                batch_bytes = sum(sizes_by_path[path] for path in file_batch)
+                batch_rows = sum(math.ceil(sizes_by_path[path] / 10) for path in file_batch)
+                assert batch_bytes <= given_max_batch_bytes and batch_rows <= given_max_batch_rows, file_batches
@@ -1,7 +1,142 @@
+import functools
+import tempfile
 import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from py_project.config import database_config, filesystem_config, functions_config
+from py_project.domain.adapters.database import Database
+from py_project.domain.entities import weather_data_handler
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.usecases.weather_compute_metrics import (
+    add_computed_columns,
+    compute_weather_metrics,
+    extract_and_transform_weather_normalized_metrics,
+)
+from py_project.domain.usecases.weather_normalize_metrics import ingest_normalized_inclino_metrics_to_database
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
 
 TESTED_MODULE = "py_project.domain.usecases.weather_compute_metrics"
 
+RAW_FILE_CONTENT = (
+    "Formatted Date,Summary,Temperature (C),Humidity,Wind Speed (km/h),Wind Bearing (degrees),"
+    "Visibility (km),Pressure (millibars)\n"
+    "2006-04-01 00:00:00.000 +0200,Cloudy,{temperature},0.89,14.11,251.0,15.82,1015.13\n"
+)
+
 
 class TestWeatherComputeMetrics(unittest.TestCase):
-    pass
+    def test_add_computed_columns_should_compute_wind_power(self):
+        # Given
+        given_metrics_df = pd.DataFrame(
+            {
+                weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME: [0.0, 30.0, 60.0, 100.0],
+                weather_data_handler.WEATHER_TEMPERATURE_COLUMN_NAME: [15.0, 15.0, 15.0, 15.0],
+                weather_data_handler.WEATHER_PRESSURE_COLUMN_NAME: [1013.25, 1013.25, 1013.25, 1013.25],
+            }
+        )
+
+        # When
+        metrics_df = add_computed_columns(given_metrics_df)
+
+        # Then
+        wind_power_kw = metrics_df[weather_data_handler.WEATHER_WIND_POWER].tolist()
+        assert wind_power_kw[0] == 0.0
+        assert 0.0 < wind_power_kw[1] < wind_power_kw[2] == 2000.0
+        assert wind_power_kw[3] == 0.0
+
+    def test_extract_and_transform_weather_normalized_metrics_should_compute_over_memory_mapped_file(self):
+        # Given
+        given_file_handler = FileHandler(LocalFileSystem())
+        given_normalized_df = pd.DataFrame(
+            {
+                weather_data_handler.WEATHER_TIMESTAMP_COLUMN_NAME: pd.to_datetime(
+                    ["2006-04-01 00:00", "2006-04-01 01:00"], utc=True
+                ),
+                weather_data_handler.WEATHER_TEMPERATURE_COLUMN_NAME: [15.0, 15.0],
+                weather_data_handler.WEATHER_HUMIDITY_COLUMN_NAME: [0.89, 0.86],
+                weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME: [30.0, 60.0],
+                weather_data_handler.WEATHER_WIND_BEARING_COLUMN_NAME: [251.0, 259.0],
+                weather_data_handler.WEATHER_VISIBILITY_COLUMN_NAME: [15.82, 15.82],
+                weather_data_handler.WEATHER_PRESSURE_COLUMN_NAME: [1013.25, 1013.25],
+            }
+        )
+        with tempfile.TemporaryDirectory() as given_folder_path:
+            given_file_path = f"{given_folder_path}/{filesystem_config.APPS_SILVER_NORMALIZED_FILENAME}"
+            given_file_handler.write_file(
+                given_normalized_df,
+                file_path=given_file_path,
+                file_type=filesystem_config.APPS_SILVER_NORMALIZED_FILE_TYPE,
+            )
+
+            read_dfs = []
+            given_read_files = given_file_handler.read_files
+
+            def read_files(*args, **kwargs) -> pd.DataFrame:
+                read_dfs.append(given_read_files(*args, **kwargs))
+                return read_dfs[-1]
+
+            given_file_handler.read_files = read_files
+
+            # When
+            metrics_df, file_paths = extract_and_transform_weather_normalized_metrics(
+                given_file_handler, [given_file_path]
+            )
+
+            # Then
+            assert file_paths == [given_file_path]
+            # Columns are handed over the read-only mapped pages, and left unmodified by the computation
+            assert not read_dfs[0][weather_data_handler.WEATHER_WIND_SPEED_COLUMN_NAME].to_numpy().flags.writeable
+            pd.testing.assert_frame_equal(read_dfs[0], given_normalized_df)
+            pd.testing.assert_frame_equal(metrics_df[given_normalized_df.columns], given_normalized_df)
+            assert (
+                metrics_df[weather_data_handler.WEATHER_WIND_POWER].tolist()
+                == add_computed_columns(given_normalized_df.copy())[weather_data_handler.WEATHER_WIND_POWER].tolist()
+            )
+
+    @patch("py_project.domain.usecases.weather_normalize_metrics.filesystem_config.APPS_SILVER_NORMALIZED_FOLDER", "n")
+    def test_compute_weather_metrics_should_let_last_file_win_over_normalized_files_of_batches(self):
+        # Given
+        given_file_system = InMemoryFileSystem()
+        for file_path, temperature in [("raw/a.csv", 1.0), ("raw/b.csv", 2.0)]:
+            with given_file_system.open(file_path, "w") as f:
+                f.write(RAW_FILE_CONTENT.format(temperature=temperature))
+        given_file_handler = FileHandler(given_file_system)
+        # Files are packed by size, so that the last file is normalized in the first batch
+        given_normalized_file_paths = []
+        for batch_index, (file_paths, file_ranks) in enumerate([(["raw/b.csv"], [1]), (["raw/a.csv"], [0])]):
+            given_normalized_file_paths += ingest_normalized_inclino_metrics_to_database(
+                given_file_handler,
+                file_paths,
+                batch_index=batch_index,
+                file_ranks=file_ranks,
+                deduplication_policy=functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS,
+            )[1]
+        given_memory_governor = MagicMock()
+        given_memory_governor.iter_groups.side_effect = lambda items, estimated_bytes: ([item] for item in items)
+        given_database = MagicMock()
+        given_database.write_table_dataframes.side_effect = functools.partial(
+            Database.write_table_dataframes, given_database
+        )
+        given_database.read_dataframe.side_effect = lambda schema_name, table_name, **kwargs: pd.DataFrame(
+            columns=["timestamp", "row_hash", "bucket_start"]
+        )
+
+        # When
+        compute_weather_metrics(
+            given_file_handler,
+            given_normalized_file_paths,
+            given_database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+            memory_governor=given_memory_governor,
+        )
+
+        # Then
+        metrics_table_calls = [
+            call.kwargs
+            for call in given_database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_TABLE_NAME
+        ]
+        assert [call["input_df"]["temperature_c"].tolist() for call in metrics_table_calls] == [[2.0]]
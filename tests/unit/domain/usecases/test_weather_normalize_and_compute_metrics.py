@@ -0,0 +1,153 @@
+import functools
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from py_project.config import database_config, functions_config
+from py_project.domain.adapters.database import Database
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.usecases.weather_normalize_and_compute_metrics import normalize_and_compute_weather_metrics
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
+
+TESTED_MODULE = "py_project.domain.usecases.weather_normalize_and_compute_metrics"
+
+RAW_FILE_CONTENT = (
+    "Formatted Date,Summary,Temperature (C),Humidity,Wind Speed (km/h),Wind Bearing (degrees),"
+    "Visibility (km),Pressure (millibars)\n"
+    "2006-04-01 00:00:00.000 +0200,Cloudy,9.47,0.89,14.11,251.0,15.82,1015.13\n"
+)
+
+
+def read_empty_dataframe(schema_name: str, table_name: str, **kwargs) -> pd.DataFrame:
+    if table_name == database_config.WEATHER_METRICS_TABLE_NAME:
+        return pd.DataFrame(columns=["timestamp", "row_hash"])
+    return pd.DataFrame(columns=["bucket_start"])
+
+
+class TestWeatherNormalizeAndComputeMetrics(unittest.TestCase):
+    def setUp(self):
+        self.file_system = InMemoryFileSystem()
+        for file_path in ["raw/a.csv", "raw/b.csv", "raw/c.csv"]:
+            with self.file_system.open(file_path, "w") as f:
+                f.write(RAW_FILE_CONTENT)
+        self.file_handler = FileHandler(self.file_system)
+        self.database = MagicMock()
+        self.database.write_table_dataframes.side_effect = functools.partial(
+            Database.write_table_dataframes, self.database
+        )
+        self.database.read_dataframe.side_effect = read_empty_dataframe
+
+    @patch(f"{TESTED_MODULE}.filesystem_config.APPS_SILVER_NORMALIZED_FOLDER", "normalized")
+    def test_normalize_and_compute_weather_metrics_should_load_batches_and_write_normalized_files(self):
+        # When
+        (
+            (normalize_inputs, normalize_outputs),
+            (compute_inputs, compute_outputs),
+            duplicate_rows,
+        ) = normalize_and_compute_weather_metrics(
+            source_file_handler=self.file_handler,
+            input_file_paths=["raw/a.csv", "raw/b.csv", "raw/c.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.FULL_INGESTION_MODE,
+            file_batches=[["raw/a.csv"], ["raw/b.csv", "raw/c.csv"]],
+        )
+
+        # Then
+        assert normalize_inputs == ["raw/a.csv", "raw/b.csv", "raw/c.csv"]
+        assert normalize_outputs == [
+            "normalized/normalized_history_00000.arrow",
+            "normalized/normalized_history_00001.arrow",
+        ]
+        assert compute_inputs == normalize_outputs
+        assert all(self.file_system.exists(file_path) for file_path in normalize_outputs)
+        assert len(compute_outputs) == 3
+        metrics_table_calls = [
+            call
+            for call in self.database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_TABLE_NAME
+        ]
+        assert [call.kwargs["write_mode"] for call in metrics_table_calls] == [
+            database_config.WRITE_MODE_TRUNCATE_THEN_APPEND,
+            database_config.WRITE_MODE_APPEND,
+        ]
+        # Files of the second batch overlap, so that only one of their rows is loaded
+        assert len(metrics_table_calls[1].kwargs["input_df"]) == 1
+        assert duplicate_rows == 1
+
+    @patch(f"{TESTED_MODULE}.filesystem_config.APPS_SILVER_NORMALIZED_FOLDER", "normalized")
+    def test_normalize_and_compute_weather_metrics_without_batches_should_write_a_single_normalized_file(self):
+        # When
+        (_, normalize_outputs), _, _ = normalize_and_compute_weather_metrics(
+            source_file_handler=self.file_handler,
+            input_file_paths=["raw/a.csv"],
+            database=self.database,
+        )
+
+        # Then
+        assert normalize_outputs == ["normalized/normalized_history.arrow"]
+        assert self.database.write_dataframe.call_count == 3
+
+    @patch(f"{TESTED_MODULE}.filesystem_config.APPS_SILVER_NORMALIZED_FOLDER", "normalized")
+    def test_normalize_and_compute_weather_metrics_in_incremental_mode_should_upsert_rows_of_changed_files(self):
+        # Given
+        normalize_and_compute_weather_metrics(
+            source_file_handler=self.file_handler, input_file_paths=["raw/a.csv"], database=self.database
+        )
+        given_stored_df = [
+            call.kwargs["input_df"]
+            for call in self.database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_TABLE_NAME
+        ][0]
+        with self.file_system.open("raw/a.csv", "w") as f:
+            f.write(RAW_FILE_CONTENT.replace("9.47", "10.47"))
+        self.database.reset_mock()
+        self.database.read_dataframe.side_effect = lambda schema_name, table_name, **kwargs: (
+            given_stored_df
+            if table_name == database_config.WEATHER_METRICS_TABLE_NAME
+            else read_empty_dataframe(schema_name, table_name, **kwargs)
+        )
+
+        # When
+        normalize_and_compute_weather_metrics(
+            source_file_handler=self.file_handler,
+            input_file_paths=["raw/a.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+        )
+
+        # Then
+        metrics_table_calls = [
+            call.kwargs
+            for call in self.database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_TABLE_NAME
+        ]
+        # Rows of a re-ingested file are keyed by timestamp, so that they replace the stored ones
+        assert [call["write_mode"] for call in metrics_table_calls] == [database_config.WRITE_MODE_UPSERT]
+        assert metrics_table_calls[0]["input_df"]["temperature_c"].tolist() == [10.47]
+
+    @patch(f"{TESTED_MODULE}.filesystem_config.APPS_SILVER_NORMALIZED_FOLDER", "normalized")
+    def test_normalize_and_compute_weather_metrics_should_let_last_file_win_across_batches(self):
+        # Given
+        with self.file_system.open("raw/b.csv", "w") as f:
+            f.write(RAW_FILE_CONTENT.replace("9.47", "10.47"))
+
+        # When
+        normalize_and_compute_weather_metrics(
+            source_file_handler=self.file_handler,
+            input_file_paths=["raw/a.csv", "raw/b.csv"],
+            database=self.database,
+            file_batches=[["raw/b.csv"], ["raw/a.csv"]],
+            deduplication_policy=functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS,
+        )
+
+        # Then
+        metrics_table_calls = [
+            call.kwargs
+            for call in self.database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_TABLE_NAME
+        ]
+        # The first file being loaded last, its row is outranked by the one of the last file
+        assert len(metrics_table_calls) == 1
+        assert metrics_table_calls[0]["input_df"]["temperature_c"].tolist() == [10.47]
+        assert "source_file_rank" not in metrics_table_calls[0]["input_df"].columns
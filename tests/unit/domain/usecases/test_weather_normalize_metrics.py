@@ -1,7 +1,75 @@
 import unittest
+from unittest.mock import MagicMock
+
+from py_project.config import functions_config
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.usecases.weather_normalize_metrics import (
+    extract_and_transform_raw_files,
+    ingest_normalized_inclino_metrics_to_database,
+)
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
 
 TESTED_MODULE = "py_project.domain.usecases.weather_normalize_metrics"
 
+RAW_FILE_HEADER = (
+    "Formatted Date,Summary,Temperature (C),Humidity,Wind Speed (km/h),Wind Bearing (degrees),"
+    "Visibility (km),Pressure (millibars)\n"
+)
+RAW_FILE_ROW = "2006-04-01 {hour:02d}:00:00.000 +0200,Cloudy,{temperature},0.89,14.11,251.0,15.82,1015.13\n"
+
 
 class TestWeatherNormalizeMetrics(unittest.TestCase):
-    pass
+    def setUp(self):
+        file_system = InMemoryFileSystem()
+        for file_path, hours, temperature in [("raw/a.csv", [0, 1], 1.0), ("raw/b.csv", [1, 2], 2.0)]:
+            with file_system.open(file_path, "w") as f:
+                f.write(RAW_FILE_HEADER)
+                f.writelines(RAW_FILE_ROW.format(hour=hour, temperature=temperature) for hour in hours)
+        self.file_handler = FileHandler(file_system)
+
+    def test_extract_and_transform_raw_files_should_let_last_file_win_on_overlapping_rows(self):
+        # When
+        metrics_df, duplicate_rows = extract_and_transform_raw_files(
+            self.file_handler,
+            ["raw/a.csv", "raw/b.csv"],
+            deduplication_policy=functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS,
+        )
+
+        # Then
+        assert duplicate_rows == 1
+        assert metrics_df["temperature_c"].tolist() == [1.0, 2.0, 2.0]
+
+    def test_extract_and_transform_raw_files_should_keep_first_seen_overlapping_rows(self):
+        # When
+        metrics_df, duplicate_rows = extract_and_transform_raw_files(
+            self.file_handler,
+            ["raw/a.csv", "raw/b.csv"],
+            deduplication_policy=functions_config.DEDUPLICATION_POLICY_FIRST_SEEN,
+        )
+
+        # Then
+        assert duplicate_rows == 1
+        assert metrics_df["temperature_c"].tolist() == [1.0, 1.0, 2.0]
+
+    def test_ingest_normalized_inclino_metrics_to_database_under_memory_pressure_should_write_file_groups(self):
+        # Given
+        given_memory_governor = MagicMock()
+        given_memory_governor.iter_groups.side_effect = lambda items, estimated_bytes: ([item] for item in items)
+
+        # When
+        _, outputs, duplicate_rows = ingest_normalized_inclino_metrics_to_database(
+            self.file_handler,
+            ["raw/a.csv", "raw/b.csv"],
+            batch_index=1,
+            deduplication_policy=functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS,
+            memory_governor=given_memory_governor,
+        )
+
+        # Then
+        assert [output.rsplit("/", 1)[-1] for output in outputs] == [
+            "normalized_history_00001_part_00000.arrow",
+            "normalized_history_00001_part_00001.arrow",
+        ]
+        # The last file is normalized first, its rows winning over the overlapping ones of the first file
+        assert duplicate_rows == 1
+        assert self.file_handler.read_file(outputs[1], file_type="FEATHER")["temperature_c"].tolist() == [1.0]
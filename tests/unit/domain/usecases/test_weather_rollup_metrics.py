@@ -0,0 +1,177 @@
+import functools
+import unittest
+from typing import Iterable
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from py_project.config import database_config
+from py_project.domain.adapters.database import Database, TableWrite
+from py_project.domain.usecases.weather_change_detection import add_weather_row_hashes
+from py_project.domain.usecases.weather_rollup_metrics import (
+    WEATHER_ROLLUP_METRIC_COLUMNS,
+    compute_weather_rollup_partials,
+    load_weather_metrics_to_database,
+    update_weather_rollup_tables,
+)
+
+TESTED_MODULE = "py_project.domain.usecases.weather_rollup_metrics"
+
+
+class TestWeatherRollupMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics_df = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(["2022-05-26 18:10:00", "2022-05-26 19:10:00"], utc=True),
+                **{metric_column: [1.0, 3.0] for metric_column in WEATHER_ROLLUP_METRIC_COLUMNS},
+                "wind_bearing_deg": [0.0, 0.0],
+            }
+        )
+        self.database = MagicMock()
+        self.database.write_table_dataframes.side_effect = functools.partial(
+            Database.write_table_dataframes, self.database
+        )
+
+    def test_update_weather_rollup_tables_in_append_mode_should_merge_stored_rows_within_batch_bounds(self):
+        # Given
+        given_rollup_partials = compute_weather_rollup_partials(self.metrics_df)
+        self.database.read_dataframe.side_effect = lambda schema, table_name, **kwargs: compute_weather_rollup_partials(
+            self.metrics_df
+        )[table_name]
+
+        # When
+        outputs = update_weather_rollup_tables(
+            self.database, given_rollup_partials, write_mode=database_config.WRITE_MODE_APPEND
+        )
+
+        # Then
+        assert len(outputs) == 2
+        assert self.database.read_dataframe.call_args_list[0].kwargs["range_filter"] == (
+            "bucket_start",
+            pd.Timestamp("2022-05-26 18:00:00", tz="UTC"),
+            pd.Timestamp("2022-05-26 19:00:00", tz="UTC"),
+        )
+        daily_call = self.database.write_dataframe.call_args_list[1].kwargs
+        assert daily_call["table_name"] == database_config.WEATHER_METRICS_DAILY_TABLE_NAME
+        assert daily_call["write_mode"] == database_config.WRITE_MODE_UPSERT
+        assert daily_call["input_df"]["temperature_c_count"].tolist() == [4]
+        assert daily_call["input_df"]["temperature_c_mean"].tolist() == [2.0]
+
+    def test_update_weather_rollup_tables_in_truncate_mode_should_not_read_stored_rows(self):
+        # When
+        update_weather_rollup_tables(
+            self.database,
+            compute_weather_rollup_partials(self.metrics_df),
+            write_mode=database_config.WRITE_MODE_TRUNCATE_THEN_APPEND,
+        )
+
+        # Then
+        self.database.read_dataframe.assert_not_called()
+        assert [call.kwargs["write_mode"] for call in self.database.write_dataframe.call_args_list] == [
+            database_config.WRITE_MODE_TRUNCATE_THEN_APPEND
+        ] * 2
+
+    def test_load_weather_metrics_to_database_in_append_mode_should_only_load_new_and_changed_rows(self):
+        # Given
+        given_stored_df = add_weather_row_hashes(self.metrics_df)
+        given_metrics_df = pd.concat([self.metrics_df, self.metrics_df.tail(1)], ignore_index=True)
+        given_metrics_df.loc[1, "temperature_c"] = 4.0
+        given_metrics_df.loc[2, "timestamp"] = pd.Timestamp("2022-05-26 20:10:00", tz="UTC")
+
+        def read_dataframe(schema_name: str, table_name: str, **kwargs) -> pd.DataFrame:
+            if table_name == database_config.WEATHER_METRICS_TABLE_NAME:
+                return given_stored_df
+            return pd.DataFrame(columns=["bucket_start"])
+
+        self.database.read_dataframe.side_effect = read_dataframe
+
+        # When
+        outputs = load_weather_metrics_to_database(
+            self.database, given_metrics_df, write_mode=database_config.WRITE_MODE_APPEND
+        )
+
+        # Then
+        assert len(outputs) == 3
+        row_hashes_read_kwargs = self.database.read_dataframe.call_args_list[0].kwargs
+        assert row_hashes_read_kwargs["columns"] == ["timestamp", "row_hash"]
+        assert row_hashes_read_kwargs["range_filter"] == (
+            "timestamp",
+            pd.Timestamp("2022-05-26 18:10:00", tz="UTC"),
+            pd.Timestamp("2022-05-26 20:10:00", tz="UTC"),
+        )
+        metrics_table_calls = [
+            call.kwargs
+            for call in self.database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_TABLE_NAME
+        ]
+        assert [call["write_mode"] for call in metrics_table_calls] == [
+            database_config.WRITE_MODE_APPEND,
+            database_config.WRITE_MODE_UPSERT,
+        ]
+        assert metrics_table_calls[0]["input_df"]["timestamp"].dt.hour.tolist() == [20]
+        assert metrics_table_calls[1]["input_df"]["temperature_c"].tolist() == [4.0]
+        # Days of changed rows are rebuilt from the stored rows the load does not replace and from the loaded rows
+        daily_calls = [
+            call.kwargs
+            for call in self.database.write_dataframe.call_args_list
+            if call.kwargs["table_name"] == database_config.WEATHER_METRICS_DAILY_TABLE_NAME
+        ]
+        assert [call["write_mode"] for call in daily_calls] == [database_config.WRITE_MODE_UPSERT]
+        assert daily_calls[0]["input_df"]["temperature_c_count"].tolist() == [3]
+        assert daily_calls[0]["input_df"]["temperature_c_max"].tolist() == [4.0]
+        self.database.write_table_dataframes.assert_called_once()
+
+    def test_load_weather_metrics_to_database_retried_after_a_failed_rollup_write_should_update_rollups(self):
+        # Given
+        stored_tables = {
+            database_config.WEATHER_METRICS_TABLE_NAME: add_weather_row_hashes(self.metrics_df),
+            **compute_weather_rollup_partials(self.metrics_df),
+        }
+        failing_table_names = [database_config.WEATHER_METRICS_DAILY_TABLE_NAME]
+
+        def read_dataframe(schema_name: str, table_name: str, columns=None, range_filter=None, **kwargs):
+            range_column, range_min, range_max = range_filter
+            stored_df = stored_tables[table_name]
+            stored_df = stored_df[stored_df[range_column].between(range_min, range_max)]
+            return stored_df[columns].copy() if columns else stored_df.copy()
+
+        def write_table_dataframes(table_writes: Iterable[TableWrite], schema: str) -> int:
+            # Tables are only updated once every write went through, as in a transaction
+            written_tables = dict(stored_tables)
+            for table_write in table_writes:
+                if table_write.table_name in failing_table_names:
+                    failing_table_names.remove(table_write.table_name)
+                    raise ValueError("Write failed")
+                key_column = (
+                    "timestamp"
+                    if table_write.table_name == database_config.WEATHER_METRICS_TABLE_NAME
+                    else "bucket_start"
+                )
+                written_tables[table_write.table_name] = pd.concat(
+                    [written_tables[table_write.table_name], table_write.input_df]
+                ).drop_duplicates(subset=[key_column], keep="last")
+            stored_tables.update(written_tables)
+            return 0
+
+        self.database.read_dataframe.side_effect = read_dataframe
+        self.database.write_table_dataframes.side_effect = write_table_dataframes
+        given_metrics_df = self.metrics_df.copy()
+        given_metrics_df.loc[1, "temperature_c"] = 4.0
+
+        # When
+        with self.assertRaises(ValueError):
+            load_weather_metrics_to_database(
+                self.database, given_metrics_df, write_mode=database_config.WRITE_MODE_APPEND
+            )
+        load_weather_metrics_to_database(self.database, given_metrics_df, write_mode=database_config.WRITE_MODE_APPEND)
+
+        # Then
+        stored_metrics_df = stored_tables[database_config.WEATHER_METRICS_TABLE_NAME]
+        assert stored_metrics_df["temperature_c"].tolist() == [1.0, 4.0]
+        stored_daily_df = stored_tables[database_config.WEATHER_METRICS_DAILY_TABLE_NAME]
+        assert stored_daily_df["temperature_c_count"].tolist() == [2]
+        assert stored_daily_df["temperature_c_max"].tolist() == [4.0]
+        assert stored_tables[database_config.WEATHER_METRICS_HOURLY_TABLE_NAME]["temperature_c_max"].tolist() == [
+            1.0,
+            4.0,
+        ]
@@ -0,0 +1,226 @@
+import time
+import unittest
+from typing import Iterable, List
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from py_project.config import database_config, functions_config
+from py_project.domain.adapters.database import TableWrite
+from py_project.domain.entities.file_handler import FileHandler
+from py_project.domain.usecases.weather_stream_metrics import stream_weather_metrics_to_database
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
+
+TESTED_MODULE = "py_project.domain.usecases.weather_stream_metrics"
+
+RAW_FILE_HEADER = (
+    "Formatted Date,Summary,Temperature (C),Humidity,Wind Speed (km/h),Wind Bearing (degrees),"
+    "Visibility (km),Pressure (millibars)\n"
+)
+RAW_FILE_ROW = "2006-04-01 {hour:02d}:00:00.000 +0200,Cloudy,{temperature},0.89,14.11,251.0,15.82,1015.13\n"
+
+
+def get_raw_file_content(hours: range, temperature: float = 9.47) -> str:
+    return RAW_FILE_HEADER + "".join(RAW_FILE_ROW.format(hour=hour, temperature=temperature) for hour in hours)
+
+
+def read_empty_dataframe(schema_name: str, table_name: str, **kwargs) -> pd.DataFrame:
+    if table_name == database_config.WEATHER_METRICS_TABLE_NAME:
+        return pd.DataFrame(columns=["timestamp", "row_hash"])
+    return pd.DataFrame(columns=["bucket_start"])
+
+
+class TestWeatherStreamMetrics(unittest.TestCase):
+    def get_table_writes(self, table_name: str) -> List[TableWrite]:
+        return [table_write for table_write in self.table_writes if table_write.table_name == table_name]
+
+    def setUp(self):
+        self.file_system = InMemoryFileSystem()
+        for file_path, hours in [("raw/a.csv", range(2, 7)), ("raw/b.csv", range(7, 9))]:
+            with self.file_system.open(file_path, "w") as f:
+                f.write(get_raw_file_content(hours))
+        self.table_writes: List[TableWrite] = []
+
+        def write_table_dataframes(table_writes: Iterable[TableWrite], schema: str) -> int:
+            self.table_writes = [table_write for table_write in table_writes if not table_write.input_df.empty]
+            return sum(len(table_write.input_df) for table_write in self.table_writes)
+
+        self.database = MagicMock()
+        self.database.write_table_dataframes.side_effect = write_table_dataframes
+        self.database.read_dataframe.side_effect = read_empty_dataframe
+
+    def test_stream_weather_metrics_to_database_should_write_computed_chunks(self):
+        # When
+        inputs, outputs, duplicate_rows = stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system),
+            input_file_paths=["raw/a.csv", "raw/b.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+            chunk_rows=2,
+        )
+
+        # Then
+        assert inputs == ["raw/a.csv", "raw/b.csv"]
+        assert outputs == [
+            f"{database_config.DEFAULT_DATABASE}/{database_config.DEFAULT_SCHEMA}/{table_name}"
+            for table_name in [
+                database_config.WEATHER_METRICS_TABLE_NAME,
+                database_config.WEATHER_METRICS_HOURLY_TABLE_NAME,
+                database_config.WEATHER_METRICS_DAILY_TABLE_NAME,
+            ]
+        ]
+        daily_rollup_writes = self.get_table_writes(database_config.WEATHER_METRICS_DAILY_TABLE_NAME)
+        assert daily_rollup_writes[0].input_df["temperature_c_count"].tolist() == [7]
+        # Files are streamed backwards for the last file to win, rollups being written in the same transaction
+        metrics_writes = self.get_table_writes(database_config.WEATHER_METRICS_TABLE_NAME)
+        assert [len(table_write.input_df) for table_write in metrics_writes] == [2, 2, 2, 1]
+        assert self.table_writes[-1].table_name == database_config.WEATHER_METRICS_DAILY_TABLE_NAME
+        assert duplicate_rows == 0
+        assert metrics_writes[0].input_df.columns.tolist()[-2:] == ["wind_power_kw", "row_hash"]
+        assert {table_write.write_mode for table_write in metrics_writes} == {database_config.WRITE_MODE_APPEND}
+        self.database.write_table_dataframes.assert_called_once()
+
+    def test_stream_weather_metrics_to_database_without_rows_should_not_output_table(self):
+        # When
+        _, outputs, _ = stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system), input_file_paths=[], database=self.database
+        )
+
+        # Then
+        assert outputs == []
+
+    def test_stream_weather_metrics_to_database_should_drop_overlapping_rows_of_earlier_files(self):
+        # Given
+        with self.file_system.open("raw/c.csv", "w") as f:
+            f.write(get_raw_file_content(range(6, 8), temperature=20.0))
+
+        # When
+        _, _, duplicate_rows = stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system),
+            input_file_paths=["raw/a.csv", "raw/b.csv", "raw/c.csv"],
+            database=self.database,
+            chunk_rows=2,
+            deduplication_policy=functions_config.DEDUPLICATION_POLICY_LAST_FILE_WINS,
+        )
+
+        # Then
+        written_df = pd.concat(
+            [table_write.input_df for table_write in self.get_table_writes(database_config.WEATHER_METRICS_TABLE_NAME)]
+        )
+        assert duplicate_rows == 2
+        assert len(written_df) == 7
+        assert written_df.loc[written_df["timestamp"].dt.hour.isin([4, 5]), "temperature_c"].tolist() == [20.0, 20.0]
+
+    def test_stream_weather_metrics_to_database_should_upsert_changed_rows_along_their_chunk(self):
+        # Given
+        stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system),
+            input_file_paths=["raw/a.csv", "raw/b.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+            chunk_rows=2,
+        )
+        given_stored_df = pd.concat(
+            [table_write.input_df for table_write in self.get_table_writes(database_config.WEATHER_METRICS_TABLE_NAME)],
+            ignore_index=True,
+        )
+        # Rows of the first file are stored, two of them in different chunks having changed since
+        given_stored_df = given_stored_df[given_stored_df["timestamp"].dt.hour <= 4].reset_index(drop=True)
+        given_stored_df.loc[given_stored_df["timestamp"].dt.hour.isin([0, 3]), ["temperature_c", "row_hash"]] = [
+            30.0,
+            0,
+        ]
+        self.database.read_dataframe.side_effect = lambda schema_name, table_name, columns=None, **kwargs: (
+            given_stored_df[columns or given_stored_df.columns].copy()
+            if table_name == database_config.WEATHER_METRICS_TABLE_NAME
+            else read_empty_dataframe(schema_name, table_name)
+        )
+
+        # When
+        _, outputs, _ = stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system),
+            input_file_paths=["raw/a.csv", "raw/b.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+            chunk_rows=2,
+        )
+
+        # Then
+        metrics_writes = self.get_table_writes(database_config.WEATHER_METRICS_TABLE_NAME)
+        # Changed rows are upserted along the chunk they were found in, rather than once every chunk was copied
+        assert [(table_write.write_mode, len(table_write.input_df)) for table_write in metrics_writes] == [
+            (database_config.WRITE_MODE_APPEND, 2),
+            (database_config.WRITE_MODE_UPSERT, 1),
+            (database_config.WRITE_MODE_UPSERT, 1),
+        ]
+        assert metrics_writes[1].input_df["temperature_c"].tolist() == [9.47]
+        # The day of the changed row is rebuilt from the stored rows the stream does not replace and the streamed ones
+        daily_rollup_writes = self.get_table_writes(database_config.WEATHER_METRICS_DAILY_TABLE_NAME)
+        assert daily_rollup_writes[0].input_df["temperature_c_count"].tolist() == [7]
+        assert daily_rollup_writes[0].input_df["temperature_c_max"].tolist() == [9.47]
+        assert len(outputs) == 3
+
+    def test_stream_weather_metrics_to_database_with_changed_rows_should_compute_a_bounded_number_of_chunks_ahead(self):
+        # Given
+        given_max_queued_chunks = 1
+        stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system),
+            input_file_paths=["raw/a.csv", "raw/b.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+        )
+        # Every stored row changed since, so that every chunk comes with changed rows
+        given_stored_df = pd.concat(
+            [table_write.input_df for table_write in self.get_table_writes(database_config.WEATHER_METRICS_TABLE_NAME)],
+            ignore_index=True,
+        ).assign(row_hash=0)
+        self.table_writes = []
+        computed_chunks = []
+        chunks_ahead = []
+
+        def read_dataframe(schema_name: str, table_name: str, columns=None, **kwargs) -> pd.DataFrame:
+            if table_name != database_config.WEATHER_METRICS_TABLE_NAME:
+                return read_empty_dataframe(schema_name, table_name)
+            # Stored hashes are read once per computed chunk, then once for the rollups of the changed days
+            computed_chunks.append(table_name)
+            return given_stored_df[columns or given_stored_df.columns].copy()
+
+        def write_table_dataframes(table_writes: Iterable[TableWrite], schema: str) -> int:
+            consumed_chunks = 0
+            for table_write in table_writes:
+                if (
+                    table_write.table_name == database_config.WEATHER_METRICS_TABLE_NAME
+                    and table_write.write_mode == database_config.WRITE_MODE_UPSERT
+                ):
+                    consumed_chunks += 1
+                    # The load waits for the compute to stop running ahead of it
+                    computed_chunk_count = -1
+                    while computed_chunk_count != len(computed_chunks):
+                        computed_chunk_count = len(computed_chunks)
+                        time.sleep(0.1)
+                    chunks_ahead.append(computed_chunk_count - consumed_chunks)
+                self.table_writes.append(table_write)
+            return 0
+
+        self.database.read_dataframe.side_effect = read_dataframe
+        self.database.write_table_dataframes.side_effect = write_table_dataframes
+
+        # When
+        stream_weather_metrics_to_database(
+            source_file_handler=FileHandler(self.file_system),
+            input_file_paths=["raw/a.csv", "raw/b.csv"],
+            database=self.database,
+            ingestion_mode=functions_config.INCREMENTAL_INGESTION_MODE,
+            chunk_rows=1,
+            max_queued_chunks=given_max_queued_chunks,
+        )
+
+        # Then
+        metrics_writes = self.get_table_writes(database_config.WEATHER_METRICS_TABLE_NAME)
+        assert [(table_write.write_mode, len(table_write.input_df)) for table_write in metrics_writes] == [
+            (database_config.WRITE_MODE_APPEND, 0),
+            (database_config.WRITE_MODE_UPSERT, 1),
+        ] * 7
+        # At most max_queued_chunks chunks wait to be loaded, one more being computed
+        assert len(chunks_ahead) == 7
+        assert max(chunks_ahead) <= given_max_queued_chunks + 1
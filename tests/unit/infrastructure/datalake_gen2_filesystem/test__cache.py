@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from py_project.infrastructure.datalake_gen2_filesystem import DataLakeGen2FileSystem, LocalDiskReadCache
+
+TESTED_MODULE = "py_project.infrastructure.datalake_gen2_filesystem"
+
+
+def given_download_fn(file_path: str, local_file_path: str):
+    with open(local_file_path, "w") as f:
+        f.write(f"content of {file_path}")
+
+
+class TestLocalDiskReadCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_folder = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_open_should_download_file_only_once_per_etag(self):
+        # Given
+        given_cache = LocalDiskReadCache(self.cache_folder)
+        mock_download_fn = MagicMock(side_effect=given_download_fn)
+
+        # When
+        with given_cache.open("container/a.csv", "r", etag="etag_1", download_fn=mock_download_fn) as f:
+            content = f.read()
+        given_cache.open("container/a.csv", "r", etag="etag_1", download_fn=mock_download_fn).close()
+        given_cache.open("container/a.csv", "r", etag="etag_2", download_fn=mock_download_fn).close()
+
+        # Then
+        assert content == "content of container/a.csv"
+        assert mock_download_fn.call_count == 2
+        assert given_cache.get_stats()["hits"] == 1
+        assert given_cache.get_stats()["misses"] == 2
+
+    def test_open_should_evict_least_recently_used_files(self):
+        # Given
+        given_cache = LocalDiskReadCache(self.cache_folder, max_bytes=40)
+        for file_path in ["a", "b", "a", "c"]:
+            given_cache.open(file_path, "r", etag=None, download_fn=given_download_fn).close()
+
+        # When
+        given_cache.open("d", "r", etag=None, download_fn=given_download_fn).close()
+
+        # Then
+        assert given_cache.get_stats()["evictions"] == 1
+        assert given_cache.get_stats()["sizeBytes"] <= 40
+        assert given_cache.get_cache_key("b", None) not in given_cache.entries
+        assert given_cache.get_cache_key("a", None) in given_cache.entries
+        assert len(os.listdir(self.cache_folder)) == 3
+
+    def test_init_should_reuse_cached_files(self):
+        # Given
+        LocalDiskReadCache(self.cache_folder).open("a", "r", etag=None, download_fn=given_download_fn).close()
+        mock_download_fn = MagicMock(side_effect=given_download_fn)
+
+        # When
+        given_cache = LocalDiskReadCache(self.cache_folder)
+        given_cache.open("a", "r", etag=None, download_fn=mock_download_fn).close()
+
+        # Then
+        mock_download_fn.assert_not_called()
+        assert given_cache.get_stats()["hitRatio"] == 1.0
+
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    def test_data_lake_file_system_should_read_through_cache(
+        self, mock_fsspec_filesystem: MagicMock, mock_blob_service_client: MagicMock
+    ):
+        # Given
+        given_file_system = DataLakeGen2FileSystem(
+            client_id="",
+            client_secret="",
+            tenant_id="",
+            adls_account_name="account",
+            is_adls_connection_anonymous=True,
+            read_cache=LocalDiskReadCache(self.cache_folder),
+        )
+        given_file_system.file_system_client.info.return_value = {"etag": "given_etag"}
+        given_file_system.file_system_client.get_file.side_effect = given_download_fn
+
+        # When
+        for _ in range(3):
+            given_file_system.open("container/a.csv", "rb").close()
+        given_file_system.open("container/a.csv", "wb")
+
+        # Then
+        given_file_system.file_system_client.get_file.assert_called_once()
+        given_file_system.file_system_client.open.assert_called_once_with("container/a.csv", "wb")
+        assert given_file_system.read_cache.get_stats()["hits"] == 2
+        assert dict(given_file_system.round_trip_counts) == {"info": 3, "get_file": 1, "open": 1}
@@ -0,0 +1,252 @@
+import asyncio
+import datetime
+import io
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+from azure.storage.blob import BlobPrefix, BlobProperties
+
+from py_project.infrastructure.datalake_gen2_filesystem import AsyncDataLakeGen2FileSystem, DataLakeGen2FileSystem
+
+TESTED_MODULE = "py_project.infrastructure.datalake_gen2_filesystem"
+
+
+class TestDataLakeGen2FileSystem(unittest.TestCase):
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    def setUp(self, mock_fsspec_filesystem: MagicMock, mock_blob_service_client: MagicMock):
+        self.file_system = self.given_file_system()
+        self.container_client = self.file_system.blob_service_client.get_container_client.return_value
+
+    @staticmethod
+    def given_file_system(skip_existence_checks: bool = False) -> DataLakeGen2FileSystem:
+        return DataLakeGen2FileSystem(
+            client_id="",
+            client_secret="",
+            tenant_id="",
+            adls_account_name="account",
+            is_adls_connection_anonymous=True,
+            skip_existence_checks=skip_existence_checks,
+        )
+
+    @staticmethod
+    def given_blob(name: str, metadata: dict = None) -> BlobProperties:
+        blob = BlobProperties()
+        blob.name = name
+        blob.size = 10
+        blob.last_modified = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+        blob.etag = f"etag_{name}"
+        blob.metadata = metadata or {}
+        return blob
+
+    def test_iter_file_details_should_skip_folders(self):
+        # Given
+        self.container_client.walk_blobs.return_value.by_page.return_value = iter(
+            [
+                [self.given_blob("raw/weather/a.csv"), BlobPrefix(prefix="raw/weather/sub/")],
+                [self.given_blob("raw/weather/folder", metadata={"hdi_isfolder": "true"})],
+            ]
+        )
+
+        # When
+        file_details = list(self.file_system.iter_file_details("/container/raw/weather", prefix="a"))
+
+        # Then
+        self.file_system.blob_service_client.get_container_client.assert_called_once_with("container")
+        assert self.container_client.walk_blobs.call_args.kwargs["name_starts_with"] == "raw/weather/a"
+        assert [details.path for details in file_details] == ["/container/raw/weather/a.csv"]
+        assert file_details[0].etag == "etag_raw/weather/a.csv"
+        assert file_details[0].last_modified == datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+        assert self.file_system.round_trip_counts["list_page"] == 2
+
+    def test_iter_file_details_recursively(self):
+        # Given
+        self.container_client.list_blobs.return_value.by_page.return_value = iter([[self.given_blob("raw/2021/a.csv")]])
+
+        # When
+        file_details = list(self.file_system.iter_files("container/raw", recursive=True, pattern="2021/*.csv"))
+
+        # Then
+        self.container_client.list_blobs.assert_called_once()
+        assert [details.path for details in file_details] == ["container/raw/2021/a.csv"]
+
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    @patch(f"{TESTED_MODULE}._classes.pd.read_parquet")
+    def test_read_parquet_should_check_existence_by_default(
+        self, mock_read_parquet: MagicMock, mock_fsspec_filesystem: MagicMock, mock_blob_service_client: MagicMock
+    ):
+        # Given
+        given_file_system = self.given_file_system()
+
+        # When
+        given_file_system.read_parquet("container/file.parquet")
+
+        # Then
+        given_file_system.file_system_client.exists.assert_called_once_with("container/file.parquet")
+        assert given_file_system.get_round_trip_count() == 2
+
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    @patch(f"{TESTED_MODULE}._classes.pd.read_parquet")
+    def test_read_parquet_without_existence_checks(
+        self, mock_read_parquet: MagicMock, mock_fsspec_filesystem: MagicMock, mock_blob_service_client: MagicMock
+    ):
+        # Given
+        given_file_system = self.given_file_system(skip_existence_checks=True)
+        given_file_system.file_system_client.open.side_effect = [MagicMock(), FileNotFoundError()]
+
+        # When
+        given_file_system.read_parquet("container/file.parquet")
+        missing_df = given_file_system.read_parquet("container/missing.parquet")
+
+        # Then
+        given_file_system.file_system_client.exists.assert_not_called()
+        mock_read_parquet.assert_called_once()
+        assert missing_df is None
+        assert dict(given_file_system.round_trip_counts) == {"open": 2}
+
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    def test_mkdir_without_existence_checks_should_cache_folders(
+        self, mock_fsspec_filesystem: MagicMock, mock_blob_service_client: MagicMock
+    ):
+        # Given
+        given_file_system = self.given_file_system(skip_existence_checks=True)
+
+        # When
+        given_file_system.mkdir("container/folder")
+        given_file_system.mkdir("/container/folder/")
+        is_folder = given_file_system.isdir("container/folder")
+
+        # Then
+        assert is_folder
+        given_file_system.file_system_client.touch.assert_called_once()
+        given_file_system.file_system_client.isdir.assert_not_called()
+        assert given_file_system.get_round_trip_count() == 2
+
+    def test_count_round_trip_should_count_calls_of_concurrent_threads(self):
+        # Given
+        given_thread_count = 8
+        given_call_count = 10000
+
+        def count_round_trips(thread_index: int):
+            for _ in range(given_call_count):
+                self.file_system.count_round_trip("open")
+                self.file_system.add_known_folder(f"container/folder_{thread_index}")
+
+        # When
+        threads = [threading.Thread(target=count_round_trips, args=(index,)) for index in range(given_thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        assert self.file_system.get_round_trip_count() == given_thread_count * given_call_count
+        assert all(
+            self.file_system.is_known_folder(f"/container/folder_{index}/") for index in range(given_thread_count)
+        )
+
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    def test_blob_service_client_should_share_the_adlfs_endpoint(self, mock_blob_service_client: MagicMock):
+        # Given
+        given_account_host = "127.0.0.1:10000/devstoreaccount1"
+
+        # When
+        given_file_system = DataLakeGen2FileSystem(
+            client_id="",
+            client_secret="",
+            tenant_id="",
+            adls_account_name="devstoreaccount1",
+            is_adls_connection_anonymous=True,
+            account_host=given_account_host,
+        )
+
+        default_file_system = DataLakeGen2FileSystem(
+            client_id="",
+            client_secret="",
+            tenant_id="",
+            adls_account_name="devstoreaccount1",
+            is_adls_connection_anonymous=True,
+        )
+
+        # Then
+        assert given_file_system.file_system_client.account_url == f"https://{given_account_host}"
+        assert mock_blob_service_client.call_args_list[0].kwargs["account_url"] == f"https://{given_account_host}"
+        # The file system of the default endpoint is not connected to the given host
+        assert default_file_system.file_system_client.account_url == "https://devstoreaccount1.blob.core.windows.net"
+
+    @patch(f"{TESTED_MODULE}._classes.BlobServiceClient")
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    def test_write_parquet_should_upload_staged_blocks(
+        self, mock_fsspec_filesystem: MagicMock, mock_blob_service_client: MagicMock
+    ):
+        # Given
+        given_file_system = DataLakeGen2FileSystem(
+            client_id="",
+            client_secret="",
+            tenant_id="",
+            adls_account_name="account",
+            is_adls_connection_anonymous=True,
+            skip_existence_checks=True,
+            multipart_upload_block_size=64,
+            multipart_upload_max_concurrency=4,
+        )
+        given_df = pd.DataFrame({"value": list(range(100))})
+        staged_blocks = {}
+        staged_blocks_lock = threading.Lock()
+
+        def given_stage_block(block_id: str, data: bytes):
+            with staged_blocks_lock:
+                staged_blocks[block_id] = data
+
+        given_blob_client = given_file_system.blob_service_client.get_blob_client.return_value
+        given_blob_client.stage_block.side_effect = given_stage_block
+
+        # When
+        given_file_system.write_parquet(given_df, "/container/folder/file.parquet")
+
+        # Then
+        given_file_system.blob_service_client.get_blob_client.assert_called_once_with(
+            container="container", blob="folder/file.parquet"
+        )
+        committed_block_ids = given_blob_client.commit_block_list.call_args.args[0]
+        assert len(committed_block_ids) > 1
+        assert len(set(map(len, committed_block_ids))) == 1
+        uploaded_bytes = b"".join(staged_blocks[block_id] for block_id in committed_block_ids)
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(uploaded_bytes)), given_df)
+        given_file_system.file_system_client.open.assert_not_called()
+        assert given_file_system.round_trip_counts["stage_block"] == len(committed_block_ids)
+
+
+class TestAsyncDataLakeGen2FileSystem(unittest.TestCase):
+    @patch(f"{TESTED_MODULE}._classes.fsspec.filesystem")
+    def test_read_and_write_bytes(self, mock_fsspec_filesystem: MagicMock):
+        # Given
+        given_file_system = AsyncDataLakeGen2FileSystem(
+            client_id="", client_secret="", tenant_id="", adls_account_name="account"
+        )
+        given_file_system.file_system_client._cat_file = AsyncMock(return_value=b"given_bytes")
+        given_file_system.file_system_client._pipe_file = AsyncMock()
+        given_file_system.file_system_client._ls = AsyncMock(return_value=["container/folder/a.csv"])
+
+        async def given_operations():
+            return (
+                await given_file_system.read_bytes("container/folder/a.csv"),
+                await given_file_system.write_bytes("container/folder/b.csv", b"given_bytes"),
+                await given_file_system.ls("/container/folder"),
+            )
+
+        # When
+        read_bytes, _, filenames = asyncio.run(given_operations())
+
+        # Then
+        assert mock_fsspec_filesystem.call_args.kwargs["asynchronous"] is True
+        assert read_bytes == b"given_bytes"
+        given_file_system.file_system_client._pipe_file.assert_awaited_once_with(
+            "container/folder/b.csv", b"given_bytes"
+        )
+        assert filenames == ["a.csv"]
@@ -1,7 +1,10 @@
 import functools
 import json
 import os
+import shutil
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, List
 from unittest.mock import MagicMock, patch
@@ -15,9 +18,20 @@ from py_project.domain.adapters.orchestrator_state_service import (
 )
 from py_project.infrastructure.functions_orchestrator_state_service import (
     FunctionsOrchestratorBuilder,
+    FunctionsOrchestratorJsonLinesStateService,
     FunctionsOrchestratorStateService,
     FunctionsOrchestratorTaskManager,
 )
+from py_project.infrastructure.functions_orchestrator_state_service._classes import (
+    compute_critical_path,
+    fuse_task_list,
+    sort_task_graph,
+    split_in_batches,
+)
+from py_project.infrastructure.functions_orchestrator_state_service._exceptions import (
+    InvalidStateFlushPolicyError,
+    InvalidTaskGraphError,
+)
 from py_project.infrastructure.local_filesystem import LocalFileSystem
 
 TESTED_MODULE = "py_project.infrastructure.functions_orchestrator_state_service"
@@ -49,10 +63,14 @@ class TestOrchestratorStateService(unittest.TestCase):
         # Then
         assert current_utc_date == expected_current_utc_date
 
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.lock_metadata", MagicMock())
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.save_catalog")
     @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.write_state_file")
     @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.read_state_file")
     @patch(f"{TESTED_MODULE}._classes.LocalFileSystem.exists")
-    def test_save_state_when_previous_logs_exist(self, mock_fs_exists, mock_read_state_file, mock_write_state_file):
+    def test_save_state_when_previous_logs_exist(
+        self, mock_fs_exists, mock_read_state_file, mock_write_state_file, mock_save_catalog
+    ):
         # Given
         given_log_file_system: FunctionsOrchestratorStateService = FunctionsOrchestratorStateService(self.file_system)
         given_log_file_path: str = "path/to/log.json"
@@ -76,6 +94,7 @@ class TestOrchestratorStateService(unittest.TestCase):
         mock_fs_exists.assert_called_once()
         mock_read_state_file.assert_called_once()
         mock_write_state_file.assert_called_once()
+        mock_save_catalog.assert_called_once_with([json.loads(OrchestratorState.to_json(given_state))], "path/to")
 
     @patch(f"{TESTED_MODULE}._classes.LocalFileSystem.open")
     @patch(f"{TESTED_MODULE}._classes.LocalFileSystem.exists")
@@ -112,11 +131,17 @@ class TestOrchestratorStateService(unittest.TestCase):
         # Then
         mock_fs_open.assert_called_once()
 
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.lock_metadata", MagicMock())
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.save_catalog")
     @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.write_state_file")
     @patch(f"{TESTED_MODULE}.FunctionsOrchestratorStateService.read_state_file")
     @patch(f"{TESTED_MODULE}._classes.LocalFileSystem.exists")
     def test_save_state_when_no_previous_states(
-        self, mock_fs_exists: MagicMock, mock_read_state_file: MagicMock, mock_write_state_file: MagicMock
+        self,
+        mock_fs_exists: MagicMock,
+        mock_read_state_file: MagicMock,
+        mock_write_state_file: MagicMock,
+        mock_save_catalog: MagicMock,
     ):
         # Given
         given_log_file_system: FunctionsOrchestratorStateService = FunctionsOrchestratorStateService(self.file_system)
@@ -203,6 +228,242 @@ class TestOrchestratorStateService(unittest.TestCase):
         # Then
         assert last_state.job_id == "given_job_id"
 
+    def test_get_last_state_given_status_should_use_catalog_updated_on_save(self):
+        # Given
+        with tempfile.TemporaryDirectory() as given_log_folder_path:
+            given_log_file_system = FunctionsOrchestratorStateService(self.file_system)
+            given_log_file_path = f"{given_log_folder_path}/LOG_20210101.json"
+            for execution_time, base, job_id in [(1.0, "BASE_A", "job_a"), (2.0, "BASE_B", "job_b")]:
+                given_log_file_system.save_state(
+                    OrchestratorState(
+                        execution_time=execution_time, base=base, mode="", status="task COMPLETED", job_id=job_id
+                    ),
+                    given_log_file_path,
+                )
+
+            # When
+            with patch.object(given_log_file_system, "read_state_file") as mock_read_state_file:
+                last_state = given_log_file_system.get_last_state_given_status(given_log_folder_path, "task COMPLETED")
+                last_base_state = given_log_file_system.get_last_state_given_status(
+                    given_log_folder_path, "task COMPLETED", base="BASE_A"
+                )
+
+            # Then
+            assert last_state.job_id == "job_b"
+            assert last_base_state.job_id == "job_a"
+            mock_read_state_file.assert_not_called()
+            assert os.path.exists(f"{given_log_folder_path}/_checkpoints.json")
+            assert given_log_file_system.get_last_state(given_log_folder_path).job_id == "job_b"
+
+    def test_save_state_should_keep_catalog_entry_of_latest_execution(self):
+        # Given
+        with tempfile.TemporaryDirectory() as given_log_folder_path:
+            given_log_file_system = FunctionsOrchestratorStateService(self.file_system)
+            given_log_file_path = f"{given_log_folder_path}/LOG_20210101.json"
+
+            # When
+            # The older orchestration completes after the newer one
+            for execution_time, job_id in [(2.0, "job_new"), (1.0, "job_old")]:
+                given_log_file_system.save_state(
+                    OrchestratorState(
+                        execution_time=execution_time, base="BASE", mode="", status="task COMPLETED", job_id=job_id
+                    ),
+                    given_log_file_path,
+                )
+
+            # Then
+            catalog = given_log_file_system.read_catalog(given_log_folder_path)
+            assert catalog["BASE"]["task COMPLETED"]["jobId"] == "job_new"
+            assert given_log_file_system.rebuild_catalog(given_log_folder_path) == catalog
+
+    def test_save_state_should_keep_catalog_entries_of_concurrent_orchestrations(self):
+        # Given
+        given_bases = [f"BASE_{index}" for index in range(8)]
+
+        with tempfile.TemporaryDirectory() as given_log_folder_path:
+
+            def save_base_states(base: str):
+                # Every orchestration has its own service, as activities do
+                given_log_file_system = FunctionsOrchestratorStateService(LocalFileSystem())
+                for execution_time in range(10):
+                    given_log_file_system.save_state(
+                        OrchestratorState(
+                            execution_time=float(execution_time),
+                            base=base,
+                            mode="",
+                            status="task COMPLETED",
+                            job_id=f"{base}_job_{execution_time}",
+                        ),
+                        f"{given_log_folder_path}/LOG_20210101.json",
+                    )
+
+            # When
+            with ThreadPoolExecutor(max_workers=len(given_bases)) as executor:
+                list(executor.map(save_base_states, given_bases))
+
+            # Then
+            catalog = FunctionsOrchestratorStateService(self.file_system).read_catalog(given_log_folder_path)
+            assert sorted(catalog) == given_bases
+            assert all(catalog[base]["task COMPLETED"]["jobId"] == f"{base}_job_9" for base in given_bases)
+            with open(f"{given_log_folder_path}/LOG_20210101.json") as f:
+                assert len(json.load(f)) == 80
+
+    def test_rebuild_catalog(self):
+        # Given
+        with tempfile.TemporaryDirectory() as given_log_folder_path:
+            given_log_file_system = FunctionsOrchestratorStateService(self.file_system)
+            for state_filename in os.listdir(self.state_files_folder_path):
+                shutil.copy(f"{self.state_files_folder_path}/{state_filename}", given_log_folder_path)
+
+            # When
+            catalog = given_log_file_system.rebuild_catalog(given_log_folder_path)
+
+            # Then
+            assert given_log_file_system.read_catalog(given_log_folder_path) == catalog
+            assert (
+                given_log_file_system.get_last_state_given_status(given_log_folder_path, "given_task TARGET").job_id
+                == "given_job_target_id"
+            )
+
+
+class TestJsonLinesOrchestratorStateService(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_folder_path = self.tmp_dir.name
+        self.file_system = LocalFileSystem()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def given_state(job_id: str, status: str, execution_time: float = 0.0) -> OrchestratorState:
+        return OrchestratorState(execution_time=execution_time, base="", mode="", status=status, job_id=job_id)
+
+    def test_save_state_should_append_states_and_update_index(self):
+        # Given
+        given_state_service = FunctionsOrchestratorJsonLinesStateService(self.file_system)
+        given_log_file_path = f"{self.log_folder_path}/LOG_20210101.jsonl"
+
+        # When
+        given_state_service.save_state(self.given_state("job_a", "task COMPLETED"), given_log_file_path)
+        given_state_service.save_states(
+            [self.given_state("job_b", "task RUNNING"), self.given_state("job_b", "task COMPLETED")],
+            given_log_file_path,
+        )
+        given_state_service.save_state(self.given_state("job_c", "task RUNNING"), given_log_file_path)
+
+        # Then
+        with open(given_log_file_path, "r") as f:
+            assert len(f.readlines()) == 4
+        assert given_state_service.get_last_state(self.log_folder_path).job_id == "job_c"
+        assert given_state_service.get_last_state_given_status(self.log_folder_path, "task COMPLETED").job_id == "job_b"
+        assert given_state_service.get_last_state_given_status(self.log_folder_path, "task FAILED") is None
+        assert given_state_service.get_last_job_status(self.log_folder_path, "job_b")["status"] == "task COMPLETED"
+
+    def test_get_last_state_given_status_should_not_read_state_files(self):
+        # Given
+        given_state_service = FunctionsOrchestratorJsonLinesStateService(self.file_system)
+        given_log_file_path = f"{self.log_folder_path}/LOG_20210101.jsonl"
+        given_state_service.save_state(self.given_state("job_a", "task RUNNING"), given_log_file_path)
+        given_state_service.save_state(self.given_state("job_a", "task COMPLETED"), given_log_file_path)
+
+        # When
+        with patch.object(given_state_service, "read_state_file") as mock_read_state_file:
+            last_state = given_state_service.get_last_state_given_status(self.log_folder_path, "task RUNNING")
+
+        # Then
+        assert last_state.job_id == "job_a"
+        mock_read_state_file.assert_not_called()
+
+    def test_save_state_should_keep_catalog_in_index(self):
+        # Given
+        given_state_service = FunctionsOrchestratorJsonLinesStateService(self.file_system)
+        given_log_file_path = f"{self.log_folder_path}/LOG_20210101.jsonl"
+        given_state_service.save_state(self.given_state("job_a", "task COMPLETED"), given_log_file_path)
+
+        # When
+        with patch.object(given_state_service, "write_metadata_file", wraps=given_state_service.write_metadata_file):
+            given_state_service.save_state(self.given_state("job_b", "task COMPLETED", 1.0), given_log_file_path)
+            written_metadata_file_paths = [
+                call.args[1] for call in given_state_service.write_metadata_file.call_args_list
+            ]
+
+        # Then
+        assert written_metadata_file_paths == [given_state_service.get_index_file_path(self.log_folder_path)]
+        assert sorted(os.listdir(self.log_folder_path)) == ["LOG_20210101.jsonl", "_index.json", "_metadata.lock"]
+        assert given_state_service.read_catalog(self.log_folder_path)[""]["task COMPLETED"]["jobId"] == "job_b"
+
+    def test_save_state_should_keep_index_checkpoint_of_latest_execution(self):
+        # Given
+        given_state_service = FunctionsOrchestratorJsonLinesStateService(self.file_system)
+        given_log_file_path = f"{self.log_folder_path}/LOG_20210101.jsonl"
+
+        # When
+        # The older orchestration completes after the newer one
+        given_state_service.save_state(self.given_state("job_new", "task COMPLETED", 2.0), given_log_file_path)
+        given_state_service.save_state(self.given_state("job_old", "task COMPLETED", 1.0), given_log_file_path)
+
+        # Then
+        last_state = given_state_service.get_last_state_given_status(self.log_folder_path, "task COMPLETED")
+        assert last_state.job_id == "job_new"
+        assert given_state_service.rebuild_catalog(self.log_folder_path)[""]["task COMPLETED"]["jobId"] == "job_new"
+
+    def test_save_state_should_compress_state_file(self):
+        # Given
+        given_state_service = FunctionsOrchestratorJsonLinesStateService(self.file_system, compress=True)
+        given_log_filename = given_state_service.get_log_filename("LOG_YYYYMMDD.jsonl", "YYYYMMDD")
+        given_log_file_path = f"{self.log_folder_path}/{given_log_filename}"
+
+        # When
+        given_state_service.save_state(self.given_state("job_a", "task RUNNING"), given_log_file_path)
+        given_state_service.save_state(self.given_state("job_b", "task RUNNING"), given_log_file_path)
+
+        # Then
+        assert given_log_filename.endswith(".jsonl.gz")
+        state_dicts = given_state_service.read_state_file(given_log_file_path)
+        assert [state_dict["jobId"] for state_dict in state_dicts] == ["job_a", "job_b"]
+
+    def test_get_last_state_should_rebuild_missing_index(self):
+        # Given
+        given_state_service = FunctionsOrchestratorJsonLinesStateService(self.file_system)
+        given_state_service.write_state_file(
+            [
+                json.loads(OrchestratorState.to_json(self.given_state("job_a", "task COMPLETED"))),
+                json.loads(OrchestratorState.to_json(self.given_state("job_b", "task RUNNING"))),
+            ],
+            f"{self.log_folder_path}/LOG_20210101.jsonl",
+        )
+
+        # When
+        last_state = given_state_service.get_last_state(self.log_folder_path)
+
+        # Then
+        assert last_state.job_id == "job_b"
+        assert os.path.exists(given_state_service.get_index_file_path(self.log_folder_path))
+
+    def test_save_states_should_keep_index_entries_of_concurrent_orchestrations(self):
+        # Given
+        given_job_ids = [f"job_{index}" for index in range(8)]
+
+        def save_job_states(job_id: str):
+            # Every orchestration has its own service, as activities do
+            given_state_service = FunctionsOrchestratorJsonLinesStateService(LocalFileSystem())
+            for execution_time in range(10):
+                given_state_service.save_state(
+                    self.given_state(job_id, "task RUNNING", float(execution_time)),
+                    f"{self.log_folder_path}/LOG_{job_id}.jsonl",
+                )
+
+        # When
+        with ThreadPoolExecutor(max_workers=len(given_job_ids)) as executor:
+            list(executor.map(save_job_states, given_job_ids))
+
+        # Then
+        index = FunctionsOrchestratorJsonLinesStateService(self.file_system).read_index(self.log_folder_path)
+        assert sorted(index["lastStatusByJob"]) == given_job_ids
+        assert index["checkpoints"][""]["task RUNNING"]["executionTime"] == 9.0
+        assert not [filename for filename in os.listdir(self.log_folder_path) if filename.endswith(".tmp")]
+
 
 class TestOrchestratorTaskManager(unittest.TestCase):
     def setUp(self) -> None:
@@ -247,6 +508,238 @@ class TestOrchestratorTaskManager(unittest.TestCase):
         mock_log_state.assert_called_once()
         mock_update_state.assert_called_once()
 
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.log_state")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.do_task")
+    def test_execute_fan_out_task(self, mock_do_task: MagicMock, mock_log_state: MagicMock):
+        # Given
+        given_task_name = "given_task_name"
+        given_context = MagicMock()
+        given_context.current_utc_datetime = datetime(2021, 11, 19, 00, 00, 00)
+        given_orchestrator_task_manager: FunctionsOrchestratorTaskManager = FunctionsOrchestratorTaskManager(
+            orchestrator_context=given_context,
+            orchestrator_state=self.given_orchestrator_state,
+            task_logger_name="given_logger_name",
+        )
+        given_payload = {"file_paths": ["a", "b", "c"]}
+        given_batch_results = [
+            ProcessingItem(step_name=given_task_name, start_time=0.0, end_time=1.0, inputs=["a", "b"]),
+            ProcessingItem(step_name=given_task_name, start_time=0.0, end_time=2.0, inputs=["c"]),
+        ]
+
+        # When
+        coroutine = given_orchestrator_task_manager.execute_fan_out_task(
+            task_name=given_task_name, task_payload=given_payload, batch_size=2
+        )
+        next(coroutine)
+        next(coroutine)
+        coroutine.send(given_batch_results)
+        with pytest.raises(StopIteration) as stop_iteration:
+            next(coroutine)
+        result: ProcessingItem = stop_iteration.value.value
+
+        # Then
+        assert mock_do_task.call_count == 2
+        assert mock_do_task.call_args_list[0].kwargs["task_payload"] == {
+            "file_paths": ["a", "b"],
+            "file_ranks": [0, 1],
+            "batch_index": 0,
+        }
+        assert mock_do_task.call_args_list[1].kwargs["task_payload"] == {
+            "file_paths": ["c"],
+            "file_ranks": [2],
+            "batch_index": 1,
+        }
+        given_context.task_all.assert_called_once()
+        assert mock_log_state.call_count == 2
+        assert result.inputs == ["a", "b", "c"]
+        assert result.end_time == 2.0
+
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.do_task")
+    def test_schedule_task_should_use_posted_file_batches(self, mock_do_task: MagicMock):
+        # Given
+        given_context = MagicMock()
+        given_orchestrator_task_manager: FunctionsOrchestratorTaskManager = FunctionsOrchestratorTaskManager(
+            orchestrator_context=given_context,
+            orchestrator_state=self.given_orchestrator_state,
+            task_logger_name="given_logger_name",
+        )
+        given_payload = {"file_paths": ["a", "b", "c"], "file_batches": [["b"], ["a", "c"]]}
+
+        # When
+        given_orchestrator_task_manager.schedule_task(
+            task_name="given_task_name", task_payload=given_payload, batch_size=50
+        )
+
+        # Then
+        assert [call.kwargs["task_payload"] for call in mock_do_task.call_args_list] == [
+            {"file_paths": ["b"], "file_ranks": [1], "batch_index": 0},
+            {"file_paths": ["a", "c"], "file_ranks": [0, 2], "batch_index": 1},
+        ]
+        given_context.task_all.assert_called_once()
+
+    def test_split_in_batches(self):
+        assert split_in_batches(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+        assert split_in_batches([], 2) == [[]]
+        with pytest.raises(ValueError):
+            split_in_batches(["a"], 0)
+
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.log_state")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.do_task")
+    def test_execute_task_graph(self, mock_do_task: MagicMock, mock_log_state: MagicMock):
+        # Given
+        given_context = MagicMock()
+        given_context.current_utc_datetime = datetime(2021, 11, 19, 00, 00, 00)
+        given_context.task_any.side_effect = lambda tasks: tasks[0]
+        given_orchestrator_task_manager: FunctionsOrchestratorTaskManager = FunctionsOrchestratorTaskManager(
+            orchestrator_context=given_context,
+            orchestrator_state=self.given_orchestrator_state,
+            task_logger_name="given_logger_name",
+        )
+        given_task_graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+
+        def do_task_side_effect(task_name: str, task_payload: dict):
+            scheduled_task = MagicMock()
+            scheduled_task.result = ProcessingItem(step_name=task_name, start_time=given_context_timestamp + 1.0)
+            scheduled_task.result.posts = {"d": {"file_paths": [f"{task_name}_output"]}}
+            return scheduled_task
+
+        given_context_timestamp = datetime.timestamp(given_context.current_utc_datetime)
+        mock_do_task.side_effect = do_task_side_effect
+
+        # When
+        coroutine = given_orchestrator_task_manager.execute_task_graph(
+            task_graph=given_task_graph, task_payload={"file_paths": []}
+        )
+        scheduled_task_names = []
+        task_result = None
+        try:
+            while True:
+                yielded = coroutine.send(task_result)
+                task_result = yielded
+                scheduled_task_names = [call.kwargs["task_name"] for call in mock_do_task.call_args_list]
+        except StopIteration as stop_iteration:
+            results, graph_report = stop_iteration.value
+
+        # Then
+        assert scheduled_task_names == ["a", "b", "c", "d"]
+        assert [result.step_name for result in results] == ["a", "b", "c", "d"]
+        assert mock_do_task.call_args_list[-1].kwargs["task_payload"]["file_paths"] == [
+            "a_output",
+            "b_output",
+            "c_output",
+        ]
+        assert graph_report["critical_path"][0] == "a"
+        assert graph_report["critical_path"][-1] == "d"
+        assert graph_report["task_wait_times"] == {"a": 1.0, "b": 1.0, "c": 1.0, "d": 1.0}
+        assert mock_log_state.call_count == 8
+
+    def test_sort_task_graph(self):
+        assert sort_task_graph({"c": ["a", "b"], "b": ["a"], "a": []}) == ["a", "b", "c"]
+        with pytest.raises(InvalidTaskGraphError):
+            sort_task_graph({"a": ["b"], "b": ["a"]})
+        with pytest.raises(InvalidTaskGraphError):
+            sort_task_graph({"a": ["unknown"]})
+
+    def test_compute_critical_path(self):
+        # Given
+        given_task_graph = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+        given_task_end_times = {"a": 1.0, "b": 5.0, "c": 3.0, "d": 6.0}
+
+        # When
+        critical_path = compute_critical_path(given_task_graph, given_task_end_times)
+
+        # Then
+        assert critical_path == ["a", "b", "d"]
+
+    def test_fuse_task_list(self):
+        assert fuse_task_list(["a", "b", "c", "d"], {"bc": ["b", "c"]}) == ["a", "bc", "d"]
+        assert fuse_task_list(["a", "c", "b"], {"bc": ["b", "c"]}) == ["a", "c", "b"]
+
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.log_state")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.do_task")
+    def test_execute_fused_task(self, mock_do_task: MagicMock, mock_log_state: MagicMock):
+        # Given
+        given_context = MagicMock()
+        given_context.current_utc_datetime = datetime(2021, 11, 19, 00, 00, 00)
+        given_orchestrator_task_manager: FunctionsOrchestratorTaskManager = FunctionsOrchestratorTaskManager(
+            orchestrator_context=given_context,
+            orchestrator_state=self.given_orchestrator_state,
+            task_logger_name="given_logger_name",
+        )
+        given_results = [ProcessingItem(step_name="given_task_one"), ProcessingItem(step_name="given_task_two")]
+
+        # When
+        coroutine = given_orchestrator_task_manager.execute_fused_task(
+            task_name="given_fused_task_name", task_payload={}
+        )
+        next(coroutine)
+        next(coroutine)
+        coroutine.send(given_results)
+        with pytest.raises(StopIteration) as stop_iteration:
+            next(coroutine)
+            next(coroutine)
+
+        # Then
+        assert stop_iteration.value.value == given_results
+        mock_do_task.assert_called_once_with(task_name="given_fused_task_name", task_payload={})
+        assert mock_log_state.call_count == 3
+        assert given_orchestrator_task_manager.orchestrator_state.status == "given_task_two COMPLETED"
+
+    def test_record_state_should_flush_buffered_states_per_task(self):
+        # Given
+        given_context = MagicMock()
+        given_orchestrator_task_manager: FunctionsOrchestratorTaskManager = FunctionsOrchestratorTaskManager(
+            orchestrator_context=given_context,
+            orchestrator_state=self.given_orchestrator_state,
+            task_logger_name="given_logger_name",
+            state_flush_policy="PER_TASK",
+            batch_task_logger_name="given_batch_logger_name",
+        )
+
+        # When
+        running_yields = list(given_orchestrator_task_manager.record_state())
+        self.given_orchestrator_state.status = "given_task COMPLETED"
+        completed_yields = list(given_orchestrator_task_manager.record_state(is_task_completed=True))
+
+        # Then
+        assert running_yields == []
+        assert len(completed_yields) == 1
+        given_context.call_activity.assert_called_once()
+        flushed_states = given_context.call_activity.call_args.kwargs["input_"]
+        assert given_context.call_activity.call_args.kwargs["name"] == "given_batch_logger_name"
+        assert [state.status for state in flushed_states] == [self.given_status, "given_task COMPLETED"]
+        assert given_orchestrator_task_manager.buffered_states == []
+
+    def test_record_state_should_flush_buffered_states_every_n_transitions(self):
+        # Given
+        given_context = MagicMock()
+        given_orchestrator_task_manager: FunctionsOrchestratorTaskManager = FunctionsOrchestratorTaskManager(
+            orchestrator_context=given_context,
+            orchestrator_state=self.given_orchestrator_state,
+            task_logger_name="given_logger_name",
+            state_flush_policy="EVERY_N_TRANSITIONS",
+            state_flush_every_n=3,
+            batch_task_logger_name="given_batch_logger_name",
+        )
+
+        # When
+        yields = [list(given_orchestrator_task_manager.record_state(is_task_completed=True)) for _ in range(4)]
+        pending_yields = list(given_orchestrator_task_manager.flush_pending_states())
+
+        # Then
+        assert [len(item) for item in yields] == [0, 0, 1, 0]
+        assert len(pending_yields) == 1
+        assert given_context.call_activity.call_count == 2
+
+    def test_should_not_buffer_states_without_batch_logger(self):
+        with pytest.raises(InvalidStateFlushPolicyError):
+            FunctionsOrchestratorTaskManager(
+                orchestrator_context=MagicMock(),
+                orchestrator_state=self.given_orchestrator_state,
+                task_logger_name="given_logger_name",
+                state_flush_policy="ON_COMPLETION",
+            )
+
     @patch(f"{TESTED_MODULE}._classes.logger.exception")
     def test_try_task_decorator(self, logger_mock: MagicMock):
         @FunctionsOrchestratorTaskManager.try_task_decorator
@@ -295,6 +788,25 @@ class TestOrchestratorBuilder(unittest.TestCase):
         # Then
         assert type(orchestrator_function) is functools.partial
 
+    def test_should_not_build_orchestrator_with_cyclic_task_graph(self):
+        with pytest.raises(InvalidTaskGraphError):
+            FunctionsOrchestratorBuilder(
+                base_name=self.given_base_name,
+                orchestrator_function_name=self.given_orchestrator_function_name,
+                task_logger=self.given_pre_ingestion_activity_function_name,
+                task_graph={"a": ["b"], "b": ["a"]},
+            )
+
+    def test_should_not_build_orchestrator_with_unmatched_fused_tasks(self):
+        with pytest.raises(InvalidTaskGraphError):
+            FunctionsOrchestratorBuilder(
+                base_name=self.given_base_name,
+                orchestrator_function_name=self.given_orchestrator_function_name,
+                task_logger=self.given_pre_ingestion_activity_function_name,
+                task_list=["a", "c", "b"],
+                fused_tasks={"bc": ["b", "c"]},
+            )
+
     @patch(f"{TESTED_MODULE}.ProcessingItem.filter_posts_in_processing_items")
     @patch("azure.durable_functions.DurableOrchestrationContext", spec=durable_func.DurableOrchestrationContext)
     @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.log_state")
@@ -343,3 +855,132 @@ class TestOrchestratorBuilder(unittest.TestCase):
         output_processing_items: List[ProcessingItem] = list(map(lambda item: ProcessingItem.from_json(item), output))
         assert output_processing_items[0].step_name == given_function_name_one
         assert output_processing_items[1].step_name == given_function_name_two
+
+    @patch("azure.durable_functions.DurableOrchestrationContext", spec=durable_func.DurableOrchestrationContext)
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.log_state")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.execute_fan_out_task")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.execute_task")
+    def test__orchestrator_function_with_fan_out(
+        self,
+        execute_task_mock,
+        execute_fan_out_task_mock,
+        log_state_mock,
+        durable_orchestration_context_mock,
+    ):
+        def execute_task_side_effect(task_name: str, task_payload: dict, **kwargs):
+            result = ProcessingItem(step_name=task_name)
+            yield
+            return result
+
+        log_state_mock.return_value = None
+        execute_task_mock.side_effect = execute_task_side_effect
+        execute_fan_out_task_mock.side_effect = execute_task_side_effect
+        durable_orchestration_context_mock.current_utc_datetime = datetime(2021, 11, 19, 00, 00, 00)
+        given_function_name_one = "given_function_name_one"
+        given_function_name_two = "given_function_name_two"
+
+        result = FunctionsOrchestratorBuilder._orchestrator_function(
+            context=durable_orchestration_context_mock,
+            base_name="given_base_name",
+            orchestrator_function_name="given_orchestrator_function_name",
+            task_logger="given_state_activity_function_name",
+            task_list=[given_function_name_one, given_function_name_two],
+            fan_out_batch_sizes={given_function_name_two: 10},
+        )
+        try:
+            while True:
+                next(result)
+        except StopIteration:
+            pass
+
+        execute_task_mock.assert_called_once()
+        execute_fan_out_task_mock.assert_called_once()
+        assert execute_fan_out_task_mock.call_args.kwargs["batch_size"] == 10
+
+    @patch("azure.durable_functions.DurableOrchestrationContext", spec=durable_func.DurableOrchestrationContext)
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.log_state")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.execute_fused_task")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.execute_task")
+    def test__orchestrator_function_with_fused_tasks(
+        self,
+        execute_task_mock,
+        execute_fused_task_mock,
+        log_state_mock,
+        durable_orchestration_context_mock,
+    ):
+        def execute_task_side_effect(task_name: str, task_payload: dict):
+            result = ProcessingItem(step_name=task_name)
+            result.posts = {"given_function_name_two": {"file_paths": ["given_file_path"]}}
+            yield
+            return result
+
+        def execute_fused_task_side_effect(task_name: str, task_payload: dict):
+            yield
+            return [
+                ProcessingItem(step_name="given_function_name_two"),
+                ProcessingItem(step_name="given_function_name_three"),
+            ]
+
+        log_state_mock.return_value = None
+        execute_task_mock.side_effect = execute_task_side_effect
+        execute_fused_task_mock.side_effect = execute_fused_task_side_effect
+        durable_orchestration_context_mock.current_utc_datetime = datetime(2021, 11, 19, 00, 00, 00)
+        durable_orchestration_context_mock.get_input.return_value = {"ingestion_mode": "FULL"}
+
+        result = FunctionsOrchestratorBuilder._orchestrator_function(
+            context=durable_orchestration_context_mock,
+            base_name="given_base_name",
+            orchestrator_function_name="given_orchestrator_function_name",
+            task_logger="given_state_activity_function_name",
+            task_list=["given_function_name_one", "given_function_name_two", "given_function_name_three"],
+            fused_tasks={"given_fused_function_name": ["given_function_name_two", "given_function_name_three"]},
+        )
+        output = []
+        try:
+            while True:
+                next(result)
+        except StopIteration as e:
+            output = e.value
+
+        execute_task_mock.assert_called_once()
+        assert execute_fused_task_mock.call_args.kwargs["task_name"] == "given_fused_function_name"
+        assert execute_fused_task_mock.call_args.kwargs["task_payload"]["file_paths"] == ["given_file_path"]
+        assert [ProcessingItem.from_json(item).step_name for item in output] == [
+            "given_function_name_one",
+            "given_function_name_two",
+            "given_function_name_three",
+        ]
+
+    @patch("azure.durable_functions.DurableOrchestrationContext", spec=durable_func.DurableOrchestrationContext)
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.flush_states")
+    @patch(f"{TESTED_MODULE}.FunctionsOrchestratorTaskManager.execute_task")
+    def test__orchestrator_function_should_flush_states_on_failure(
+        self,
+        execute_task_mock,
+        flush_states_mock,
+        durable_orchestration_context_mock,
+    ):
+        def execute_task_side_effect(task_name: str, task_payload: dict):
+            yield
+            raise RuntimeError("given_error")
+
+        flush_states_mock.return_value = None
+        execute_task_mock.side_effect = execute_task_side_effect
+        durable_orchestration_context_mock.current_utc_datetime = datetime(2021, 11, 19, 00, 00, 00)
+        durable_orchestration_context_mock.instance_id = "given_instance_id"
+        durable_orchestration_context_mock.get_input.return_value = {"ingestion_mode": "FULL"}
+
+        result = FunctionsOrchestratorBuilder._orchestrator_function(
+            context=durable_orchestration_context_mock,
+            base_name="given_base_name",
+            orchestrator_function_name="given_orchestrator_function_name",
+            task_logger="given_state_activity_function_name",
+            task_list=["given_function_name_one"],
+            state_flush_policy="ON_COMPLETION",
+            batch_task_logger="given_batch_state_activity_function_name",
+        )
+        with pytest.raises(RuntimeError):
+            while True:
+                next(result)
+
+        flush_states_mock.assert_called_once()
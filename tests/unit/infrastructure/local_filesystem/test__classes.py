@@ -0,0 +1,60 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from py_project.infrastructure.local_filesystem import LocalFileSystem
+
+TESTED_MODULE = "py_project.infrastructure.local_filesystem"
+
+
+class TestLocalFileSystem(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder_path = self.tmp_dir.name
+        self.file_system = LocalFileSystem()
+        os.makedirs(f"{self.folder_path}/2021/01")
+        os.makedirs(f"{self.folder_path}/2022")
+        for relative_path, modified_time in [
+            ("weather_2020.csv", datetime.datetime(2020, 1, 1)),
+            ("weather_2021.parquet", datetime.datetime(2021, 1, 1)),
+            ("2021/01/weather_20210101.csv", datetime.datetime(2021, 1, 1)),
+            ("2022/weather_2022.csv", datetime.datetime(2022, 1, 1)),
+        ]:
+            with open(f"{self.folder_path}/{relative_path}", "w") as f:
+                f.write("a,b\n")
+            os.utime(f"{self.folder_path}/{relative_path}", (modified_time.timestamp(), modified_time.timestamp()))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_relative_paths(self, **kwargs):
+        return sorted(
+            file_details.path[len(self.folder_path) + 1 :]
+            for file_details in self.file_system.iter_files(self.folder_path, **kwargs)
+        )
+
+    def test_iter_files(self):
+        assert self.get_relative_paths() == ["weather_2020.csv", "weather_2021.parquet"]
+        assert self.get_relative_paths(recursive=True, pattern="*.csv") == [
+            "2021/01/weather_20210101.csv",
+            "2022/weather_2022.csv",
+            "weather_2020.csv",
+        ]
+
+    def test_iter_files_with_prefix_and_date_range(self):
+        assert self.get_relative_paths(recursive=True, prefix="2021/") == ["2021/01/weather_20210101.csv"]
+        assert self.get_relative_paths(
+            recursive=True,
+            modified_after=datetime.datetime(2021, 1, 1),
+            modified_before=datetime.datetime(2022, 1, 1),
+        ) == ["2021/01/weather_20210101.csv", "weather_2021.parquet"]
+
+    def test_iter_files_should_return_file_details(self):
+        # When
+        file_details = next(self.file_system.iter_files(self.folder_path, pattern="*.parquet"))
+
+        # Then
+        assert file_details.path == f"{self.folder_path}/weather_2021.parquet"
+        assert file_details.size == 4
+        assert file_details.last_modified == datetime.datetime(2021, 1, 1).timestamp()
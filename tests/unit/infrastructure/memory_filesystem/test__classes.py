@@ -0,0 +1,54 @@
+import unittest
+
+import pandas as pd
+import pytest
+
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
+
+TESTED_MODULE = "py_project.infrastructure.memory_filesystem"
+
+
+class TestInMemoryFileSystem(unittest.TestCase):
+    def setUp(self):
+        self.file_system = InMemoryFileSystem()
+
+    def test_write_then_read_parquet(self):
+        # Given
+        given_df = pd.DataFrame({"value": [1, 2, 3]})
+
+        # When
+        self.file_system.write_parquet(given_df, "/container/folder/file.parquet")
+
+        # Then
+        pd.testing.assert_frame_equal(self.file_system.read_parquet("container/folder/file.parquet"), given_df)
+
+    def test_open_in_text_and_append_modes(self):
+        # When
+        with self.file_system.open("folder/file.jsonl", "w") as f:
+            f.write("a\n")
+        with self.file_system.open("folder/file.jsonl", "a") as f:
+            f.write("b\n")
+
+        # Then
+        with self.file_system.open("folder/file.jsonl", "r") as f:
+            assert f.readlines() == ["a\n", "b\n"]
+        with pytest.raises(FileNotFoundError):
+            self.file_system.open("folder/missing.jsonl", "r")
+
+    def test_listing(self):
+        # Given
+        self.file_system.mkdir("folder/empty")
+        for file_path in ["folder/a.csv", "folder/sub/b.csv"]:
+            with self.file_system.open(file_path, "wb") as f:
+                f.write(b"a,b\n")
+
+        # Then
+        assert self.file_system.ls("folder") == ["a.csv", "empty", "sub"]
+        assert self.file_system.isdir("folder/sub")
+        assert self.file_system.exists("folder/a.csv")
+        assert not self.file_system.exists("folder/c.csv")
+        assert [details.path for details in self.file_system.iter_files("folder", recursive=True)] == [
+            "folder/a.csv",
+            "folder/sub/b.csv",
+        ]
+        assert [details.size for details in self.file_system.iter_files("folder", pattern="*.csv")] == [4]
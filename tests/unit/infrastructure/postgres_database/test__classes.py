@@ -11,6 +11,7 @@ from py_project.config.database_config import (
     WRITE_MODE_TRUNCATE_THEN_APPEND,
     WRITE_MODE_UPSERT,
 )
+from py_project.domain.adapters.database import TableWrite
 from py_project.infrastructure.postgres_database import PostgresDatabase
 from py_project.infrastructure.postgres_database._exceptions import PostgresError
 
@@ -143,6 +144,145 @@ class TestPostgresDatabase(unittest.TestCase):
         df_in_db: pd.DataFrame = pd.read_sql(text(f"SELECT * FROM {given_schema}.{given_table_name}"), con=self.engine)
         pd.testing.assert_frame_equal(expected_df, df_in_db)
 
+    def test_write_dataframes_should_copy_dataframes_after_truncating_table(self):
+        # Given
+        given_pk_col: str = "id"
+        given_date_col: str = "datetime"
+        given_table_name: str = "table_name"
+        given_schema: str = self.schema
+        self.connection.execute(
+            text(
+                f"CREATE TABLE {given_schema}.{given_table_name}\
+                ({given_pk_col} INTEGER PRIMARY KEY, {given_date_col} TIMESTAMP)"
+            )
+        )
+        row1: pd.Series = pd.Series({given_pk_col: 1, given_date_col: datetime.datetime(2020, 1, 1)})
+        pd.DataFrame([row1]).to_sql(
+            name=given_table_name, schema=given_schema, con=self.engine, if_exists=WRITE_MODE_APPEND, index=False
+        )
+        row2: pd.Series = pd.Series({given_pk_col: 2, given_date_col: datetime.datetime(2020, 1, 2)})
+        row3: pd.Series = pd.Series({given_pk_col: 3, given_date_col: datetime.datetime(2020, 1, 10)})
+        given_dfs = iter([pd.DataFrame([row2]), pd.DataFrame(), pd.DataFrame([row3])])
+        given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
+        expected_df: pd.DataFrame = pd.DataFrame([row2, row3])
+
+        # When
+        written_rows = given_postgres_database.write_dataframes(
+            given_dfs,
+            table_name=given_table_name,
+            schema=given_schema,
+            write_mode=WRITE_MODE_TRUNCATE_THEN_APPEND,
+        )
+
+        # Then
+        assert written_rows == 2
+        df_in_db: pd.DataFrame = pd.read_sql(
+            text(f"SELECT * FROM {given_schema}.{given_table_name} ORDER BY {given_pk_col}"), con=self.engine
+        )
+        pd.testing.assert_frame_equal(expected_df, df_in_db)
+
+    def test_write_dataframes_should_create_missing_table(self):
+        # Given
+        given_table_name: str = "table_name"
+        given_schema: str = self.schema
+        given_df: pd.DataFrame = pd.DataFrame({"value": [1.0, None]})
+        given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
+
+        # When
+        given_postgres_database.write_dataframes(
+            [given_df], table_name=given_table_name, schema=given_schema, write_mode=WRITE_MODE_APPEND
+        )
+
+        # Then
+        df_in_db: pd.DataFrame = pd.read_sql(text(f"SELECT * FROM {given_schema}.{given_table_name}"), con=self.engine)
+        pd.testing.assert_frame_equal(given_df, df_in_db)
+
+    def test_write_dataframes_should_not_leave_created_table_when_stream_fails(self):
+        # Given
+        given_table_name: str = "table_name"
+        given_schema: str = self.schema
+        given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
+
+        def given_failing_dfs():
+            yield pd.DataFrame({"value": [1.0]})
+            raise ValueError("Stream failed")
+
+        # When
+        with self.assertRaises(ValueError):
+            given_postgres_database.write_dataframes(
+                given_failing_dfs(), table_name=given_table_name, schema=given_schema, write_mode=WRITE_MODE_APPEND
+            )
+
+        # Then
+        self.assertFalse(given_postgres_database.has_table(table_name=given_table_name, schema_name=given_schema))
+
+    def test_write_table_dataframes_should_upsert_chunks_of_a_table_in_one_transaction(self):
+        # Given
+        given_schema: str = self.schema
+        self.connection.execute(
+            text(f"CREATE TABLE {given_schema}.table_name (id INTEGER PRIMARY KEY, value FLOAT, other FLOAT)")
+        )
+        pd.DataFrame({"id": [1, 2], "value": [1.0, 2.0], "other": [0.0, 0.0]}).to_sql(
+            name="table_name", schema=given_schema, con=self.engine, if_exists=WRITE_MODE_APPEND, index=False
+        )
+        given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
+        given_table_writes = [
+            TableWrite(
+                table_name="table_name",
+                input_df=pd.DataFrame({"id": [1], "value": [10.0]}),
+                write_mode=WRITE_MODE_UPSERT,
+            ),
+            TableWrite(
+                table_name="table_name",
+                input_df=pd.DataFrame({"id": [2, 3], "value": [20.0, 30.0]}),
+                write_mode=WRITE_MODE_UPSERT,
+            ),
+        ]
+
+        # When
+        written_rows = given_postgres_database.write_table_dataframes(given_table_writes, schema=given_schema)
+
+        # Then
+        assert written_rows == 3
+        df_in_db: pd.DataFrame = pd.read_sql(
+            text(f"SELECT * FROM {given_schema}.table_name ORDER BY id"), con=self.engine
+        )
+        pd.testing.assert_frame_equal(
+            df_in_db, pd.DataFrame({"id": [1, 2, 3], "value": [10.0, 20.0, 30.0], "other": [0.0, 0.0, None]})
+        )
+
+    def test_write_table_dataframes_should_not_write_any_table_when_a_write_fails(self):
+        # Given
+        given_pk_col: str = "id"
+        given_schema: str = self.schema
+        for given_table_name in ["metrics_table", "rollup_table"]:
+            self.connection.execute(
+                text(
+                    f"CREATE TABLE {given_schema}.{given_table_name} ({given_pk_col} INTEGER PRIMARY KEY, value FLOAT)"
+                )
+            )
+        given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
+        given_table_writes = [
+            TableWrite(
+                table_name="metrics_table",
+                input_df=pd.DataFrame({"id": [1], "value": [1.0]}),
+                write_mode=WRITE_MODE_APPEND,
+            ),
+            TableWrite(
+                table_name="rollup_table",
+                input_df=pd.DataFrame({"id": [1], "missing": [1.0]}),
+                write_mode=WRITE_MODE_UPSERT,
+            ),
+        ]
+
+        # When
+        with self.assertRaises(Exception):
+            given_postgres_database.write_table_dataframes(given_table_writes, schema=given_schema)
+
+        # Then
+        df_in_db: pd.DataFrame = pd.read_sql(text(f"SELECT * FROM {given_schema}.metrics_table"), con=self.engine)
+        assert df_in_db.empty
+
     def test_read_dataframe(self):
         # Given
         given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
@@ -159,6 +299,21 @@ class TestPostgresDatabase(unittest.TestCase):
         # Then
         pd.testing.assert_frame_equal(dataframe, expected_dataframe)
 
+    def test_read_dataframe_should_read_columns_within_range(self):
+        # Given
+        given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
+        given_table_name = "table_name"
+        given_df = pd.DataFrame({"id": [1, 2, 3, 4], "value": ["a", "b", "c", "d"], "other": [0, 0, 0, 0]})
+        given_df.to_sql(name=given_table_name, schema=self.schema, con=self.engine, index=False)
+
+        # When
+        dataframe = given_postgres_database.read_dataframe(
+            self.schema, given_table_name, columns=["id", "value"], range_filter=("id", 2, 3)
+        )
+
+        # Then
+        pd.testing.assert_frame_equal(dataframe, pd.DataFrame({"id": [2, 3], "value": ["b", "c"]}))
+
     def test_read_dataframe_should_revert_if_table_dont_exist(self):
         # Given
         given_postgres_database: PostgresDatabase = PostgresDatabase(engine=self.engine)
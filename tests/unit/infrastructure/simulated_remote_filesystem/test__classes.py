@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from py_project.infrastructure.memory_filesystem import InMemoryFileSystem
+from py_project.infrastructure.simulated_remote_filesystem import SimulatedRemoteFileSystem
+
+TESTED_MODULE = "py_project.infrastructure.simulated_remote_filesystem"
+
+
+class TestSimulatedRemoteFileSystem(unittest.TestCase):
+    def test_should_add_latency_per_request_and_throttle_transfers(self):
+        # Given
+        mock_sleep = MagicMock()
+        given_file_system = SimulatedRemoteFileSystem(
+            InMemoryFileSystem(), latency_seconds=0.05, bandwidth_bytes_per_second=1000.0, sleep_fn=mock_sleep
+        )
+
+        # When
+        given_file_system.mkdir("folder")
+        with given_file_system.open("folder/file.csv", "wb") as f:
+            f.write(b"a" * 500)
+        given_file_system.exists("folder/file.csv")
+
+        # Then
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [0.05, 0.05, 0.5, 0.05]
+        assert given_file_system.get_round_trip_count() == 3
+        assert given_file_system.transferred_bytes == 500
+
+    def test_read_and_write_dataframes(self):
+        # Given
+        given_file_system = SimulatedRemoteFileSystem(InMemoryFileSystem(), sleep_fn=MagicMock())
+        given_df = pd.DataFrame({"value": [1, 2, 3]})
+
+        # When
+        given_file_system.write_parquet(given_df, "folder/file.parquet")
+        with given_file_system.open("folder/file.csv", "w") as f:
+            f.write("value\n1\n")
+
+        # Then
+        pd.testing.assert_frame_equal(given_file_system.read_parquet("folder/file.parquet"), given_df)
+        assert given_file_system.read_csv("folder/file.csv")["value"].tolist() == [1]
+        assert dict(given_file_system.round_trip_counts) == {"open": 4}
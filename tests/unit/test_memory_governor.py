@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import patch
+
+from py_project.memory_governor import MemoryGovernor
+
+TESTED_MODULE = "py_project.memory_governor"
+
+
+class TestMemoryGovernor(unittest.TestCase):
+    @patch(f"{TESTED_MODULE}.get_rss_bytes")
+    def test_get_available_bytes(self, get_rss_bytes_mock):
+        # Given
+        get_rss_bytes_mock.return_value = 300
+        memory_governor = MemoryGovernor(max_usage_fraction=0.5, memory_limit_bytes=1000)
+
+        # Then
+        assert memory_governor.get_available_bytes() == 200
+        assert memory_governor.fits(200)
+        assert not memory_governor.fits(201)
+
+    @patch(f"{TESTED_MODULE}.get_rss_bytes")
+    def test_iter_groups_should_fit_memory_left_before_each_group(self, get_rss_bytes_mock):
+        # Given
+        get_rss_bytes_mock.side_effect = [0, 500, 0]
+        memory_governor = MemoryGovernor(max_usage_fraction=1.0, memory_limit_bytes=1000)
+
+        # When
+        groups = list(memory_governor.iter_groups(["a", "b", "c", "d", "e"], [400, 400, 400, 800, 100]))
+
+        # Then
+        assert groups == [["a", "b"], ["c"], ["d", "e"]]
+
+    @patch(f"{TESTED_MODULE}.get_rss_bytes")
+    def test_iter_groups_should_still_process_items_larger_than_memory_left(self, get_rss_bytes_mock):
+        # Given
+        get_rss_bytes_mock.return_value = 0
+        memory_governor = MemoryGovernor(max_usage_fraction=1.0, memory_limit_bytes=1000)
+
+        # When
+        groups = list(memory_governor.iter_groups(["a", "b"], [2000, 100]))
+
+        # Then
+        assert groups == [["a"], ["b"]]
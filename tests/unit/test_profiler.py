@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from py_project.config import functions_config
+from py_project.profiler import WallClockSampler, get_enabled_profiling_modes, profile_invocation
+
+TESTED_MODULE = "py_project.profiler"
+
+
+@profile_invocation
+def given_inner_function(values):
+    return sum(values)
+
+
+@profile_invocation
+def given_function(values):
+    if not values:
+        raise ValueError()
+    return given_inner_function(values) + given_inner_function(values)
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.profiles_folder = f"{self.tmp_dir.name}/PROFILES"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_enabled_profiling_modes_should_ignore_unknown_modes(self):
+        assert get_enabled_profiling_modes("") == []
+        assert get_enabled_profiling_modes(" Sampling, unknown ,cprofile") == [
+            functions_config.PROFILING_MODE_CPROFILE,
+            functions_config.PROFILING_MODE_SAMPLING,
+        ]
+
+    @patch(f"{TESTED_MODULE}.InvocationProfiler")
+    @patch(f"{TESTED_MODULE}.ENABLED_PROFILING_MODES", [])
+    def test_profile_invocation_should_only_call_function_when_disabled(self, invocation_profiler_mock):
+        assert given_function([1, 2]) == 6
+        invocation_profiler_mock.assert_not_called()
+
+    @patch(f"{TESTED_MODULE}.ENABLED_PROFILING_MODES", functions_config.PROFILING_MODES)
+    def test_profile_invocation_should_write_one_report_per_mode_for_the_outermost_call(self):
+        # When
+        with patch(f"{TESTED_MODULE}.filesystem_config.PROFILES_FOLDER", self.profiles_folder):
+            result = given_function([1, 2])
+            with pytest.raises(ValueError):
+                given_function([])
+
+        # Then
+        assert result == 6
+        report_filenames = sorted(os.listdir(self.profiles_folder))
+        assert len(report_filenames) == 8
+        assert all(filename.startswith(f"{__name__}.given_function_") for filename in report_filenames)
+        assert len([filename for filename in report_filenames if filename.endswith("_cprofile.txt")]) == 2
+        cprofile_report_filename = [filename for filename in report_filenames if filename.endswith("_cprofile.txt")][0]
+        with open(f"{self.profiles_folder}/{cprofile_report_filename}") as f:
+            assert "given_inner_function" in f.read()
+
+    @patch(f"{TESTED_MODULE}.PROFILING_TARGETS", ["given_inner_function"])
+    @patch(f"{TESTED_MODULE}.ENABLED_PROFILING_MODES", [functions_config.PROFILING_MODE_CPROFILE])
+    def test_profile_invocation_should_only_profile_targets(self):
+        # When
+        with patch(f"{TESTED_MODULE}.filesystem_config.PROFILES_FOLDER", self.profiles_folder):
+            given_function([1, 2])
+
+        # Then
+        report_filenames = os.listdir(self.profiles_folder)
+        assert len(report_filenames) == 4
+        assert all(filename.startswith(f"{__name__}.given_inner_function_") for filename in report_filenames)
+
+    def test_wall_clock_sampler_should_collapse_stacks_from_the_root(self):
+        # Given
+        sampler = WallClockSampler()
+
+        # When
+        sampler.sample()
+
+        # Then
+        collapsed_stacks = sampler.to_collapsed_stacks()
+        assert collapsed_stacks.startswith("MainThread;")
+        assert (
+            "test_profiler.py:test_wall_clock_sampler_should_collapse_stacks_from_the_root;profiler.py:sample 1\n"
+            in collapsed_stacks
+        )